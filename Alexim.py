@@ -3,32 +3,35 @@ Alexim.cz Scraper
 Stiahne produkty z alexim.cz
 """
 
-import re
-from bs4 import BeautifulSoup
-from base_scraper import BaseScraper, ScraperConfig
+from base_scraper import BaseScraper, ScraperConfig, Selector
 
 
 class ScraperAlexim(BaseScraper):
     """Scraper pre alexim.cz"""
 
-    def parse_product(self, soup: BeautifulSoup, url: str):
+    FIELDS = {
+        'name': Selector('h1.product-detail__title'),
+        # SKU - viacero moznosti kde moze byt; own_text = ako soup.find('strong', string=...)
+        'sku': (
+            Selector('strong', text=r'^\d+\.\d+$', own_text=True),
+            Selector('strong[itemprop=sku]'),
+            Selector('span[itemprop=sku]'),
+        ),
+        'in_stock': Selector('strong', text=r'(?i)skladem', own_text=True),
+    }
+
+    def build_product(self, values, url):
         # 1. Nazov
-        nazov_el = soup.find('h1', class_='product-detail__title')
-        nazov = nazov_el.get_text(strip=True) if nazov_el else "N/A"
+        nazov = values['name'] if values['name'] is not None else "N/A"
 
-        # 2. SKU - viacero moznosti kde moze byt
-        sku_el = (
-            soup.find('strong', string=re.compile(r'^\d+\.\d+$')) or
-            soup.find('strong', itemprop='sku') or
-            soup.find('span', itemprop='sku')
-        )
-        sku = sku_el.get_text(strip=True) if sku_el else None
+        # 2. SKU
+        sku = values['sku']
 
         if not sku:
             return None
 
         # 3. Sklad
-        stock = 1 if soup.find('strong', string=re.compile(r'skladem', re.IGNORECASE)) else 0
+        stock = 1 if values['in_stock'] is not None else 0
 
         return {
             'SKU': sku,
@@ -37,14 +40,17 @@ class ScraperAlexim(BaseScraper):
         }
 
 
+# Konfiguracia behu - run_all.py z nej berie host a pocet spojeni
+CONFIG = ScraperConfig(
+    sitemap_url='https://www.alexim.cz/sitemap.xml',
+    output_file='alexim_sklad.csv',
+    max_workers=15,
+    parser='lxml',
+    csv_separator=';',  # zjednotene na ;
+    url_blacklist=['/c/', '/v/', '/clanky/', '/images/', '/p/', '.jpg', '.png', '.pdf']
+)
+
+
 if __name__ == "__main__":
-    config = ScraperConfig(
-        sitemap_url='https://www.alexim.cz/sitemap.xml',
-        output_file='alexim_sklad.csv',
-        max_workers=15,
-        csv_separator=';',  # zjednotene na ;
-        url_blacklist=['/c/', '/v/', '/clanky/', '/images/', '/p/', '.jpg', '.png', '.pdf']
-    )
-
-    scraper = ScraperAlexim(config)
+    scraper = ScraperAlexim(CONFIG)
     scraper.run()
@@ -3,22 +3,59 @@ BaseScraper - spolocna trieda pre vsetky scrapers
 Riesuje: thread-safety, retry logiku, logging, error handling
 """
 
+import os
+import csv
+import json
 import time
 import re
-import gzip
-import io
+import queue
+import hashlib
+import inspect
+import asyncio
 import logging
-from abc import ABC, abstractmethod
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Optional, Dict, List, Any
-from dataclasses import dataclass
+import warnings
+import threading
+import multiprocessing
+from abc import ABC
+from concurrent.futures import BrokenExecutor, ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from itertools import chain, islice
+from typing import Optional, Dict, List, Any, Iterable, Iterator, Tuple, Mapping, Callable
+from dataclasses import dataclass, field
+from urllib.parse import urlparse
 
-import pandas as pd
 import requests
-from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup
 
+from checkpoint import CheckpointJournal, default_resume
+from csv_sink import CsvSink
+from http_cache import CACHE_DIR, HttpCache
+from page_stream import PageReader
+from rate_limiter import RateLimiter, THROTTLE_STATUSES
+from scraper_metrics import METRICS_DIR, ScraperMetrics, TimedHTTPAdapter, default_prometheus
+from sitemap_reader import SitemapReader
+from snapshot_delta import SnapshotDelta
+import snapshot_store
+from snapshot_store import SnapshotWriter, default_snapshot_dir, supplier_name
+
+try:
+    import aiohttp
+except ImportError:  # volitelne - potrebne len pre engine='async'
+    aiohttp = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as SelectolaxParser
+except ImportError:  # volitelne - potrebne len pre parser='selectolax'
+    SelectolaxParser = None
+
+
+ENGINES = ('thread', 'async', 'pipeline')
+PARSERS = ('html.parser', 'lxml', 'selectolax')
+PARSE_VERSION = 2  # zvys pri zmene spolocneho parsovania (Selector, FieldPlan) - zneplatni riadky v HTTP cache
+QUEUE_POLL = 0.5  # s - ako casto vlakna nad frontou URL kontroluju zastavenie
+INCOMPLETE_PAGE = 'partial_incomplete'  # dovod zlyhania: ciastocne precitanej stranke chyba pole
+_FULL_READ = object()  # vysledok _process_page: stranku treba stiahnut celu
+
 
 @dataclass
 class ScraperConfig:
@@ -27,13 +64,70 @@ class ScraperConfig:
     output_file: str
     max_workers: int = 10
     timeout: int = 15
-    delay: float = 0.0  # delay medzi requestami (pre pomale servery)
+    delay: float = 0.0  # odstup requestov workera (pre pomale servery) - rate limiter zacne na workery/delay req/s
+    adaptive_rate: Optional[bool] = None  # per-host rate limiter: spomali pri 429/503/latencii, zrychli ked host zvlada (None = zapnuty ak delay > 0, False = pevny delay)
+    max_rate: Optional[float] = None  # horny limit req/s na host pre rate limiter
     csv_separator: str = ';'
     url_blacklist: List[str] = None  # URL patterny na vynechanie
+    engine: str = 'thread'  # 'thread' (vlakna), 'async' (jeden event loop, aiohttp), 'pipeline' (vlakna + procesy)
+    max_in_flight: Optional[int] = None  # async: max sucasnych requestov (default max_workers); parsing v max_workers vlaknach
+    batch_size: int = 1  # kolko URL si worker naraz vezme zo spolocnej fronty
+    cache_dir: Optional[str] = CACHE_DIR  # ETag/Last-Modified cache (riadky su verzovane parser_version; None = vypnuta)
+    incremental: bool = False  # stahuj len URL so zmenenym <lastmod>, ostatne prevezmi z output_file
+    state_dir: str = '.scraper_state'  # <lastmod> z posledneho uspesneho behu a zurnal rozbehnuteho behu
+    checkpoint: bool = True  # priebezny zurnal spracovanych URL - run(resume=True) pokracuje po preruseni
+    parse_workers: Optional[int] = None  # pipeline: pocet parsovacich procesov (default pocet CPU)
+    parser: str = 'html.parser'  # BeautifulSoup 'html.parser'/'lxml', alebo 'selectolax' (len pre FIELDS)
+    fast_parse: bool = True  # najprv parse_raw nad surovymi bajtmi (ak ho scraper ma), DOM len ako fallback
+    stream_markers: Optional[List[str]] = None  # citaj telo stranky len kym sa nenajdu vsetky tieto retazce (zo selectorov FIELDS)
+    max_page_bytes: Optional[int] = None  # citaj najviac tolko bajtov tela stranky (None = cele)
+    write_delta: bool = True  # zapis aj <output>_delta.csv so zmenami oproti predoslemu behu
+    snapshot_dir: Optional[str] = field(default_factory=default_snapshot_dir)  # Parquet snapshoty (pyarrow)
+    metrics_dir: Optional[str] = METRICS_DIR  # JSON report metrik behu <dodavatel>.json (None = nezapisovat)
+    metrics_prometheus: bool = field(default_factory=default_prometheus)  # aj <dodavatel>.prom (Prometheus textovy format)
 
     def __post_init__(self):
         if self.url_blacklist is None:
             self.url_blacklist = []
+        if self.engine not in ENGINES:
+            raise ValueError(f"Neznamy engine '{self.engine}', povolene: {', '.join(ENGINES)}")
+        if self.adaptive_rate is None:
+            self.adaptive_rate = self.delay > 0
+        if self.max_in_flight is None:
+            self.max_in_flight = self.max_workers
+        if self.parse_workers is None:
+            self.parse_workers = os.cpu_count() or 1
+        if self.parser not in PARSERS:
+            raise ValueError(f"Neznamy parser '{self.parser}', povolene: {', '.join(PARSERS)}")
+        if self.max_page_bytes is not None and self.max_page_bytes <= 0:
+            raise ValueError("max_page_bytes musi byt kladne cislo (alebo None)")
+
+    @property
+    def connections(self) -> int:
+        """Kolko sucasnych spojeni na host scraper otvara (rozpocet spojeni v run_all.py)"""
+        return self.max_in_flight if self.engine == 'async' else self.max_workers
+
+
+@dataclass(frozen=True)
+class Selector:
+    """
+    Deklarativny selector pola produktu (funguje s BeautifulSoup aj selectolax).
+
+    css:   CSS selector, napr. 'span.js_kod' alebo 'span[itemprop=sku]'
+    text:  regex, ktory musi text elementu splnat (ine elementy sa preskocia)
+    attr:  vrat hodnotu atributu namiesto textu
+    strip: text ako get_text(strip=True); False = povodny text elementu
+    own_text: text ako Tag.string - element musi mat jediny text (ako soup.find(string=...)),
+              text regex sa testuje na neorezanom texte
+
+    Jednoduche selectory (tag, .class, [attr=value] bez kombinatorov) sa vyhodnocuju
+    jednym prechodom dokumentu pre vsetky polia naraz, ostatne cez CSS select.
+    """
+    css: str
+    text: Optional[str] = None
+    attr: Optional[str] = None
+    strip: bool = True
+    own_text: bool = False
 
 
 class BaseScraper(ABC):
@@ -47,23 +141,117 @@ class BaseScraper(ABC):
                 return {'SKU': ..., 'Nazov': ..., 'Pocet_ks': ...}
 
         scraper = MojScraper(config)
-        scraper.run()
+        count = scraper.run()      # pocet zapisanych produktov, riadky su v config.output_file
+        rows = scraper.read_results()
+
+    run() riadky streamuje do CSV a v pamati ich nedrzi - uz nevracia DataFrame a nenastavuje
+    self.results. DataFrame: pd.read_csv(config.output_file, sep=config.csv_separator, dtype=str);
+    scraper.results ostava len ako zastarany alias read_results().
+
+    Alebo deklarativne (funguje aj s parser='selectolax'):
+        class MojScraper(BaseScraper):
+            FIELDS = {
+                'sku': Selector('span.kod'),
+                'name': Selector('h1'),
+                'stock': (Selector('span.sklad'), Selector('div.dostupnost')),  # prvy najdeny
+            }
+
+            def build_product(self, values, url):
+                return {'SKU': values['sku'], 'Nazov': values['name'], 'Pocet_ks': ...}
+
+    Volitelne rychla cesta bez DOM: parse_raw(content, url, encoding) vrati riadok priamo
+    z bajtov stranky, None = pouzije sa parse_product (vypina config.fast_parse=False).
     """
 
+    # Deklarativne polia: nazov -> Selector alebo tuple Selectorov (fallbacky)
+    FIELDS: Dict[str, Any] = {}
+
     DEFAULT_HEADERS = {
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
         'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
         'Accept-Language': 'sk,cs;q=0.9,en;q=0.8',
     }
 
+    # Retry strategia zdielana thread aj async enginom
+    RETRY_TOTAL = 3
+    RETRY_BACKOFF = 1  # 1s, 2s, 4s
+    RETRY_STATUSES = [429, 500, 502, 503, 504]
+
+    # Pevna schema vystupneho CSV v poradi (None = podla prveho riadku), URL sa doplni na koniec
+    COLUMNS: Optional[List[str]] = None
+
+    # Stlpce vystupu pre delta subor a snapshoty (cena je volitelna - ak stlpec chyba, ostane prazdna)
+    KEY_COLUMN = 'SKU'
+    NAME_COLUMN = 'Nazov'
+    QTY_COLUMN = 'Pocet_ks'
+    PRICE_COLUMN = 'Cena'
+
     def __init__(self, config: ScraperConfig):
         self.config = config
         self.logger = self._setup_logger()
-        self.results: List[Dict] = []
+        self.sitemap_meta: Dict[str, Dict[str, str]] = {}  # URL -> lastmod/changefreq/priority
+        self._host_encodings: Dict[str, str] = {}  # kodovanie zistene z prvej stranky hostu
+        self._field_plan = FieldPlan(self.FIELDS) if self.FIELDS else None
+        self.cache = HttpCache(os.path.join(config.cache_dir, self.name), version=self.parser_version()) \
+            if config.cache_dir else None
+        # Ciastocne citanie stranok (opt-in): len po stream_markers / max_page_bytes
+        if config.stream_markers:
+            self._check_stream_markers(config.stream_markers)
+        self.page_reader = PageReader(config.stream_markers, config.max_page_bytes) \
+            if config.stream_markers or config.max_page_bytes else None
+        self.rate_limiter = self._create_rate_limiter()
+        self.journal = CheckpointJournal(self._journal_path(), config.sitemap_url) if config.checkpoint else None
+        self.metrics = self._create_metrics()
+
+        if config.parser == 'selectolax':
+            if SelectolaxParser is None:
+                raise RuntimeError("parser='selectolax' vyzaduje balik selectolax (pip install selectolax)")
+            if not self.FIELDS:
+                raise ValueError(f"parser='selectolax' funguje len so scrapermi s FIELDS ({self.__class__.__name__} ich nema)")
+        if config.snapshot_dir and not snapshot_store.pa:
+            raise RuntimeError("snapshot_dir vyzaduje balik pyarrow (pip install pyarrow)")
+
+    @property
+    def name(self) -> str:
+        """Nazov scrapera pre logy a cache"""
+        return self.__class__.__name__
+
+    def parser_version(self) -> str:
+        """
+        Verzia parsovania pre HTTP cache - hash zdrojoveho kodu tried scrapera, FIELDS,
+        COLUMNS a volieb, ktore menia riadok. Po zmene parsera sa ulozene riadky
+        nepouziju (stranka sa stiahne a spracuje znova).
+        """
+        digest = hashlib.sha1(f"{PARSE_VERSION}|{self.FIELDS!r}|{self.COLUMNS!r}|{self.config.parser}|"
+                              f"{self.config.fast_parse}|{self.config.stream_markers}|"
+                              f"{self.config.max_page_bytes}".encode('utf-8'))
+        for cls in type(self).__mro__:
+            if cls is BaseScraper:
+                break
+            try:
+                digest.update(inspect.getsource(cls).encode('utf-8'))
+            except (OSError, TypeError):
+                digest.update(cls.__qualname__.encode('utf-8'))
+        return digest.hexdigest()[:16]
+
+    def _check_stream_markers(self, markers: List[str]):
+        """
+        Znacky ciastocneho citania musia pochadzat zo selectorov FIELDS (trieda, id, atribut,
+        '<tag') - lubovolny retazec pred datami produktu by stranku orezal
+        """
+        if not self.FIELDS:
+            raise ValueError(f"stream_markers funguju len so scrapermi s FIELDS ({self.__class__.__name__} ich nema)")
+        tokens = {token for selectors in self.FIELDS.values()
+                  for selector in ((selectors,) if isinstance(selectors, Selector) else selectors)
+                  for token in selector_tokens(selector.css)}
+        unknown = [marker for marker in markers if not any(token in marker for token in tokens)]
+        if unknown:
+            raise ValueError(f"stream_markers {unknown} nepochadzaju zo selectorov FIELDS "
+                             f"(znacka musi obsahovat jedno z: {', '.join(sorted(tokens))})")
 
     def _setup_logger(self) -> logging.Logger:
         """Nastavi logger pre scraper"""
-        logger = logging.getLogger(self.__class__.__name__)
+        logger = logging.getLogger(self.name)
         logger.setLevel(logging.INFO)
 
         if not logger.handlers:
@@ -77,178 +265,1070 @@ class BaseScraper(ABC):
 
         return logger
 
-    def _create_session(self) -> requests.Session:
+    def _create_rate_limiter(self) -> Optional[RateLimiter]:
+        """Spolocny limiter vsetkych workerov; delay urcuje len pociatocnu rychlost"""
+        if not self.config.adaptive_rate:
+            return None
+        rate = self.config.connections / self.config.delay if self.config.delay > 0 else None
+        return RateLimiter(rate=rate, max_rate=self.config.max_rate)
+
+    def _create_metrics(self) -> ScraperMetrics:
+        return ScraperMetrics(self.name, supplier_name(self.config.output_file), self.config.engine)
+
+    def _create_session(self, limited: bool = True) -> requests.Session:
         """
         Vytvori session s retry logikou.
         Kazde vlakno by malo mat vlastnu session (thread-safety).
+        limited=False: requesty mimo rate limitera (sitemap) - 429/503 opakuje urllib3.
         """
         session = requests.Session()
         session.headers.update(self.DEFAULT_HEADERS)
 
         # Retry strategia: 3 pokusy s exponential backoff
+        # 429/503 s rate limiterom opakuje fetch_page (limiter musi vidiet kazdy z nich) - urllib3
+        # by inak 429/503 s Retry-After opakoval sam bez ohladu na status_forcelist
+        limited = limited and bool(self.rate_limiter)
+        statuses = [status for status in self.RETRY_STATUSES
+                    if not (limited and status in THROTTLE_STATUSES)]
         retry_strategy = Retry(
-            total=3,
-            backoff_factor=1,  # 1s, 2s, 4s
-            status_forcelist=[429, 500, 502, 503, 504],
-            allowed_methods=["GET"]
+            total=self.RETRY_TOTAL,
+            backoff_factor=self.RETRY_BACKOFF,
+            status_forcelist=statuses,
+            allowed_methods=["GET"],
+            respect_retry_after_header=not limited
         )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        # Adapter meria aj nadviazanie novych spojeni (faza connect v metrikach)
+        adapter = TimedHTTPAdapter(self.metrics, max_retries=retry_strategy)
         session.mount("http://", adapter)
         session.mount("https://", adapter)
 
         return session
 
-    def get_sitemap_urls(self) -> List[str]:
-        """Stiahne a spracuje sitemap, vrati zoznam URL produktov"""
-        self.logger.info(f"Stahujem sitemap: {self.config.sitemap_url}")
-
-        session = self._create_session()
-        try:
-            response = session.get(self.config.sitemap_url, timeout=30)
-            response.raise_for_status()
-
-            content = response.content
-
-            # Ak je sitemap gzipovana
-            if content.startswith(b'\x1f\x8b'):
-                content = gzip.GzipFile(fileobj=io.BytesIO(content)).read()
-
-            soup = BeautifulSoup(content, 'lxml-xml')
+    def iter_sitemap_entries(self) -> Iterator[Tuple[str, Dict[str, str]]]:
+        """Streamovo vracia (url, meta) zo sitemap vratane vnorenych sitemap z <sitemapindex>"""
+        reader = SitemapReader(
+            lambda: self._create_session(limited=False),
+            max_workers=min(4, self.config.max_workers),
+            cache=self.cache,
+            logger=self.logger,
+        )
+        return reader.iter_entries(self.config.sitemap_url)
 
-            all_urls = []
-            for url_tag in soup.find_all('url'):
-                loc = url_tag.find('loc', recursive=False)
-                if loc and loc.text:
-                    all_urls.append(loc.text)
+    def iter_sitemap_urls(self) -> Iterator[str]:
+        """Streamovo vracia URL produktov filtrovane podla blacklistu, meta uklada do sitemap_meta"""
+        self.logger.info(f"Stahujem sitemap: {self.config.sitemap_url}")
 
-            # Ak nie su <url> tagy, skus priamo <loc>
-            if not all_urls:
-                all_urls = [loc.text for loc in soup.find_all('loc') if loc.text]
+        total = found = 0
+        for url, meta in self.iter_sitemap_entries():
+            total += 1
+            if any(pattern in url for pattern in self.config.url_blacklist):
+                continue
+            if meta:
+                self.sitemap_meta[url] = meta
+            found += 1
+            yield url
 
-            # Filtruj podla blacklistu
-            filtered_urls = [
-                url for url in all_urls
-                if not any(pattern in url for pattern in self.config.url_blacklist)
-            ]
+        self.logger.info(f"Najdenych {found} URL (z {total} celkovo)")
 
-            self.logger.info(f"Najdenych {len(filtered_urls)} URL (z {len(all_urls)} celkovo)")
-            return filtered_urls
+    def get_sitemap_urls(self) -> List[str]:
+        """Stiahne a spracuje sitemap, vrati zoznam URL produktov"""
+        return list(self.iter_sitemap_urls())
 
-        except requests.RequestException as e:
-            self.logger.error(f"Chyba pri stahovani sitemap: {e}")
-            return []
-        finally:
-            session.close()
+    def _url_source(self) -> Iterable[str]:
+        """
+        Zdroj URL pre run(). Ak podtrieda neprepisuje get_sitemap_urls, URL sa citaju
+        streamovo a scraping zacne skor, nez je cela sitemap stiahnuta.
+        """
+        if type(self).get_sitemap_urls is BaseScraper.get_sitemap_urls:
+            return self.iter_sitemap_urls()
+        return self.get_sitemap_urls()
 
-    @abstractmethod
     def parse_product(self, soup: BeautifulSoup, url: str) -> Optional[Dict[str, Any]]:
         """
         Spracuje HTML stranku produktu a vrati data.
+        Podtrieda ju implementuje, alebo definuje FIELDS + build_product.
 
         Args:
-            soup: BeautifulSoup objekt s HTML strankou
+            soup: BeautifulSoup objekt s HTML strankou (pri parser='selectolax' selectolax dokument)
             url: URL stranky
 
         Returns:
             Dict s klucmi 'SKU', 'Nazov', 'Pocet_ks' alebo None ak parsing zlyhal
         """
-        pass
+        if not self.FIELDS:
+            raise NotImplementedError(f"{self.__class__.__name__} musi implementovat parse_product alebo FIELDS")
+        return self.build_product(self.extract_fields(soup), url)
 
-    def scrape_product(self, url: str, session: requests.Session) -> Optional[Dict]:
-        """Stiahne a spracuje jednu produktovu stranku"""
-        try:
-            if self.config.delay > 0:
-                time.sleep(self.config.delay)
+    def parse_raw(self, content: bytes, url: str, encoding: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Volitelna rychla cesta bez DOM - riadok priamo zo surovych bajtov stranky
+        (napr. JSON v skripte). None = nepodarilo sa, pouzije sa parse_product.
 
-            response = session.get(url, timeout=self.config.timeout)
+        encoding: kodovanie z hlavicky alebo zistene na predoslej stranke hostu (moze byt None)
+        """
+        return None
+
+    def extract_fields(self, doc) -> Dict[str, Optional[str]]:
+        """Hodnoty FIELDS z dokumentu - None ak element nebol najdeny, '' ak je prazdny"""
+        return self._field_plan.extract(doc)
+
+    def build_product(self, values: Dict[str, Optional[str]], url: str) -> Optional[Dict[str, Any]]:
+        """Z hodnot FIELDS posklada riadok produktu (pri deklarativnych scraperoch)"""
+        raise NotImplementedError(f"{self.__class__.__name__} musi implementovat build_product")
+
+    def fetch_page(self, url: str, session: requests.Session,
+                   full: bool = False) -> Optional[Tuple[int, bytes, Mapping[str, str], bool]]:
+        """
+        Stiahne produktovu stranku (podmieneny GET), vrati (status, telo, hlavicky, ci je telo
+        len zaciatok stranky) pre 200/304. full=True cita celu stranku aj s page_reader.
+        """
+        headers = self.cache.conditional_headers(url) if self.cache else {}
+        # 429/503 s rate limiterom opakuje tento cyklus, ostatne retry robi urllib3
+        attempts = self.RETRY_TOTAL + 1 if self.rate_limiter else 1
+        for attempt in range(attempts):
+            if attempt:
+                self.metrics.count_retry()
+            if self.rate_limiter or self.config.delay > 0:
+                waited = time.perf_counter()
+                if self.rate_limiter:
+                    self.rate_limiter.wait(url)
+                else:
+                    time.sleep(self.config.delay)
+                self.metrics.observe('throttle', time.perf_counter() - waited)
 
-            if response.status_code != 200:
-                return None
+            started = time.perf_counter()
 
-            response.encoding = response.apparent_encoding or 'utf-8'
-            soup = BeautifulSoup(response.content, 'html.parser')
+            response = session.get(url, timeout=self.config.timeout, headers=headers,
+                                   stream=self.page_reader is not None and not full)
+            content, nbytes, partial = self._read_body(response, full)
+            self.metrics.observe_response(response, time.perf_counter() - started, nbytes)
+            if not self.rate_limiter:
+                break
+            self.rate_limiter.record(url, response.status_code, response.elapsed.total_seconds(),
+                                     response.headers.get('Retry-After'))
+            if response.status_code not in THROTTLE_STATUSES:
+                break
 
-            result = self.parse_product(soup, url)
+        if response.status_code not in (200, 304):
+            self.metrics.count_failure(f"http_{response.status_code}")
+            return None
 
-            if result and result.get('SKU'):
-                result['URL'] = url
-                return result
+        return response.status_code, content, response.headers, partial
+
+    def _read_body(self, response: requests.Response, full: bool = False) -> Tuple[bytes, Optional[int], bool]:
+        """
+        Telo odpovede, precitane bajty (None = cele response.content) a ci je telo len zaciatok
+        stranky; stranky 200 cez page_reader (okrem full=True)
+        """
+        if not self.page_reader or full or response.status_code != 200:
+            return response.content, None, False
+        content, nbytes, partial = self.page_reader.read(response)
+        if partial:
+            self.metrics.count_partial()
+        return content, nbytes, partial
+
+    def scrape_product(self, url: str, session: requests.Session, full: bool = False) -> Optional[Dict]:
+        """Stiahne a spracuje jednu produktovu stranku (full=True bez ciastocneho citania)"""
+        started = time.perf_counter()
+        try:
+            result = self._process_page(url, self.fetch_page(url, session, full))
+            if result is _FULL_READ:
+                result = self._process_page(url, self.fetch_page(url, session, full=True))
+            return result
 
         except requests.RequestException as e:
             self.logger.debug(f"Request error pre {url}: {e}")
+            self.metrics.count_failure(f"request:{type(e).__name__}")
         except Exception as e:
-            self.logger.debug(f"Parse error pre {url}: {e}")
+            self.logger.debug(f"Chyba pre {url}: {e}")
+            self.metrics.count_failure(f"error:{type(e).__name__}")
+        finally:
+            self.metrics.observe('total', time.perf_counter() - started)
 
         return None
 
-    def _worker(self, urls: List[str]) -> List[Dict]:
-        """Worker funkcia pre jedno vlakno - ma vlastnu session"""
+    def _process_page(self, url: str, fetched: Optional[Tuple[int, bytes, Mapping[str, str], bool]]):
+        """
+        Vysledok stiahnutia -> riadok: 304 z cache, inak parse_product (thread aj async engine).
+        _FULL_READ = ciastocne precitanej stranke chyba pole, treba ju stiahnut celu.
+        """
+        if fetched is None:
+            return None
+
+        status, content, headers, partial = fetched
+        if status == 304:
+            return self.cache.get_row(url)
+
+        result, failure, seconds = self._parse_content(content, url, header_charset(headers), partial)
+        self._record_parse(failure, seconds)
+        if failure == INCOMPLETE_PAGE:
+            return _FULL_READ
+
+        if self.cache:
+            self.cache.store(url, headers, row=result)
+        return result
+
+    def _record_parse(self, failure: Optional[str], seconds: float):
+        self.metrics.observe('parse', seconds)
+        if failure:
+            self.metrics.count_failure(failure)
+
+    def parse_document(self, content: bytes, url: str, encoding: Optional[str] = None):
+        """
+        Vytvori dokument podla config.parser. Kodovanie sa detekuje len na prvej stranke
+        hostu (ak ho neposle server), dalsie stranky dostanu zistene kodovanie ako hint.
+        """
+        host = urlparse(url).netloc
+        encoding = encoding or self._host_encodings.get(host)
+
+        if self.config.parser == 'selectolax':
+            return SelectolaxParser(content.decode(encoding or 'utf-8', errors='replace'))
+
+        soup = BeautifulSoup(content, self.config.parser, from_encoding=encoding)
+        if host not in self._host_encodings and soup.original_encoding not in (None, 'ascii'):
+            self._host_encodings[host] = soup.original_encoding
+        return soup
+
+    def _parse_content(self, content: bytes, url: str, encoding: Optional[str] = None,
+                       partial: bool = False) -> Tuple[Optional[Dict], Optional[str], float]:
+        """
+        Spusti parse_raw (fast_parse), inak parse_product nad HTML obsahom - spolocne pre vsetky
+        enginy (aj v parsovacom procese).
+        partial: content je len zaciatok stranky - ak v nom chyba niektore pole FIELDS, vrati
+        dovod INCOMPLETE_PAGE (pole moze byt az za precitanou castou).
+        Vrati (riadok, dovod ak riadok nie je, trvanie v sekundach); vynimky nepropaguje.
+        """
+        started = time.perf_counter()
+        try:
+            result = None
+            if self.config.fast_parse:
+                result = self.parse_raw(content, url, encoding or self._host_encodings.get(urlparse(url).netloc))
+            if result is None:
+                soup = self.parse_document(content, url, encoding)
+                if partial and self._field_plan:
+                    values = self.extract_fields(soup)
+                    if any(value is None for value in values.values()):
+                        return None, INCOMPLETE_PAGE, time.perf_counter() - started
+                    result = self.build_product(values, url) \
+                        if type(self).parse_product is BaseScraper.parse_product else self.parse_product(soup, url)
+                else:
+                    result = self.parse_product(soup, url)
+        except Exception as e:
+            self.logger.debug(f"Parse error pre {url}: {e}")
+            return None, f"parse:{type(e).__name__}", time.perf_counter() - started
+        seconds = time.perf_counter() - started
+
+        if not result or not result.get('SKU'):
+            # Zaciatok stranky bez produktu - produkt moze byt za precitanou castou
+            if partial:
+                return None, INCOMPLETE_PAGE, seconds
+            return None, 'no_product' if not result else 'no_sku', seconds
+        result['URL'] = url
+        return result, None, seconds
+
+    def _log_progress(self, processed: int, total: Optional[int], found: int):
+        """Loguje progress priblizne po 5% (a vzdy na konci); pri streamovanej sitemap po 100 URL"""
+        if total is None:
+            if processed % 100 == 0:
+                self.logger.info(f"Progress: {processed}/? | Najdene: {found}")
+            return
+        log_every = max(1, total // 20)
+        if processed % log_every == 0 or processed == total:
+            self.logger.info(f"Progress: {processed}/{total} | Najdene: {found}")
+
+    def _worker(self, url_queue: 'queue.Queue[Optional[str]]',
+                process: Callable[[str, requests.Session], None], stop: threading.Event) -> None:
+        """
+        Worker funkcia pre jedno vlakno - ma vlastnu session.
+        Berie URL zo spolocnej fronty po batch_size kusoch az po None (koniec),
+        takze pomale stranky jedneho workera nezdrzia ostatnych.
+        Chyba jednej URL sa zapocita ako zlyhanie; rozbity executor (pipeline)
+        zastavi vsetky vlakna a vyhodi sa volajucemu.
+        """
         session = self._create_session()
-        results = []
 
         try:
-            for url in urls:
-                data = self.scrape_product(url, session)
-                if data:
-                    results.append(data)
-        finally:
-            session.close()
+            finished = False
+            while not finished and not stop.is_set():
+                try:
+                    batch = [url_queue.get(timeout=QUEUE_POLL)]
+                except queue.Empty:
+                    continue
+                # Kazdy worker si vezme prave jednu koncovu znacku None (davka po nej konci)
+                while len(batch) < self.config.batch_size and batch[-1] is not None:
+                    try:
+                        batch.append(url_queue.get_nowait())
+                    except queue.Empty:
+                        break
 
-        return results
+                if batch[-1] is None:
+                    finished = True
+                    batch.pop()
 
-    def run(self) -> pd.DataFrame:
-        """Spusti scraper a vrati DataFrame s vysledkami"""
-        urls = self.get_sitemap_urls()
+                for url in batch:
+                    try:
+                        process(url, session)
+                    except BrokenExecutor:
+                        raise
+                    except Exception as e:
+                        self.logger.debug(f"Chyba pre {url}: {e}")
+                        self.metrics.count_failure(f"error:{type(e).__name__}")
+        except BaseException:
+            stop.set()
+            raise
+        finally:
+            session.close()
 
-        if not urls:
-            self.logger.warning("Ziadne URL na spracovanie")
-            return pd.DataFrame()
+    def _run_fetchers(self, urls: Iterable[str], process: Callable[[str, requests.Session], None]):
+        """
+        Spusti max_workers vlakien, ktore si beru URL zo spolocnej fronty (work stealing).
+        Frontu plni samostatne vlakno zo zdroja URL (aj streamovanej sitemap);
+        fronta je ohranicena, takze citanie sitemap nepredbehne scraping o vela.
+        Ked worker skonci chybou, stop zastavi ostatne vlakna aj producenta
+        (inak by cakal na plnej fronte) a chyba sa vyhodi.
+        """
+        workers = self.config.max_workers
+        url_queue = queue.Queue(maxsize=workers * self.config.batch_size * 4)
+        stop = threading.Event()
 
-        self.logger.info(f"Spustam scraping {len(urls)} produktov ({self.config.max_workers} vlakien)")
-        start_time = time.time()
+        def put(item: Optional[str]) -> bool:
+            while not stop.is_set():
+                try:
+                    url_queue.put(item, timeout=QUEUE_POLL)
+                    return True
+                except queue.Full:
+                    continue
+            return False
 
-        # Rozdel URL medzi workery
-        chunk_size = max(1, len(urls) // self.config.max_workers)
-        url_chunks = [urls[i:i + chunk_size] for i in range(0, len(urls), chunk_size)]
+        def produce():
+            try:
+                for url in urls:
+                    if not put(url):
+                        return
+            except Exception as e:
+                self.logger.error(f"Chyba pri citani URL: {e}")
+            finally:
+                for _ in range(workers):
+                    if not put(None):
+                        break
 
-        all_results = []
-        processed = 0
+        producer = threading.Thread(target=produce, daemon=True)
+        producer.start()
 
-        with ThreadPoolExecutor(max_workers=self.config.max_workers) as executor:
-            futures = {executor.submit(self._worker, chunk): i for i, chunk in enumerate(url_chunks)}
+        error = None
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(self._worker, url_queue, process, stop) for _ in range(workers)]
 
             for future in as_completed(futures):
                 try:
-                    chunk_results = future.result()
-                    all_results.extend(chunk_results)
-                    processed += len(url_chunks[futures[future]])
-
-                    self.logger.info(f"Progress: {processed}/{len(urls)} | Najdene: {len(all_results)}")
+                    future.result()
                 except Exception as e:
                     self.logger.error(f"Worker error: {e}")
+                    error = error or e
 
-        self.results = all_results
+        stop.set()
+        producer.join()
+        if error:
+            raise error
 
-        # Uloz do CSV
-        if all_results:
-            df = pd.DataFrame(all_results)
-            df.to_csv(
-                self.config.output_file,
-                index=False,
-                encoding='utf-8-sig',
-                sep=self.config.csv_separator
-            )
+    def _run_threads(self, urls: Iterable[str], collector: '_ResultCollector'):
+        """Thread engine - kazde vlakno stiahne aj spracuje svoje URL"""
+        self._run_fetchers(urls, lambda url, session: collector.add(url, self.scrape_product(url, session)))
 
-            duration = (time.time() - start_time) / 60
-            self.logger.info(f"HOTOVO! {len(df)} produktov za {duration:.2f} minut -> {self.config.output_file}")
-            return df
+    # === PIPELINE ENGINE ===
+
+    def _run_pipeline(self, urls: Iterable[str], collector: '_ResultCollector'):
+        """
+        Pipeline engine - vlakna len stahuju, parse_product bezi v ProcessPoolExecutor.
+        Stiahnute stranky cakajuce na parsing su ohranicene (backpressure na stahovanie),
+        takze priepustnost parsingu rastie s poctom CPU a nie je zavisla od GIL.
+        """
+        parse_workers = self.config.parse_workers
+        slots = threading.BoundedSemaphore(parse_workers * 4)
+        broken: List[BaseException] = []
+        local = threading.local()
+        sessions: List[requests.Session] = []
+
+        def add(url: str, result: Optional[Dict]):
+            try:
+                collector.add(url, result)
+            except Exception as e:
+                # Vynimka v callbacku by sa len zalogovala cez concurrent.futures
+                self.logger.debug(f"Chyba pre {url}: {e}")
+                self.metrics.count_failure(f"error:{type(e).__name__}")
+
+        def full_read(url: str):
+            # Ciastocne precitanej stranke chyba pole - cela stranka sa stiahne a spracuje vo vlakne
+            if not hasattr(local, 'session'):
+                local.session = self._create_session()
+                sessions.append(local.session)
+            add(url, self.scrape_product(url, local.session, full=True))
+
+        def on_parsed(url: str, headers: Mapping[str, str], started: float, future):
+            slots.release()
+            try:
+                result, failure, seconds = future.result()
+            except Exception as e:
+                if isinstance(e, BrokenExecutor):
+                    broken.append(e)
+                self.logger.debug(f"Parse error pre {url}: {e}")
+                self.metrics.count_failure(f"parse:{type(e).__name__}")
+                result = None
+            else:
+                self._record_parse(failure, seconds)
+                if failure == INCOMPLETE_PAGE:
+                    full_reads.submit(full_read, url)
+                    return
+                if self.cache:
+                    self.cache.store(url, headers, row=result)
+            self.metrics.observe('total', time.perf_counter() - started)
+            add(url, result)
+
+        # Vonkajsi pool docka cele citania, ktore odoslali callbacky parsovania
+        # spawn: procesy sa nevytvaraju forkom z procesu, v ktorom uz bezia stahovacie vlakna
+        with ThreadPoolExecutor(max_workers=self.config.max_workers) as full_reads, \
+                ProcessPoolExecutor(max_workers=parse_workers, mp_context=multiprocessing.get_context('spawn'),
+                                    initializer=_init_parse_worker, initargs=(self,)) as parsers:
+            def process(url: str, session: requests.Session):
+                started = time.perf_counter()
+                try:
+                    fetched = self.fetch_page(url, session)
+                except requests.RequestException as e:
+                    self.logger.debug(f"Request error pre {url}: {e}")
+                    self.metrics.count_failure(f"request:{type(e).__name__}")
+                    fetched = None
+                except Exception as e:
+                    self.logger.debug(f"Chyba pre {url}: {e}")
+                    self.metrics.count_failure(f"error:{type(e).__name__}")
+                    fetched = None
+
+                if fetched is None or fetched[0] == 304:
+                    self.metrics.observe('total', time.perf_counter() - started)
+                    collector.add(url, self.cache.get_row(url) if fetched else None)
+                    return
+
+                status, content, headers, partial = fetched
+                slots.acquire()
+                try:
+                    future = parsers.submit(_parse_in_worker, content, url, header_charset(headers), partial)
+                except BaseException:
+                    slots.release()
+                    raise
+                future.add_done_callback(lambda f: on_parsed(url, headers, started, f))
+
+            self._run_fetchers(urls, process)
+        for session in sessions:
+            session.close()
+        # Parsovaci proces zomrel az po odoslani poslednych stranok
+        if broken:
+            raise broken[0]
+
+    # === ASYNC ENGINE ===
+
+    async def _fetch_async(self, url: str, session: 'aiohttp.ClientSession',
+                           headers: Optional[Dict[str, str]] = None, full: bool = False):
+        """
+        Stiahne stranku cez zdielany connection pool, retry ako pri thread engine.
+        Vrati (status, telo, hlavicky, ci je telo len zaciatok stranky) pre 200/304, inak None.
+        """
+        throttled = False
+        failure = None
+        for attempt in range(self.RETRY_TOTAL + 1):
+            # Po 429/503 caka rate limiter (vratane Retry-After), nie backoff
+            if attempt:
+                self.metrics.count_retry()
+                if not throttled:
+                    await asyncio.sleep(self.RETRY_BACKOFF * 2 ** (attempt - 1))
+            if self.rate_limiter:
+                waited = time.perf_counter()
+                await self.rate_limiter.wait_async(url)
+                self.metrics.observe('throttle', time.perf_counter() - waited)
+            started = time.perf_counter()
+            try:
+                async with session.get(url, headers=headers) as response:
+                    ttfb = time.perf_counter() - started
+                    self.metrics.observe('ttfb', ttfb)
+                    self.metrics.count_status(response.status)
+                    if self.rate_limiter:
+                        self.rate_limiter.record(url, response.status, ttfb,
+                                                 response.headers.get('Retry-After'))
+                    throttled = bool(self.rate_limiter) and response.status in THROTTLE_STATUSES
+                    failure = f"http_{response.status}"
+                    if response.status in self.RETRY_STATUSES:
+                        continue
+                    if response.status not in (200, 304):
+                        break
+                    read_started = time.perf_counter()
+                    partial = False
+                    if self.page_reader and not full and response.status == 200:
+                        body, nbytes, partial = await self.page_reader.read_async(response)
+                        if partial:
+                            self.metrics.count_partial()
+                    else:
+                        body = await response.read()
+                        nbytes = len(body)
+                    self.metrics.observe('download', time.perf_counter() - read_started)
+                    self.metrics.add_bytes(nbytes)
+                    return response.status, body, response.headers, partial
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                throttled = False
+                failure = f"request:{type(e).__name__}"
+                self.logger.debug(f"Request error pre {url} (pokus {attempt + 1}): {e}")
+        self.metrics.count_failure(failure)
+        return None
+
+    async def _scrape_product_async(self, url: str, session: 'aiohttp.ClientSession',
+                                    parsers: ThreadPoolExecutor) -> Optional[Dict]:
+        """
+        Async obdoba scrape_product - parsing bezi v parsers (vlakna), aby neblokoval
+        event loop a nepredlzoval cakanie ostatnych requestov (ani ich meranu latenciu).
+        """
+        started = time.perf_counter()
+        if not self.rate_limiter and self.config.delay > 0:
+            await asyncio.sleep(self.config.delay)
+            self.metrics.observe('throttle', time.perf_counter() - started)
+
+        headers = self.cache.conditional_headers(url) if self.cache else None
+        loop = asyncio.get_running_loop()
+        try:
+            fetched = await self._fetch_async(url, session, headers)
+            result = await loop.run_in_executor(parsers, self._process_page, url, fetched)
+            if result is _FULL_READ:
+                fetched = await self._fetch_async(url, session, headers, full=True)
+                result = await loop.run_in_executor(parsers, self._process_page, url, fetched)
+            return result
+        except Exception as e:
+            self.logger.debug(f"Chyba pre {url}: {e}")
+            self.metrics.count_failure(f"error:{type(e).__name__}")
+            return None
+        finally:
+            self.metrics.observe('total', time.perf_counter() - started)
+
+    async def _run_async_main(self, urls: Iterable[str], collector: '_ResultCollector'):
+        url_iter = iter(urls)
+        buffer: List[str] = []
+        refill_lock = asyncio.Lock()
+        loop = asyncio.get_running_loop()
+
+        async def next_url() -> Optional[str]:
+            # Zdroj URL moze blokovat (streamovana sitemap), preto sa buffer doplna mimo event loopu
+            async with refill_lock:
+                if not buffer:
+                    buffer.extend(await loop.run_in_executor(None, lambda: list(islice(url_iter, 500))))
+                    buffer.reverse()
+                return buffer.pop() if buffer else None
+
+        connector = aiohttp.TCPConnector(
+            limit=self.config.max_in_flight,
+            limit_per_host=self.config.max_in_flight,
+            ttl_dns_cache=300,
+        )
+        timeout = aiohttp.ClientTimeout(total=self.config.timeout)
+
+        with ThreadPoolExecutor(max_workers=self.config.max_workers) as parsers:
+            async with aiohttp.ClientSession(headers=self.DEFAULT_HEADERS, connector=connector, timeout=timeout,
+                                             trace_configs=[self.metrics.trace_config()]) as session:
+                async def worker():
+                    while True:
+                        url = await next_url()
+                        if url is None:
+                            break
+                        collector.add(url, await self._scrape_product_async(url, session, parsers))
+
+                await asyncio.gather(*(worker() for _ in range(self.config.max_in_flight)))
+
+    def _run_async(self, urls: Iterable[str], collector: '_ResultCollector'):
+        """Async engine - vsetky requesty z jedneho event loopu so zdielanym keep-alive poolom"""
+        if aiohttp is None:
+            raise RuntimeError("engine='async' vyzaduje balik aiohttp (pip install aiohttp)")
+        asyncio.run(self._run_async_main(urls, collector))
+
+    # === INKREMENTALNY REZIM ===
+
+    def _state_path(self) -> str:
+        return os.path.join(self.config.state_dir, os.path.basename(self.config.output_file) + '.json')
+
+    def _journal_path(self) -> str:
+        return os.path.join(self.config.state_dir, os.path.basename(self.config.output_file) + '.journal')
+
+    def _load_state(self) -> Dict[str, str]:
+        """URL -> lastmod z posledneho uspesneho behu"""
+        try:
+            with open(self._state_path(), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_state(self):
+        state = {url: meta['lastmod'] for url, meta in self.sitemap_meta.items() if meta.get('lastmod')}
+        if not state:
+            return
+        os.makedirs(self.config.state_dir, exist_ok=True)
+        tmp = self._state_path() + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(tmp, self._state_path())
+
+    def _load_previous_rows(self) -> Dict[str, Dict]:
+        """Riadky z predchadzajuceho output_file podla URL"""
+        try:
+            with open(self.config.output_file, 'r', encoding='utf-8-sig', newline='') as f:
+                reader = csv.DictReader(f, delimiter=self.config.csv_separator)
+                return {row['URL']: row for row in reader if row.get('URL')}
+        except (OSError, KeyError, csv.Error):
+            return {}
+
+    def _skip_unchanged(self, urls: Iterable[str], carry: Callable[[Dict], None]) -> Iterator[str]:
+        """
+        Vracia len URL na stiahnutie, riadky nezmenenych URL odovzda do carry.
+        URL sa preskoci len ak ma <lastmod> rovnaky ako pri poslednom behu,
+        nema changefreq=always a predchadzajuci CSV pre nu ma riadok.
+        """
+        state = self._load_state()
+        previous = self._load_previous_rows() if state else {}
+
+        carried = fetched = 0
+        for url in urls:
+            meta = self.sitemap_meta.get(url, {})
+            lastmod = meta.get('lastmod')
+            if (lastmod and state.get(url) == lastmod and url in previous
+                    and meta.get('changefreq') != 'always'):
+                carried += 1
+                carry(previous[url])
+            else:
+                fetched += 1
+                yield url
+
+        self.logger.info(f"Inkrementalne: {carried} nezmenenych prevzatych, {fetched} na stiahnutie")
+
+    def _skip_done(self, urls: Iterable[str], done: Dict[str, Optional[Dict]],
+                   carry: Callable[[Dict], None]) -> Iterator[str]:
+        """Vracia len URL, ktore preruseny beh nestihol; riadky hotovych URL odovzda do carry"""
+        resumed = 0
+        for url in urls:
+            if url in done:
+                resumed += 1
+                if done[url]:
+                    carry(done[url])
+            else:
+                yield url
+        self.logger.info(f"Obnovenie: {resumed} URL hotovych z prerusenoho behu")
+
+    def _write_metrics(self, collector: '_ResultCollector', output: '_ResultWriter'):
+        """Report metrik behu do metrics_dir (aj pri preruseni - vtedy je najzaujimavejsi)"""
+        extra = {'rate_limit': self.rate_limiter.rates()} if self.rate_limiter else {}
+        self.metrics.finish(urls=collector.processed, products=output.rows, **extra)
+        self.logger.info(f"Metriky: {self.metrics.describe()}")
+        if not self.config.metrics_dir:
+            return
+        path = os.path.join(self.config.metrics_dir, self.metrics.supplier)
+        try:
+            self.metrics.write_json(path + '.json')
+            if self.config.metrics_prometheus:
+                self.metrics.write_prometheus(path + '.prom')
+        except OSError as e:
+            self.logger.warning(f"Report metrik sa nepodarilo zapisat: {e}")
+
+    def run(self, resume: Optional[bool] = None) -> int:
+        """
+        Spusti scraper a vrati pocet zapisanych produktov. Riadky sa priebezne
+        streamuju do output_file (docasny subor, nahradi sa az na konci).
+        resume=True pokracuje v prerusenom behu podla zurnalu (None = podla SCRAPER_RESUME).
+        Zmena oproti starsim verziam: nevracia DataFrame a nenastavuje self.results -
+        riadky vrati read_results() (alebo pd.read_csv nad output_file).
+        """
+        if resume is None:
+            resume = default_resume()
+        self.metrics = self._create_metrics()
+        urls = self._url_source()
+
+        # Prazdnu sitemap zistime uz z prveho URL (zdroj moze byt streamovany)
+        url_iter = iter(urls)
+        first = next(url_iter, None)
+        if first is None:
+            self.logger.warning("Ziadne URL na spracovanie")
+            return 0
+        total = len(urls) if isinstance(urls, list) else None
+        urls = chain([first], url_iter)
+
+        # Index predosleho vystupu (delta) sa postavi skor, nez ho novy CSV nahradi
+        output = _ResultWriter(self)
+        collector = _ResultCollector(self, total, output)
+
+        if self.config.incremental:
+            urls = self._skip_unchanged(urls, collector.carry)
+            total = None
+
+        done = self.journal.load() if self.journal and resume else {}
+        if done:
+            urls = self._skip_done(urls, done, collector.carry)
+            total = None
+        if self.journal:
+            self.journal.open(resume=bool(done))
+        collector.total = total
+
+        count = f"{total} produktov" if total is not None else "produktov (streamovane zo sitemap)"
+        if self.config.engine == 'async':
+            self.logger.info(f"Spustam scraping {count} (async, {self.config.max_in_flight} sucasnych requestov)")
+        elif self.config.engine == 'pipeline':
+            self.logger.info(f"Spustam scraping {count} ({self.config.max_workers} vlakien, "
+                             f"{self.config.parse_workers} parsovacich procesov)")
         else:
+            self.logger.info(f"Spustam scraping {count} ({self.config.max_workers} vlakien)")
+        start_time = time.time()
+
+        try:
+            if self.config.engine == 'async':
+                self._run_async(urls, collector)
+            elif self.config.engine == 'pipeline':
+                self._run_pipeline(urls, collector)
+            else:
+                self._run_threads(urls, collector)
+        except BaseException:
+            output.abort()
+            raise
+        finally:
+            # Pri vynimke / preruseni zurnal ostava pre run(resume=True)
+            if self.journal:
+                self.journal.close()
+            self._write_metrics(collector, output)
+
+        if not output.rows:
+            output.abort()
             self.logger.warning("Ziadne produkty neboli najdene")
-            return pd.DataFrame()
+            if self.journal:
+                self.journal.remove()
+            return 0
+
+        output.commit()
+        self._save_state()
+
+        if output.csv.extra_columns:
+            self.logger.warning(f"Stlpce mimo schemy vystupu sa nezapisali: {', '.join(sorted(output.csv.extra_columns))}")
+        if output.delta:
+            counts = output.delta.write()
+            self.logger.info(f"Delta: {SnapshotDelta.describe(counts)} -> {output.delta.delta_file}")
+        if output.snapshot:
+            output.snapshot.close()
+            self.logger.info(f"Snapshot: {output.snapshot.rows} riadkov -> {output.snapshot.path}")
+        if self.journal:
+            self.journal.remove()
+
+        duration = (time.time() - start_time) / 60
+        self.logger.info(f"HOTOVO! {output.rows} produktov za {duration:.2f} minut -> {self.config.output_file}")
+        return output.rows
+
+
+    def read_results(self) -> List[Dict[str, str]]:
+        """Riadky z output_file (hodnoty ako text z CSV); [] ak vystup este nie je zapisany"""
+        try:
+            with open(self.config.output_file, 'r', encoding='utf-8-sig', newline='') as f:
+                return list(csv.DictReader(f, delimiter=self.config.csv_separator))
+        except FileNotFoundError:
+            return []
+
+    @property
+    def results(self) -> List[Dict[str, str]]:
+        """Zastarane: run() uz vysledky v pamati nedrzi - pouzi read_results()"""
+        warnings.warn("BaseScraper.results je zastarane, riadky vrati read_results() z output_file",
+                      DeprecationWarning, stacklevel=2)
+        return self.read_results()
+
+
+class _ResultWriter:
+    """Streamovany vystup behu: CSV (docasny subor + os.replace), delta a Parquet snapshot"""
+
+    def __init__(self, scraper: BaseScraper):
+        config = scraper.config
+        columns = scraper.COLUMNS
+        if columns and 'URL' not in columns:
+            columns = [*columns, 'URL']
+        # Rovnaky format ako predtym pandas to_csv (BOM, LF)
+        self.csv = CsvSink(config.output_file, columns, delimiter=config.csv_separator,
+                           encoding='utf-8-sig', lineterminator='\n')
+        self.delta = None
+        if config.write_delta:
+            self.delta = SnapshotDelta(config.output_file, scraper.KEY_COLUMN, scraper.QTY_COLUMN,
+                                       scraper.PRICE_COLUMN, delimiter=config.csv_separator)
+        self.snapshot = None
+        if config.snapshot_dir:
+            # snapshots/supplier=<dodavatel>/date=<den>
+            self.snapshot = SnapshotWriter(config.snapshot_dir, supplier_name(config.output_file),
+                                           scraper.KEY_COLUMN, scraper.QTY_COLUMN, scraper.PRICE_COLUMN,
+                                           scraper.NAME_COLUMN)
+
+    @property
+    def rows(self) -> int:
+        return self.csv.written
+
+    def write(self, row: Dict):
+        self.csv.write(row)
+        if self.delta:
+            self.delta.add(row)
+        if self.snapshot:
+            self.snapshot.add(row)
+
+    def commit(self):
+        self.csv.commit()
+
+    def abort(self):
+        self.csv.abort()
+        if self.snapshot:
+            self.snapshot.abort()
+
+
+class _ResultCollector:
+    """
+    Thread-safe zber vysledkov a progress po jednotlivych URL (spolocny pre vsetky enginy).
+    Riadky sa hned zapisu do vystupu, v pamati sa nedrzia.
+    """
+
+    def __init__(self, scraper: BaseScraper, total: Optional[int], output: _ResultWriter):
+        self.scraper = scraper
+        self.total = total
+        self.output = output
+        self.processed = 0
+        self._lock = threading.Lock()
+
+    def add(self, url: str, data: Optional[Dict]):
+        if self.scraper.journal:
+            self.scraper.journal.record(url, data)
+        with self._lock:
+            if data:
+                self.output.write(data)
+            self.processed += 1
+            self.scraper._log_progress(self.processed, self.total, self.output.rows)
+
+    def carry(self, row: Dict):
+        """Prevzaty riadok (nezmenena URL / hotova pred prerusenim) - bez zurnalu a progressu"""
+        with self._lock:
+            self.output.write(row)
+
+
+# === PARSOVACIE PROCESY (pipeline engine) ===
+
+_parse_scraper: Optional[BaseScraper] = None
+
+
+def _init_parse_worker(scraper: BaseScraper):
+    """Initializer procesu - scraper sa prenesie raz, nie s kazdou strankou"""
+    global _parse_scraper
+    _parse_scraper = scraper
+
+
+def _parse_in_worker(content: bytes, url: str, encoding: Optional[str],
+                     partial: bool) -> Tuple[Optional[Dict], Optional[str], float]:
+    return _parse_scraper._parse_content(content, url, encoding, partial)
 
 
 # === POMOCNE FUNKCIE PRE PARSING ===
 
+_CHARSET_RE = re.compile(r'charset=["\']?([\w.:-]+)', re.IGNORECASE)
+
+
+def header_charset(headers: Mapping[str, str]) -> Optional[str]:
+    """Kodovanie z Content-Type hlavicky (None ak ho server neposlal)"""
+    match = _CHARSET_RE.search(headers.get('Content-Type', ''))
+    return match.group(1) if match else None
+
+
+def _is_selectolax(doc) -> bool:
+    return SelectolaxParser is not None and isinstance(doc, SelectolaxParser)
+
+
+def _own_string(el, selectolax: bool) -> Optional[str]:
+    """
+    Obdoba Tag.string z BeautifulSoup: jediny text elementu (aj cez retaz elementov
+    s jedinym potomkom), None ak ma element viac potomkov alebo ziadny text.
+    """
+    if not selectolax:
+        return str(el.string) if el.string is not None else None
+    node = el
+    while True:
+        child = node.child
+        if child is None or child.next is not None:
+            return None
+        if child.tag == '-text':
+            return child.text_content
+        node = child
+
+
+def _element_text(el, selector: Selector, selectolax: bool) -> Optional[str]:
+    if selector.own_text:
+        # Neorezany ako pri soup.find(string=...) - regex sa testuje na povodnom texte
+        return _own_string(el, selectolax)
+    if selectolax:
+        return el.text(deep=True, strip=selector.strip)
+    return el.get_text(strip=True) if selector.strip else el.get_text()
+
+
+def _element_value(el, selector: Selector, text_re, selectolax: bool) -> Optional[str]:
+    """Hodnota elementu podla selectoru, None ak nevyhovuje text regexu"""
+    if text_re is not None or not selector.attr:
+        text = _element_text(el, selector, selectolax)
+        if text is None or (text_re is not None and not text_re.search(text)):
+            return None
+        if not selector.attr:
+            return text.strip() if selector.own_text and selector.strip else text
+    return el.attributes.get(selector.attr) if selectolax else el.get(selector.attr)
+
+
+def select_value(doc, selector: Selector) -> Optional[str]:
+    """Text (alebo atribut) prveho elementu, ktory vyhovuje selectoru; None ak ziadny"""
+    text_re = re.compile(selector.text) if selector.text else None
+    selectolax = _is_selectolax(doc)
+
+    elements = doc.css(selector.css) if selectolax else doc.select(selector.css)
+    for el in elements:
+        value = _element_value(el, selector, text_re, selectolax)
+        if value is not None or (selector.attr and text_re is None):
+            return value
+    return None
+
+
+_COMPOUND_RE = re.compile(r'^(?:[a-zA-Z][\w-]*|\*)?(?:\.[\w-]+|\[[\w-]+(?:=(?:"[^"]*"|\'[^\']*\'|[^\]"\']*))?\])*$')
+_COMPOUND_PART_RE = re.compile(r'^([a-zA-Z][\w-]*|\*)|\.([\w-]+)|\[([\w-]+)(?:=(?:"([^"]*)"|\'([^\']*)\'|([^\]"\']*)))?\]')
+
+_CSS_TOKEN_RE = re.compile(r'[.#]([\w-]+)|\[\s*([\w-]+)\s*(?:[~|^$*]?=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\]"\'\s]*)))?\s*\]'
+                           r'|(?:^|(?<=[\s>+~,(]))([a-zA-Z][\w-]*)')
+
+
+def selector_tokens(css: str) -> List[str]:
+    """Casti CSS selectora viditelne v HTML elementu: triedy, id, hodnoty (alebo mena) atributov a '<tag'"""
+    tokens = []
+    for match in _CSS_TOKEN_RE.finditer(css):
+        name, attr, tag = match.group(1), match.group(2), match.group(6)
+        if name:
+            tokens.append(name)
+        elif attr:
+            tokens.append(next((v for v in match.group(3, 4, 5) if v), attr))
+        elif tag:
+            tokens.append(f'<{tag}')
+    return tokens
+
+
+class _Matcher:
+    """Predkompilovany jednoduchy CSS selector: tag, triedy a atributy"""
+
+    __slots__ = ('selector', 'tag', 'classes', 'attrs', 'text_re')
+
+    def __init__(self, selector: Selector):
+        self.selector = selector
+        self.tag = None
+        self.classes = set()
+        self.attrs = []
+        self.text_re = re.compile(selector.text) if selector.text else None
+
+        for match in _COMPOUND_PART_RE.finditer(selector.css):
+            tag, cls, attr = match.group(1), match.group(2), match.group(3)
+            if tag and tag != '*':
+                self.tag = tag.lower()
+            elif cls:
+                self.classes.add(cls)
+            elif attr:
+                value = next((v for v in match.group(4, 5, 6) if v is not None), None)
+                self.attrs.append((attr, value))
+
+    @staticmethod
+    def is_simple(css: str) -> bool:
+        return bool(css) and _COMPOUND_RE.match(css.strip()) is not None
+
+    def matches(self, classes: List[str], attrs: Mapping[str, Any]) -> bool:
+        if self.classes and not self.classes.issubset(classes):
+            return False
+        for name, value in self.attrs:
+            if name not in attrs:
+                return False
+            actual = attrs[name]
+            if isinstance(actual, list):
+                actual = ' '.join(actual)
+            if value is not None and actual != value:
+                return False
+        return True
+
+
+class FieldPlan:
+    """
+    Predkompilovane FIELDS. Polia, ktore maju len jednoduche selectory, sa vyhodnotia
+    jednym prechodom dokumentu (namiesto samostatneho soup.find pre kazde pole);
+    prechod konci, ked su vsetky polia najdene. Ostatne polia idu cez CSS select.
+    """
+
+    def __init__(self, fields: Dict[str, Any]):
+        self.names = list(fields)
+        self.complex: Dict[str, Tuple[Selector, ...]] = {}
+        self.simple_names = []
+        by_tag: Dict[Optional[str], list] = {}
+
+        for name, selectors in fields.items():
+            if isinstance(selectors, Selector):
+                selectors = (selectors,)
+            selectors = tuple(selectors)
+            if not all(_Matcher.is_simple(sel.css) for sel in selectors):
+                self.complex[name] = selectors
+                continue
+            self.simple_names.append(name)
+            for priority, selector in enumerate(selectors):
+                matcher = _Matcher(selector)
+                by_tag.setdefault(matcher.tag, []).append((name, priority, matcher))
+
+        any_tag = by_tag.pop(None, [])
+        self.any_tag = any_tag
+        self.by_tag = {tag: entries + any_tag for tag, entries in by_tag.items()}
+
+    def _iter_elements(self, doc, selectolax: bool):
+        """(element, tag, triedy, atributy) pre kazdy element dokumentu v poradi dokumentu"""
+        if selectolax:
+            for node in doc.root.traverse():
+                attrs = node.attributes
+                yield node, node.tag, (attrs.get('class') or '').split(), attrs
+        else:
+            for el in doc.descendants:
+                if el.name is None:
+                    continue
+                attrs = el.attrs
+                yield el, el.name, attrs.get('class') or (), attrs
+
+    def extract(self, doc) -> Dict[str, Optional[str]]:
+        selectolax = _is_selectolax(doc)
+        best: Dict[str, Tuple[int, Optional[str]]] = {}
+        done = 0
+        remaining = len(self.simple_names)
+
+        if remaining:
+            for el, tag, classes, attrs in self._iter_elements(doc, selectolax):
+                candidates = self.by_tag.get(tag, self.any_tag)
+                if not candidates:
+                    continue
+                for name, priority, matcher in candidates:
+                    current = best.get(name)
+                    if current is not None and current[0] <= priority:
+                        continue
+                    if not matcher.matches(classes, attrs):
+                        continue
+                    value = _element_value(el, matcher.selector, matcher.text_re, selectolax)
+                    if value is None and (matcher.text_re is not None or not matcher.selector.attr):
+                        continue
+                    best[name] = (priority, value)
+                    if priority == 0:
+                        done += 1
+                if done == remaining:
+                    break
+
+        values = {}
+        for name in self.names:
+            if name in self.complex:
+                values[name] = None
+                for selector in self.complex[name]:
+                    value = select_value(doc, selector)
+                    if value is not None:
+                        values[name] = value
+                        break
+            else:
+                values[name] = best[name][1] if name in best else None
+        return values
+
+
 def extract_number(text: str) -> int:
     """Extrahuje prve cislo z textu (napr. '15 ks' -> 15)"""
     if not text:
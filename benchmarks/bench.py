@@ -0,0 +1,322 @@
+"""
+Offline benchmark parsingu a feed konvertorov - bez pristupu na siet
+  parse: kazdy scraper (aj SpecScraper zo scrapers/*.json) x kazdy parser backend
+         prechadza produktove stranky z fixtures.py cez _parse_content
+         (parse_document + parse_product, presne ako enginy) -> stranky/s,
+         spicka alokovanej pamate na stranku (tracemalloc) a odtlacok vystupu;
+         scraper s rychlou cestou parse_raw ma navyse variant <scraper>/fast
+  feeds: kytary / pmc / muziker nad syntetickym feedom (default 100k poloziek)
+         cez FileSource -> polozky/s, spicka pamate, odtlacok vystupneho CSV
+
+Vysledky sa porovnaju s benchmarks/baseline.json: beh zlyha (exit 1), ak
+priepustnost klesne o viac ako --tolerance, alebo sa zmeni vystup. Generovane
+stranky maju aj ocakavany riadok - nespravny vysledok zlyha vzdy.
+Priepustnost zavisi od stroja: pred porovnanim zmeny si baseline zapis
+na rovnakom stroji z povodneho kodu (--update).
+
+Pouzitie:
+    python benchmarks/bench.py                        # parse + feeds, porovnanie s baseline
+    python benchmarks/bench.py parse --only 3dmx musictrade
+    python benchmarks/bench.py feeds --items 20000 --no-alloc
+    python benchmarks/bench.py --update               # novy baseline
+"""
+
+import os
+import io
+import sys
+import json
+import time
+import hashlib
+import argparse
+import platform
+import importlib
+import tracemalloc
+from contextlib import redirect_stdout
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT)
+
+from fixtures import FEEDS, Page, feed_file, product_pages  # noqa: E402
+
+BASELINE_FILE = os.path.join(BENCH_DIR, 'baseline.json')
+DATA_DIR = os.path.join(BENCH_DIR, '.data')
+
+# modul scrapera -> (trieda, dodavatel vo fixtures)
+SCRAPERS = {
+    'Alexim': ('ScraperAlexim', 'alexim'),
+    'eprodance': ('ScraperEprodance', 'eprodance'),
+    'musictrade': ('ScraperMusicTrade', 'musictrade'),
+}
+
+# scrapers/<spec>.json -> dodavatel vo fixtures
+SPECS = {
+    '3dmx': '3dmx',
+    'basys': 'basys',
+    'imusicnetwork': 'imusic',
+    'musicpark': 'musicpark',
+    'rockster': 'rockster',
+}
+
+# modul konvertora -> trieda
+CONVERTERS = {
+    'kytary': 'KytaryConverter',
+    'pmc': 'PmcConverter',
+    'muziker': 'MuzikerConverter',
+}
+
+# Scraper v benchmarku nic nezapisuje (cache, zurnal, metriky)
+QUIET_CONFIG = {'cache_dir': None, 'checkpoint': False, 'metrics_dir': None, 'write_delta': False,
+                'snapshot_dir': None}
+
+
+def fingerprint(value: Any) -> str:
+    return hashlib.sha1(json.dumps(value, sort_keys=True, default=str).encode('utf-8')).hexdigest()[:16]
+
+
+def file_fingerprint(path: str) -> str:
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()[:16]
+
+
+def peak_allocation(func: Callable[[], Any]) -> int:
+    """Spicka pamate alokovanej pocas func() v bajtoch (tracemalloc)"""
+    tracemalloc.reset_peak()
+    before = tracemalloc.get_traced_memory()[0]
+    func()
+    return tracemalloc.get_traced_memory()[1] - before
+
+
+# === PARSE ===
+
+def parse_targets(only: Optional[List[str]]) -> List[Tuple[str, str, Callable]]:
+    """(nazov, dodavatel, factory(parser, **config) -> scraper) pre vybrane scrapery"""
+    from base_scraper import ScraperConfig
+    from spec_scraper import SpecScraper
+
+    targets = []
+    for module_name, (class_name, supplier) in SCRAPERS.items():
+        if only and module_name.lower() not in only and supplier not in only:
+            continue
+        cls = getattr(importlib.import_module(module_name), class_name)
+
+        def factory(parser, cls=cls, **options):
+            return cls(ScraperConfig(sitemap_url='', output_file=os.devnull, parser=parser, **QUIET_CONFIG,
+                                     **options))
+        targets.append((class_name, supplier, factory))
+
+    for spec_name, supplier in SPECS.items():
+        if only and spec_name not in only and supplier not in only and 'spec' not in only:
+            continue
+        path = os.path.join(ROOT, 'scrapers', f'{spec_name}.json')
+
+        def factory(parser, path=path, **options):
+            return SpecScraper.from_file(path, output_file=os.devnull, parser=parser, **QUIET_CONFIG, **options)
+        targets.append((f'spec:{spec_name}', supplier, factory))
+    return targets
+
+
+def bench_parser(scraper, pages: List[Page], seconds: float, alloc: bool) -> Dict[str, Any]:
+    # Prvy prechod: vystup + zahriatie (kodovanie hostu, kompilovane regexy)
+    rows = [scraper._parse_content(page.content, page.url)[0] for page in pages]
+    wrong = 0
+    for page, row in zip(pages, rows):
+        if not page.known:
+            continue
+        actual = {key: value for key, value in row.items() if key != 'URL'} if row else None
+        if actual != page.expected:
+            wrong += 1
+
+    parsed = 0
+    started = time.perf_counter()
+    while True:
+        for page in pages:
+            scraper._parse_content(page.content, page.url)
+        parsed += len(pages)
+        elapsed = time.perf_counter() - started
+        if elapsed >= seconds:
+            break
+
+    result = {
+        'pages': len(pages),
+        'pages_per_sec': round(parsed / elapsed, 1),
+        'ms_per_page': round(elapsed / parsed * 1000, 3),
+        'output': fingerprint(rows),
+        'wrong': wrong,
+    }
+    if alloc:
+        tracemalloc.start()
+        try:
+            peaks = [peak_allocation(lambda page=page: scraper._parse_content(page.content, page.url))
+                     for page in pages]
+        finally:
+            tracemalloc.stop()
+        result['alloc_kb'] = round(sum(peaks) / len(peaks) / 1024, 1)
+    return result
+
+
+def run_parse(args) -> Dict[str, Dict[str, Any]]:
+    from base_scraper import PARSERS, BaseScraper, SelectolaxParser
+
+    results = {}
+    for name, supplier, factory in parse_targets(args.only):
+        pages = product_pages(supplier, args.pages)
+        # <scraper>/<parser> meria DOM cestu; scraper s parse_raw ma navyse <scraper>/fast
+        variants = []
+        for parser in PARSERS:
+            if parser == 'selectolax' and SelectolaxParser is None:
+                continue
+            try:
+                variants.append((f'{name}/{parser}', factory(parser, fast_parse=False)))
+            except ValueError:
+                continue  # selectolax len pre scrapery s FIELDS
+        scraper = factory('html.parser')
+        if type(scraper).parse_raw is not BaseScraper.parse_raw:
+            variants.append((f'{name}/fast', scraper))
+
+        for key, scraper in variants:
+            results[key] = bench_parser(scraper, pages, args.seconds, not args.no_alloc)
+            print_result(key, results[key], 'pages_per_sec', 'stran/s')
+    return results
+
+
+# === FEEDS ===
+
+def bench_feed(name: str, path: str, items: int, alloc: bool) -> Dict[str, Any]:
+    from feed_converter import FileSource
+
+    cls = getattr(importlib.import_module(name), CONVERTERS[name])
+    output_file = os.path.join(DATA_DIR, f'{name}_out.csv')
+
+    def convert():
+        converter = cls(source=FileSource(path), output_file=output_file)
+        converter.write_delta = False
+        converter.snapshot_dir = None
+        with redirect_stdout(io.StringIO()):
+            return converter.convert()
+
+    started = time.perf_counter()
+    stats = convert()
+    elapsed = time.perf_counter() - started
+    result = {
+        'items': items,
+        'seconds': round(elapsed, 2),
+        'items_per_sec': round(items / elapsed, 1),
+        'rows': stats['written'],
+        'output': file_fingerprint(output_file),
+    }
+    if alloc:
+        tracemalloc.start()
+        try:
+            result['peak_mb'] = round(peak_allocation(convert) / 2 ** 20, 1)
+        finally:
+            tracemalloc.stop()
+    os.remove(output_file)
+    return result
+
+
+def run_feeds(args) -> Dict[str, Dict[str, Any]]:
+    results = {}
+    for name in FEEDS:
+        if args.only and name not in args.only:
+            continue
+        path = feed_file(name, DATA_DIR, args.items)
+        results[name] = bench_feed(name, path, args.items, not args.no_alloc)
+        print_result(name, results[name], 'items_per_sec', 'poloziek/s')
+    return results
+
+
+# === BASELINE ===
+
+def print_result(key: str, result: Dict[str, Any], rate: str, unit: str):
+    memory = (f"{result['alloc_kb']:9.1f} kB/stranu" if 'alloc_kb' in result else
+              f"{result['peak_mb']:7.1f} MB spicka" if 'peak_mb' in result else '')
+    wrong = f"  NESPRAVNE: {result['wrong']}" if result.get('wrong') else ''
+    print(f"{key:40} {result[rate]:10.1f} {unit}  {memory}{wrong}", flush=True)
+
+
+def load_baseline(path: str) -> Dict[str, Any]:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def compare(section: str, results: Dict[str, Dict], baseline: Dict[str, Dict], rate: str,
+            size: str, tolerance: float) -> List[str]:
+    """Zoznam regresii oproti baseline (pomalsie o viac ako tolerance, iny vystup, nespravne riadky)"""
+    failures = []
+    for key, result in results.items():
+        if result.get('wrong'):
+            failures.append(f"{section} {key}: {result['wrong']} stran s nespravnym vysledkom")
+        base = baseline.get(key)
+        if not base or base.get(size) != result[size]:
+            continue  # nove meranie alebo iny pocet stran/poloziek - nie je s cim porovnat
+        if base.get('output') != result['output']:
+            failures.append(f"{section} {key}: zmeneny vystup ({base['output']} -> {result['output']})")
+        if result[rate] < base[rate] * (1 - tolerance):
+            failures.append(f"{section} {key}: pomalsie {result[rate]:.1f} vs {base[rate]:.1f} "
+                            f"({result[rate] / base[rate] - 1:+.0%})")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Offline benchmark parsingu a feed konvertorov')
+    parser.add_argument('suite', nargs='?', choices=('all', 'parse', 'feeds'), default='all')
+    parser.add_argument('--only', nargs='+', help='Len vybrane scrapery/feedy (napr. musictrade spec kytary)')
+    parser.add_argument('--pages', type=int, default=100, help='Generovanych stran na dodavatela')
+    parser.add_argument('--items', type=int, default=100000, help='Poloziek syntetickeho feedu')
+    parser.add_argument('--seconds', type=float, default=1.0, help='Minimalny cas merania jedneho parsera')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='Povoleny pokles priepustnosti (0.2 = 20 %%)')
+    parser.add_argument('--no-alloc', action='store_true', help='Bez merania pamate (tracemalloc)')
+    parser.add_argument('--baseline', default=BASELINE_FILE)
+    parser.add_argument('--update', action='store_true', help='Zapise vysledky ako novy baseline')
+    args = parser.parse_args()
+    if args.only:
+        args.only = [name.lower() for name in args.only]
+
+    baseline = load_baseline(args.baseline)
+    results = {}
+    if args.suite in ('all', 'parse'):
+        results['parse'] = run_parse(args)
+    if args.suite in ('all', 'feeds'):
+        results['feeds'] = run_feeds(args)
+
+    failures = []
+    if 'parse' in results:
+        failures += compare('parse', results['parse'], baseline.get('parse', {}), 'pages_per_sec', 'pages',
+                            args.tolerance)
+    if 'feeds' in results:
+        failures += compare('feeds', results['feeds'], baseline.get('feeds', {}), 'items_per_sec', 'items',
+                            args.tolerance)
+
+    if args.update:
+        # Doplni / prepise len zmerane polozky, ostatne ostanu
+        for section, section_results in results.items():
+            baseline.setdefault(section, {}).update(section_results)
+        baseline['recorded'] = {
+            'at': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'machine': f"{platform.system()} {platform.machine()}, {os.cpu_count()} CPU",
+        }
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f"Baseline zapisany -> {args.baseline}")
+
+    if failures:
+        print("\nREGRESIE:")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+    print("\nBez regresii." if baseline else "\nBaseline neexistuje (--update ho vytvori).")
+
+
+if __name__ == "__main__":
+    main()
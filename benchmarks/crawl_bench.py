@@ -0,0 +1,222 @@
+"""
+End-to-end benchmark enginov BaseScraper.run (thread / async / pipeline) proti
+lokalnemu mock serveru (mock_server.py) - cely beh vratane sitemap, HTTP,
+rate limitera, parsingu a zapisu CSV, bez ostrych e-shopov.
+
+Mock server bezi v samostatnom procese (nedeli sa o GIL so scraperom). Pre
+kazdy engine a pocet URL sa spusti cely scraper v docasnom adresari a vypise
+sa priepustnost (URL/s), pocet riadkov oproti ocakavanemu, p50/p90 celkoveho
+casu URL z metrik behu a odpovede servera (429, 5xx, 304, 206).
+
+Pouzitie:
+    python benchmarks/crawl_bench.py --urls 10000 100000
+    python benchmarks/crawl_bench.py --scraper spec:rockster --engines async --latency 50 --jitter 100
+    python benchmarks/crawl_bench.py --error-rate 0.01 --rate-limit 300 --burst-every 20 --burst-length 2
+    python benchmarks/crawl_bench.py --cache --revision 1 --change-rate 0.1   # druhy beh s HTTP cache
+    python benchmarks/crawl_bench.py --stream-markers skladem    # ciastocne citanie stranok (znacky z FIELDS)
+    python benchmarks/crawl_bench.py --server http://127.0.0.1:8800            # uz spusteny mock server
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import logging
+import argparse
+import tempfile
+import importlib
+import subprocess
+import urllib.request
+from typing import Any, Dict, Optional
+
+from bench import BENCH_DIR, ROOT, SCRAPERS, SPECS
+from base_scraper import ENGINES, PARSERS, ScraperConfig
+from spec_scraper import SpecScraper
+
+# Volby servera, ktore harness preposle mock_server.py
+SERVER_OPTIONS = ('latency', 'jitter', 'error_rate', 'rate_limit', 'burst_every', 'burst_length', 'pool',
+                  'change_rate')
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def server_stats(server: str, reset: bool = False) -> Dict[str, Any]:
+    with urllib.request.urlopen(f"{server}/_stats{'?reset=1' if reset else ''}", timeout=10) as response:
+        return json.load(response)
+
+
+def start_server(args, port: int, revision: int = 0) -> subprocess.Popen:
+    """mock_server.py v samostatnom procese; vrati sa az ked odpoveda"""
+    base_url = f"http://127.0.0.1:{port}"
+    command = [sys.executable, os.path.join(BENCH_DIR, 'mock_server.py'), '--port', str(port),
+               '--urls', str(max(args.urls)), '--revision', str(revision)]
+    for option in SERVER_OPTIONS:
+        command += [f"--{option.replace('_', '-')}", str(getattr(args, option))]
+    process = subprocess.Popen(command, stdout=subprocess.DEVNULL)
+    for _ in range(100):
+        try:
+            server_stats(base_url)
+            return process
+        except OSError:
+            if process.poll() is not None:
+                raise RuntimeError("Mock server sa nespustil")
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError("Mock server neodpoveda")
+
+
+def stop_server(process: Optional[subprocess.Popen]):
+    if process is not None:
+        process.terminate()
+        process.wait(timeout=10)
+
+
+def build_scraper(args, sitemap_url: str, engine: str, workdir: str):
+    """Scraper z bench.SCRAPERS alebo scrapers/<spec>.json nasmerovany na mock server"""
+    options = dict(
+        sitemap_url=sitemap_url, output_file=os.path.join(workdir, f"{supplier_of(args.scraper)}_sklad.csv"),
+        engine=engine, max_workers=args.workers, max_in_flight=args.in_flight, parse_workers=args.parse_workers,
+        parser=args.parser, adaptive_rate=not args.fixed_rate, url_blacklist=[],
+        cache_dir=os.path.join(workdir, '.http_cache') if args.cache else None,
+        state_dir=os.path.join(workdir, '.scraper_state'), checkpoint=False, write_delta=False,
+        snapshot_dir=None, metrics_dir=None, stream_markers=args.stream_markers, max_page_bytes=args.max_page_bytes,
+    )
+    name = args.scraper
+    if name.startswith('spec:'):
+        scraper = SpecScraper.from_file(os.path.join(ROOT, 'scrapers', f"{name[5:]}.json"), **options)
+    else:
+        class_name = SCRAPERS[name][0]
+        scraper = getattr(importlib.import_module(name), class_name)(ScraperConfig(**options))
+    if not args.verbose:
+        scraper.logger.setLevel(logging.WARNING)
+    return scraper
+
+
+def supplier_of(name: str) -> str:
+    return SPECS[name[5:]] if name.startswith('spec:') else SCRAPERS[name][1]
+
+
+def expected_rows(count: int) -> int:
+    """Kazda 20. stranka z fixtures je kategoria bez produktu"""
+    return count - count // 20
+
+
+def run_once(args, server: str, engine: str, count: int, workdir: str) -> Dict[str, Any]:
+    supplier = supplier_of(args.scraper)
+    sitemap_url = f"{server}/{supplier}/{args.sitemap}?count={count}"
+    scraper = build_scraper(args, sitemap_url, engine, workdir)
+
+    server_stats(server, reset=True)
+    started = time.perf_counter()
+    rows = scraper.run(resume=False)
+    elapsed = time.perf_counter() - started
+    served = server_stats(server)
+    report = scraper.metrics.report()
+
+    total = report['stages'].get('total', {})
+    return {
+        'engine': engine,
+        'urls': count,
+        'rows': rows,
+        'expected': expected_rows(count),
+        'seconds': round(elapsed, 2),
+        'urls_per_sec': round(count / elapsed, 1),
+        'p50': total.get('p50'),
+        'p90': total.get('p90'),
+        'retries': report['retries'],
+        'bytes': report['bytes'],
+        'partial_reads': report['partial_reads'],
+        'failures': report['failures'],
+        'server': {key: value for key, value in served.items() if key != 'config'},
+    }
+
+
+def print_result(result: Dict[str, Any]):
+    served = result['server']
+    errors = sum(count for key, count in served.items() if key.startswith('status_5'))
+    missing = result['expected'] - result['rows']
+    print(f"{result['engine']:14} {result['urls']:>7} URL  {result['seconds']:8.1f} s  "
+          f"{result['urls_per_sec']:8.1f} URL/s  p50 {result['p50'] or 0:.3f}s p90 {result['p90'] or 0:.3f}s  "
+          f"riadky {result['rows']}/{result['expected']}{f' (chyba {missing})' if missing else ''}  "
+          f"429={served.get('status_429', 0)} 5xx={errors} 304={served.get('status_304', 0)} "
+          f"retry={result['retries']}  {result['bytes'] / 2 ** 20:.0f} MB ciastocne={result['partial_reads']} "
+          f"spojeni={served.get('connections', 0)}", flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark enginov scrapera proti lokalnemu mock serveru')
+    parser.add_argument('--scraper', default='spec:3dmx',
+                        help=f"Modul scrapera ({', '.join(SCRAPERS)}) alebo spec:<nazov> ({', '.join(SPECS)})")
+    parser.add_argument('--engines', nargs='+', choices=ENGINES, default=list(ENGINES))
+    parser.add_argument('--urls', nargs='+', type=int, default=[10000], help='Pocty URL (napr. 10000 100000)')
+    parser.add_argument('--sitemap', default='sitemap_index.xml',
+                        choices=('sitemap_index.xml', 'sitemap.xml', 'sitemap.xml.gz'))
+    parser.add_argument('--workers', type=int, default=10)
+    parser.add_argument('--in-flight', type=int, default=None, help='async: max sucasnych requestov')
+    parser.add_argument('--parse-workers', type=int, default=None, help='pipeline: parsovacie procesy')
+    parser.add_argument('--parser', choices=PARSERS, default='lxml')
+    parser.add_argument('--fixed-rate', action='store_true', help='Bez adaptivneho rate limitera')
+    parser.add_argument('--stream-markers', nargs='+', help='Citaj stranky len po tieto znacky')
+    parser.add_argument('--max-page-bytes', type=int, help='Citaj najviac tolko bajtov stranky')
+    parser.add_argument('--cache', action='store_true',
+                        help='HTTP cache: kazdy beh dvakrat, druhy proti revizii --revision (304 / zmenene)')
+    parser.add_argument('--revision', type=int, default=1)
+    parser.add_argument('--verbose', action='store_true', help='Log scrapera (INFO)')
+    parser.add_argument('--json', help='Vysledky aj do JSON suboru')
+    parser.add_argument('--server', help='URL uz spusteneho mock servera (inak sa spusti vlastny)')
+    server_group = parser.add_argument_group('mock server')
+    server_group.add_argument('--latency', type=float, default=10.0, help='ms')
+    server_group.add_argument('--jitter', type=float, default=20.0, help='ms')
+    server_group.add_argument('--error-rate', type=float, default=0.0)
+    server_group.add_argument('--rate-limit', type=float, default=0.0)
+    server_group.add_argument('--burst-every', type=float, default=0.0)
+    server_group.add_argument('--burst-length', type=float, default=0.0)
+    server_group.add_argument('--pool', type=int, default=1000)
+    server_group.add_argument('--change-rate', type=float, default=0.1)
+    args = parser.parse_args()
+    if args.scraper not in SCRAPERS and not (args.scraper.startswith('spec:') and args.scraper[5:] in SPECS):
+        parser.error(f"Neznamy scraper '{args.scraper}'")
+    if args.server and args.cache:
+        parser.error("--cache potrebuje vlastny mock server (druhy beh meni reviziu)")
+
+    results = []
+    process = None
+    port = free_port()
+    server = args.server or f"http://127.0.0.1:{port}"
+    try:
+        if not args.server:
+            process = start_server(args, port)
+        print(f"Mock server {server}, scraper {args.scraper}, parser {args.parser}", flush=True)
+        for count in args.urls:
+            for engine in args.engines:
+                with tempfile.TemporaryDirectory(prefix='crawl_bench_') as workdir:
+                    result = run_once(args, server, engine, count, workdir)
+                    print_result(result)
+                    results.append(result)
+                    if not args.cache:
+                        continue
+                    # Druhy beh s naplnenou cache proti novej revizii obsahu (rovnake URL = rovnaky port)
+                    stop_server(process)
+                    process = start_server(args, port, revision=args.revision)
+                    result = run_once(args, server, engine, count, workdir)
+                    result['engine'] += '+cache'
+                    print_result(result)
+                    results.append(result)
+                    stop_server(process)
+                    process = start_server(args, port)
+    finally:
+        stop_server(process)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'args': vars(args), 'results': results}, f, indent=2)
+        print(f"Vysledky -> {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,412 @@
+"""
+Fixtures pre benchmarky - produktove stranky a B2B feedy bez pristupu na siet
+
+Stranky: pre kazdeho dodavatela generator stranky v jeho markupe (deterministicky
+podla cisla stranky) aj s ocakavanym riadkom, ktory ma parse_product vratit.
+Okolo produktu je typicky balast e-shopu (menu, suvisiace produkty, inline
+skripty, JSON-LD, paticka), takze velkost stranky (~40-90 kB) zodpoveda realu.
+Cca kazda 20. stranka je kategoria bez produktu (parse_product -> None).
+
+Ak existuje benchmarks/fixtures/<dodavatel>/*.html (nahrane cez `record`),
+benchmark pouzije tie namiesto generovanych (ocakavany riadok nepozna).
+
+Feedy: synteticky Kytary XML (namespace), PMC XML (UTF-16) a Muziker CSV
+s lubovolnym poctom poloziek, vratane okrajovych hodnot (chybajuci kod,
+desatinne mnozstvo, neplatna cena, ';' v nazve).
+
+Pouzitie:
+    python benchmarks/fixtures.py record 3dmx https://www.3dmx.cz/p/... [...]
+    python benchmarks/fixtures.py feeds /tmp/feeds --items 100000
+
+    for page in product_pages('3dmx', 200):
+        scraper._parse_content(page.content, page.url)
+"""
+
+import os
+import sys
+import glob
+import json
+import random
+import hashlib
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from xml.sax.saxutils import escape
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+BRANDS = ['Ibanez', 'Fender', 'Gibson', 'Yamaha', 'Roland', 'Korg', 'Meinl', 'Tama', 'Ortega', 'Sonor',
+          'Pearl', 'Zildjian', 'Marshall', 'Boss', 'Shure', 'Sennheiser', 'Behringer', 'Gewa']
+KINDS = ['elektricka gitara', 'akusticka gitara', 'basgitara', 'cinel', 'snare', 'mikrofon',
+         'kombo', 'efekt', 'klavesy', 'struny', 'pedal', 'stojan']
+WORDS = ('lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor '
+         'incididunt ut labore et dolore magna aliqua').split()
+
+
+@dataclass
+class Page:
+    """Produktova stranka: URL, telo a ocakavany riadok bez URL (None = stranka bez produktu)"""
+    supplier: str
+    url: str
+    content: bytes
+    expected: Optional[Dict] = None
+    known: bool = True  # False = nahrata stranka, ocakavany riadok nepozname
+
+
+# === BALAST STRANKY ===
+
+def _text(rng: random.Random, words: int) -> str:
+    return ' '.join(rng.choice(WORDS) for _ in range(words))
+
+
+def _product_name(rng: random.Random, i: int) -> str:
+    return f"{rng.choice(BRANDS)} {rng.choice(KINDS).title()} {rng.randint(100, 9999)}-{i}"
+
+
+def _chrome(rng: random.Random, host: str) -> Tuple[str, str, str]:
+    """(head, hlavicka s menu, paticka) - spolocny balast vsetkych dodavatelov"""
+    scripts = ''.join(
+        f'<script>window.cfg{n} = {json.dumps({"k": _text(rng, 40), "ids": list(range(rng.randint(200, 1500)))})};</script>'
+        for n in range(rng.randint(3, 8))
+    )
+    head = (f'<head><meta charset="utf-8"><title>{_text(rng, 6)}</title>'
+            + ''.join(f'<link rel="stylesheet" href="https://{host}/css/{n}.css">' for n in range(8))
+            + scripts + '</head>')
+    menu = ''.join(
+        f'<li class="menu-item"><a href="https://{host}/c/{n}/">{_text(rng, 2)}</a><ul>'
+        + ''.join(f'<li><a href="https://{host}/c/{n}/{m}/">{_text(rng, 2)}</a></li>' for m in range(8))
+        + '</ul></li>'
+        for n in range(rng.randint(20, 40))
+    )
+    header = f'<header class="site-header"><div class="logo"><a href="/">{host}</a></div><nav><ul>{menu}</ul></nav></header>'
+    footer = ('<footer class="site-footer">'
+              + ''.join(f'<div class="footer-col"><h4>{_text(rng, 2)}</h4><p>{_text(rng, 60)}</p></div>' for _ in range(4))
+              + '</footer>')
+    return head, header, footer
+
+
+def _related(rng: random.Random, host: str) -> str:
+    items = ''.join(
+        f'<div class="product-tile"><a href="https://{host}/p/{rng.randint(1, 99999)}">'
+        f'<img src="https://{host}/img/{rng.randint(1, 99999)}.jpg" alt="{_text(rng, 3)}"></a>'
+        f'<h3 class="tile-name">{_product_name(rng, rng.randint(1, 99999))}</h3>'
+        f'<div class="tile-price">{rng.randint(100, 90000)} Kč</div></div>'
+        for _ in range(rng.randint(24, 60))
+    )
+    return f'<section class="related"><h2>Podobne produkty</h2>{items}</section>'
+
+
+def _json_ld(rng: random.Random, name: str) -> str:
+    data = {'@context': 'https://schema.org', '@type': 'Product', 'name': name,
+            'description': _text(rng, 120),
+            'review': [{'@type': 'Review', 'reviewBody': _text(rng, 40)} for _ in range(rng.randint(0, 10))]}
+    return f'<script type="application/ld+json">{json.dumps(data, ensure_ascii=False)}</script>'
+
+
+def _document(rng: random.Random, host: str, name: str, product: str) -> bytes:
+    head, header, footer = _chrome(rng, host)
+    description = ''.join(f'<p>{_text(rng, 80)}</p>' for _ in range(rng.randint(6, 24)))
+    body = (f'<body>{header}<main><div class="breadcrumbs">{_text(rng, 4)}</div>{product}'
+            f'<div class="description">{description}</div>{_related(rng, host)}</main>'
+            f'{footer}{_json_ld(rng, name)}</body>')
+    return f'<!DOCTYPE html><html lang="cs">{head}{body}</html>'.encode('utf-8')
+
+
+def _category(rng: random.Random, host: str) -> bytes:
+    """Stranka bez produktu (kategoria, ktora presla filtrom sitemap)"""
+    head, header, footer = _chrome(rng, host)
+    return (f'<!DOCTYPE html><html>{head}<body>{header}<main><h1>{_text(rng, 2)}</h1>'
+            f'{_related(rng, host)}{_related(rng, host)}</main>{footer}</body></html>').encode('utf-8')
+
+
+# === MARKUP DODAVATELOV ===
+# Kazdy generator vrati (html produktu, ocakavany riadok bez URL)
+
+def _stock(rng: random.Random) -> int:
+    """Pocet kusov: casto 0, inak 1-30 (0 = nie je skladom)"""
+    return rng.choice([0, 0, 1, 2, 3, 5, 8, 12, 30])
+
+
+def _3dmx(rng, i):
+    sku, name, qty = f"{rng.randint(100000, 999999)}", _product_name(rng, i), _stock(rng)
+    stock = ''
+    if qty:
+        stock = f'<span class="skladem">Skladem &gt; {qty} ks</span>'
+    elif rng.random() < 0.5:
+        stock = '<span class="skladem">Skladem</span>'
+        qty = 1
+    html = (f'<div class="detail"><h1>{escape(name)}</h1><table class="params"><tr><td>Kod:</td>'
+            f'<td class="td_katalog_detail_polozka">{sku}</td></tr></table>{stock}</div>')
+    return html, {'SKU': sku, 'Nazov': name, 'Pocet_ks': qty}
+
+
+def _alexim(rng, i):
+    name, qty = _product_name(rng, i), 1 if rng.random() < 0.6 else 0
+    if rng.random() < 0.8:
+        sku = f"{rng.randint(100, 9999):04d}.{rng.randint(1, 99):02d}"
+        sku_html = f'<strong>{sku}</strong>'
+    else:
+        sku = f"AX-{rng.randint(1000, 9999)}"
+        sku_html = f'<span itemprop="sku">{sku}</span>'
+    stock = '<strong>SKLADEM</strong>' if qty else '<strong>Na dotaz</strong>'
+    html = (f'<div class="product-detail"><h1 class="product-detail__title">{escape(name)}</h1>'
+            f'<p>Vyrobca: <strong>{rng.choice(BRANDS)}</strong></p><p>Kod: {sku_html}</p><p>{stock}</p></div>')
+    return html, {'SKU': sku, 'Nazov': name, 'Pocet_ks': qty}
+
+
+def _basys(rng, i):
+    sku, name, qty = f"B{rng.randint(10000, 99999)}", _product_name(rng, i), 1 if rng.random() < 0.5 else 0
+    html = (f'<div class="row"><h1 class="col-xs-12 product-title">{escape(name)}</h1>'
+            f'<div>Kod: <span itemprop="sku">{sku}</span></div>'
+            f'<div class="availability"><i class="av-{7 if qty else 3}"></i></div></div>')
+    return html, {'SKU': sku, 'Nazov': name, 'Pocet_ks': qty}
+
+
+def _eprodance(rng, i):
+    sku, name, qty = f"EP{rng.randint(1000, 99999)}", _product_name(rng, i), _stock(rng)
+    code = (f'<span class="code">{sku}</span>' if rng.random() < 0.7
+            else f'<meta itemprop="sku" content="{sku}">')
+    stock = f'<span class="availability-amount">({qty} ks)</span>' if qty else ''
+    html = (f'<div class="p-detail"><h1>{escape(name)}</h1><div class="p-code">Kod: {code}</div>'
+            f'<div class="availability">{"Skladem" if qty else "Na objednavku"} {stock}</div></div>')
+    return html, {'SKU': sku, 'Nazov': name, 'Pocet_ks': qty}
+
+
+def _imusic(rng, i):
+    sku, name, qty = f"IM-{rng.randint(10000, 99999)}", _product_name(rng, i), 1 if rng.random() < 0.5 else 0
+    delivery = 'Sofort verfügbar, Lieferzeit 1-3 Werktage' if qty else 'Lieferzeit ca. 2-3 Wochen'
+    html = (f'<div class="product-detail"><h1 class="product-detail-name">{escape(name)}</h1>'
+            f'<span class="product-detail-ordernumber" itemprop="sku">{sku}</span>'
+            f'<p class="delivery-information delivery-available">\n  {delivery}\n</p></div>')
+    return html, {'SKU': sku, 'Nazov': name, 'Pocet_ks': qty}
+
+
+def _musicpark(rng, i):
+    sku, name, qty = f"MP{rng.randint(10000, 99999)}", _product_name(rng, i), _stock(rng)
+    if qty:
+        stock = f'<span class="dostupnost">Skladom {qty} ks</span>'
+    elif rng.random() < 0.3:
+        stock, qty = '<span class="dostupnost">Skladom</span>', 1
+    else:
+        stock = '<span class="dostupnost">Na objednávku</span>'
+    html = (f'<div class="product"><h1>{escape(name)}</h1><div class="info"><div>Obj. kód:&nbsp;{sku}</div>'
+            f'<div>EAN: {rng.randint(10 ** 12, 10 ** 13 - 1)}</div></div>{stock}</div>')
+    return html, {'SKU': sku, 'Nazov': name, 'Pocet_ks': qty}
+
+
+def _musictrade(rng, i):
+    sku, name, qty = f"MT{rng.randint(10000, 99999)}", _product_name(rng, i), _stock(rng)
+    quantity = f"> {qty}" if qty > 5 else str(qty)
+    expected_qty = qty
+    product = {
+        'id': rng.randint(1, 99999), 'guid': hashlib.md5(sku.encode()).hexdigest(), 'hasVariants': False,
+        'codes': [{'code': sku, 'quantity': quantity,
+                   'stocks': [{'id': n, 'quantity': quantity} for n in range(1, rng.randint(2, 4))]}],
+        'code': sku, 'name': name, 'appendix': '', 'weightUnit': 'kg',
+        'manufacturer': rng.choice(BRANDS), 'currentCategory': f"Hudobne nastroje/{rng.choice(KINDS)}",
+        'url': f"https://www.musictrade.cz/{sku.lower()}/", 'currency': 'CZK',
+        'priceWithVat': rng.randint(100, 90000),
+    }
+    layer = {'shoptet': {'pageType': 'productDetail', 'product': product,
+                         'stocks': [{'id': n, 'title': _text(rng, 2), 'isDeliveryPoint': n == 1} for n in range(1, 4)],
+                         'cartInfo': {'id': None, 'freeShipping': False, 'leftToFreeGift': {'formattedPrice': '0 Kč'}}}}
+    # Shoptet escapuje lomitka v JSON ('\/')
+    script = json.dumps(layer, ensure_ascii=False).replace('/', '\\/')
+    html = (f'<script>dataLayer = [];</script><script>dataLayer.push({script});</script>'
+            f'<div class="p-detail"><h1>{escape(name)}</h1><span class="p-code">{sku}</span></div>')
+    return html, {'SKU': sku, 'Nazov': name, 'Pocet_ks': expected_qty}
+
+
+def _rockster(rng, i):
+    sku, name, qty = f"R{rng.randint(10000, 99999)}", _product_name(rng, i), _stock(rng)
+    price = rng.randint(100, 90000)
+    price_text = f"{price:,}".replace(',', '\xa0') + '\xa0Kč'
+    if qty > 5:
+        status = 'Skladem (&gt;5 ks)'
+        qty = 5
+    elif qty:
+        status = f'Skladem ({qty} ks)'
+    else:
+        status = 'Na objednávku'
+    html = (f'<div class="product"><h1>{escape(name)}</h1><div>Kod: <span class="js_kod">{sku}</span></div>'
+            f'<span class="price">{price_text}</span>'
+            f'<span class="status js_dostupnost">{status}</span></div>')
+    return html, {'SKU': sku, 'Nazov': name, 'Cena': price_text.replace('\xa0', ''), 'Pocet_ks': qty}
+
+
+# dodavatel -> (host, generator)
+SUPPLIERS: Dict[str, Tuple[str, Callable]] = {
+    '3dmx': ('www.3dmx.cz', _3dmx),
+    'alexim': ('www.alexim.cz', _alexim),
+    'basys': ('www.basys.sk', _basys),
+    'eprodance': ('www.eprodance.cz', _eprodance),
+    'imusic': ('www.i-musicnetwork.com', _imusic),
+    'musicpark': ('www.music-park.sk', _musicpark),
+    'musictrade': ('www.musictrade.cz', _musictrade),
+    'rockster': ('www.rockster.cz', _rockster),
+}
+
+
+def product_url(supplier: str, i: int) -> str:
+    host = SUPPLIERS[supplier][0]
+    # musicpark filtruje URL podla /produkt/, basys podla .html
+    return f"https://{host}/produkt/{supplier}-{i}.html"
+
+
+def product_page(supplier: str, i: int, seed: int = 0) -> Page:
+    """Jedna generovana stranka (rovnake i a seed = rovnaka stranka)"""
+    host, generate = SUPPLIERS[supplier]
+    rng = random.Random(f"{supplier}:{seed}:{i}")
+    url = product_url(supplier, i)
+    if i % 20 == 19:
+        return Page(supplier, url, _category(rng, host), None)
+    html, expected = generate(rng, i)
+    return Page(supplier, url, _document(rng, host, expected['Nazov'], html), expected)
+
+
+def recorded_pages(supplier: str) -> List[Page]:
+    """Stranky nahrate cez `record` (benchmarks/fixtures/<dodavatel>/*.html + index.json s URL)"""
+    directory = os.path.join(FIXTURES_DIR, supplier)
+    try:
+        with open(os.path.join(directory, 'index.json'), 'r', encoding='utf-8') as f:
+            urls = json.load(f)
+    except (OSError, ValueError):
+        urls = {}
+    pages = []
+    for path in sorted(glob.glob(os.path.join(directory, '*.html'))):
+        with open(path, 'rb') as f:
+            content = f.read()
+        name = os.path.basename(path)
+        pages.append(Page(supplier, urls.get(name, f"https://{SUPPLIERS[supplier][0]}/{name}"),
+                          content, known=False))
+    return pages
+
+
+def product_pages(supplier: str, count: int, seed: int = 0) -> List[Page]:
+    """Nahrate stranky dodavatela, ak su; inak count generovanych"""
+    return recorded_pages(supplier) or [product_page(supplier, i, seed) for i in range(count)]
+
+
+def record(supplier: str, urls: List[str]):
+    """Stiahne stranky do benchmarks/fixtures/<dodavatel>/ (presne bajty, ako ich posle server)"""
+    import requests
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from base_scraper import BaseScraper
+
+    directory = os.path.join(FIXTURES_DIR, supplier)
+    os.makedirs(directory, exist_ok=True)
+    index_path = os.path.join(directory, 'index.json')
+    try:
+        with open(index_path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        index = {}
+
+    with requests.Session() as session:
+        session.headers.update(BaseScraper.DEFAULT_HEADERS)
+        for url in urls:
+            response = session.get(url, timeout=30)
+            response.raise_for_status()
+            name = hashlib.sha1(url.encode('utf-8')).hexdigest()[:12] + '.html'
+            with open(os.path.join(directory, name), 'wb') as f:
+                f.write(response.content)
+            index[name] = url
+            print(f"{url} -> {name} ({len(response.content):,} B)")
+
+    with open(index_path, 'w', encoding='utf-8') as f:
+        json.dump(index, f, indent=2)
+
+
+# === FEEDY ===
+
+def _feed_items(count: int, seed: int) -> Iterator[Tuple[int, random.Random]]:
+    rng = random.Random(f"feed:{seed}")
+    for i in range(count):
+        yield i, rng
+
+
+def _quantity(rng: random.Random) -> str:
+    return rng.choice(['0', '0', '1', '3', '12', '150', '2.0', '', 'x', ' 7 '])
+
+
+def _price(rng: random.Random) -> str:
+    return rng.choice([f"{rng.randint(1, 99999)}", f"{rng.randint(1, 9999)}.{rng.randint(0, 99):02d}",
+                       f"{rng.randint(1, 999)}.005", '', 'abc'])
+
+
+def write_kytary_feed(path: str, count: int = 100000, seed: int = 0) -> str:
+    """Kytary VOPriceList s namespace ako realny feed"""
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('<?xml version="1.0" encoding="utf-8"?><VOPriceList xmlns="http://kytary.cz/b2b" '
+                'xmlns:i="http://www.w3.org/2001/XMLSchema-instance"><Items>')
+        for i, rng in _feed_items(count, seed):
+            code = '' if i % 500 == 7 else f" K{i:06d} "
+            name = escape(f"{rng.choice(BRANDS)} {rng.choice(KINDS)}; model {i} & \"X\"")
+            f.write(f'<VOPriceListItem><ProductCode>{code}</ProductCode><ProductName>{name}</ProductName>'
+                    f'<AvailableVolume>{_quantity(rng)}</AvailableVolume>'
+                    f'<RetailPriceWithVAT>{_price(rng)}</RetailPriceWithVAT>'
+                    f'<InStock>{rng.choice(["true", "false"])}</InStock>'
+                    f'<Description>{_text(rng, 30)}</Description></VOPriceListItem>')
+        f.write('</Items></VOPriceList>')
+    return path
+
+
+def write_pmc_feed(path: str, count: int = 100000, seed: int = 0) -> str:
+    """PMC SHOP v UTF-16 s BOM (ako realny feed), nazvy aj mimo BMP"""
+    with open(path, 'w', encoding='utf-16') as f:
+        f.write('<?xml version="1.0" encoding="UTF-16"?>\n<SHOP>')
+        for i, rng in _feed_items(count, seed):
+            item_id = '' if i % 500 == 7 else f"P{i:06d}"
+            ean = '' if i % 3 == 0 else f"{rng.randint(10 ** 12, 10 ** 13 - 1)}"
+            name = escape(f"{rng.choice(BRANDS)} Ďábel; {rng.choice(KINDS)} {i} € 𝄞")
+            f.write(f'<SHOP_ITEM><ITEM_ID>{item_id}</ITEM_ID><PRODUCTNAME>{name}</PRODUCTNAME><EAN>{ean}</EAN>'
+                    f'<AVAILABILITY>{_quantity(rng)}</AVAILABILITY><RETAIL_PRICE>{_price(rng)}</RETAIL_PRICE>'
+                    f'<DESCRIPTION>{_text(rng, 30)}</DESCRIPTION></SHOP_ITEM>\n')
+        f.write('</SHOP>')
+    return path
+
+
+def write_muziker_feed(path: str, count: int = 100000, seed: int = 0) -> str:
+    """Muziker CSV (ciarka, uvodzovky, nazvy cez viac riadkov, stlpce navyse)"""
+    import csv
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Code', 'EAN', 'SKU', 'Name', 'StockQTY', 'Description'])
+        for i, rng in _feed_items(count, seed):
+            code = '' if i % 50 == 7 else f"M{i:06d}"
+            ean = '' if i % 4 == 0 else f"{rng.randint(10 ** 12, 10 ** 13 - 1)}"
+            name = f"{rng.choice(BRANDS)}, \"{rng.choice(KINDS)}\"" + ('\nnovy riadok' if i % 100 == 3 else '')
+            writer.writerow([code, ean, f" S-{i} ", name, _quantity(rng), _text(rng, 20)])
+    return path
+
+
+FEEDS = {
+    'kytary': ('kytary.xml', write_kytary_feed),
+    'pmc': ('pmc.xml', write_pmc_feed),
+    'muziker': ('muziker.csv', write_muziker_feed),
+}
+
+
+def feed_file(name: str, directory: str, count: int, seed: int = 0) -> str:
+    """Cesta k vygenerovanemu feedu; rovnaky pocet a seed = subor sa nevytvara znova"""
+    filename, write = FEEDS[name]
+    stem, ext = os.path.splitext(filename)
+    path = os.path.join(directory, f"{stem}_{count}_{seed}{ext}")
+    if not os.path.exists(path):
+        os.makedirs(directory, exist_ok=True)
+        write(path + '.tmp', count, seed)
+        os.replace(path + '.tmp', path)
+    return path
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if len(args) >= 3 and args[0] == 'record' and args[1] in SUPPLIERS:
+        record(args[1], args[2:])
+    elif len(args) >= 2 and args[0] == 'feeds':
+        items = int(args[args.index('--items') + 1]) if '--items' in args else 100000
+        for feed in FEEDS:
+            print(feed_file(feed, args[1], items))
+    else:
+        print(f"Pouzitie: python benchmarks/fixtures.py record <{'|'.join(SUPPLIERS)}> <url> [...]")
+        print("          python benchmarks/fixtures.py feeds <adresar> [--items 100000]")
+        sys.exit(1)
@@ -0,0 +1,405 @@
+"""
+MockSupplierServer - lokalny HTTP server namiesto e-shopov dodavatelov
+Na zatazove testy enginov BaseScraper.run bez dopadu na ostre obchody.
+
+Pre kazdeho dodavatela z fixtures.py servuje:
+    /<dodavatel>/sitemap.xml            urlset so vsetkymi URL
+    /<dodavatel>/sitemap.xml.gz         to iste gzipom
+    /<dodavatel>/sitemap_index.xml      sitemapindex -> /<dodavatel>/sitemap-<k>.xml.gz
+    /<dodavatel>/produkt/<dodavatel>-<i>.html   produktova stranka v markupe dodavatela
+    /_stats                             JSON pocitadla (?reset=1 ich vynuluje)
+Pocet URL v sitemap urcuje --urls alebo ?count=N v URL sitemap.
+
+Vsetky odpovede maju ETag (If-None-Match -> 304) a Last-Modified, podporuju
+Range (206/416, If-Range). Stranky maju nastavitelnu latenciu, podiel chyb 5xx,
+limit req/s na dodavatela a periodicke 429 burst okna (Retry-After).
+--revision R s --change-rate zmeni cast stranok oproti revizii 0 (novy ETag,
+<lastmod>) - na testy inkrementalneho behu a HTTP cache.
+
+Generovanie stranky stoji par ms CPU, preto sa stranky beru z poolu --pool
+roznych stranok (URL i -> stranka i % pool, pool je nasobok 20, takze
+kategorie ostanu na rovnakych URL); --pool 0 generuje kazdu URL zvlast.
+
+Pouzitie:
+    python benchmarks/mock_server.py --port 8800 --urls 100000 --latency 20 --jitter 30
+    python benchmarks/mock_server.py --error-rate 0.02 --rate-limit 200 --burst-every 30 --burst-length 3
+
+    server = MockSupplierServer(MockConfig(urls=1000)).start()   # vo vlakne
+    ... http://127.0.0.1:<server.port>/3dmx/sitemap_index.xml ...
+    server.stop()
+"""
+
+import re
+import sys
+import gzip
+import json
+import math
+import time
+import random
+import hashlib
+import argparse
+import threading
+from collections import Counter, deque
+from dataclasses import asdict, dataclass
+from datetime import date, datetime, timedelta, timezone
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+from xml.sax.saxutils import escape
+
+from fixtures import SUPPLIERS, product_page
+
+SITEMAP_NS = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+BASE_DATE = date(2026, 1, 1)
+
+PAGE_PATH = re.compile(r'^/(?P<supplier>[\w-]+)/produkt/(?P=supplier)-(?P<i>\d+)\.html$')
+SITEMAP_PATH = re.compile(r'^/(?P<supplier>[\w-]+)/(?:(?P<plain>sitemap\.xml(?P<gz>\.gz)?)|'
+                          r'(?P<index>sitemap_index\.xml)|sitemap-(?P<part>\d+)\.xml\.gz)$')
+RANGE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+@dataclass
+class MockConfig:
+    """Spravanie mock servera (latencia v ms, podiely 0-1)"""
+    host: str = '127.0.0.1'
+    port: int = 0  # 0 = volny port (MockSupplierServer.port)
+    urls: int = 10000  # URL v sitemap na dodavatela (prepise ?count=N)
+    sitemap_size: int = 10000  # URL v jednej casti sitemap_index
+    pool: int = 1000  # roznych stranok na dodavatela v pamati (0 = kazda URL zvlast)
+    seed: int = 0
+    latency: float = 0.0  # ms pred odpovedou na stranku
+    jitter: float = 0.0  # ms, nahodne 0..jitter navyse
+    error_rate: float = 0.0  # podiel stranok s odpovedou 500/502/503
+    rate_limit: float = 0.0  # max req/s na dodavatela, nad limitom 429 (0 = bez limitu)
+    burst_every: float = 0.0  # kazdych N s ...
+    burst_length: float = 0.0  # ... dostanu vsetky stranky N s 429 (0 = bez burstov)
+    revision: int = 0  # revizia obsahu (0 = povodny)
+    change_rate: float = 0.0  # podiel stranok zmenenych v revizii > 0
+    etag: bool = True
+    ranges: bool = True
+
+    def __post_init__(self):
+        if self.pool:
+            self.pool = max(20, math.ceil(self.pool / 20) * 20)
+
+
+def _http_date(day: date) -> str:
+    return format_datetime(datetime(day.year, day.month, day.day, tzinfo=timezone.utc), usegmt=True)
+
+
+class MockSupplierServer:
+    """HTTP server (vlakno na spojenie, HTTP/1.1 keep-alive) so stavom pre vsetkych dodavatelov"""
+
+    def __init__(self, config: MockConfig):
+        self.config = config
+        self.stats: Counter = Counter()
+        self._lock = threading.Lock()
+        self._pages: Dict[Tuple[str, int, int], Tuple[bytes, str]] = {}
+        self._sitemaps: Dict[Tuple, bytes] = {}
+        self._hits: Dict[str, deque] = {}
+        self._random = random.Random(config.seed)
+        self._started = time.monotonic()
+
+        handler = type('Handler', (_Handler,), {'mock': self})
+        self.httpd = _Server((config.host, config.port), handler)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def port(self) -> int:
+        return self.httpd.server_address[1]
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.config.host}:{self.port}"
+
+    def sitemap_url(self, supplier: str, kind: str = 'sitemap_index.xml', count: Optional[int] = None) -> str:
+        query = f"?count={count}" if count else ''
+        return f"{self.base_url}/{supplier}/{kind}{query}"
+
+    def start(self) -> 'MockSupplierServer':
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def serve_forever(self):
+        try:
+            self.httpd.serve_forever()
+        finally:
+            self.httpd.server_close()
+
+    def count(self, *keys: str, nbytes: int = 0):
+        with self._lock:
+            for key in keys:
+                self.stats[key] += 1
+            self.stats['bytes'] += nbytes
+
+    def snapshot_stats(self, reset: bool = False) -> Dict[str, int]:
+        with self._lock:
+            stats = dict(self.stats)
+            if reset:
+                self.stats.clear()
+        return stats
+
+    # === OBSAH ===
+
+    def changed(self, i: int) -> bool:
+        """Stranka i sa v aktualnej revizii lisi od revizie 0 (deterministicky podla i)"""
+        if not self.config.revision or not self.config.change_rate:
+            return False
+        digest = hashlib.sha1(f"{self.config.seed}:{self.config.revision}:{i}".encode()).digest()
+        return int.from_bytes(digest[:4], 'big') < self.config.change_rate * 2 ** 32
+
+    def lastmod(self, i: int) -> date:
+        return BASE_DATE + timedelta(days=self.config.revision if self.changed(i) else 0)
+
+    def page(self, supplier: str, i: int) -> Tuple[bytes, str]:
+        """(telo, ETag) stranky i; zmenena stranka je ina stranka z poolu/seedu"""
+        pool = self.config.pool
+        slot = i % pool if pool else i
+        seed = self.config.seed + (self.config.revision if self.changed(i) else 0)
+        key = (supplier, slot, seed)
+        cached = self._pages.get(key)
+        if cached is None:
+            body = product_page(supplier, slot, seed).content
+            cached = (body, f'"{hashlib.sha1(body).hexdigest()[:16]}"')
+            if pool:
+                self._pages[key] = cached  # dva sucasne generovane rovnake zaznamy nevadia
+        return cached
+
+    def sitemap(self, supplier: str, count: int, part: Optional[int] = None, index: bool = False) -> bytes:
+        """urlset (cely alebo cast `part`) alebo sitemapindex, XML bez kompresie"""
+        key = (supplier, count, part, index)
+        cached = self._sitemaps.get(key)
+        if cached is not None:
+            return cached
+
+        size = self.config.sitemap_size
+        if index:
+            parts = ''.join(
+                f'<sitemap><loc>{escape(self.sitemap_url(supplier, f"sitemap-{k}.xml.gz", count))}</loc>'
+                f'<lastmod>{BASE_DATE.isoformat()}</lastmod></sitemap>'
+                for k in range(math.ceil(count / size))
+            )
+            body = f'<?xml version="1.0" encoding="UTF-8"?><sitemapindex xmlns="{SITEMAP_NS}">{parts}</sitemapindex>'
+        else:
+            numbers = range(count) if part is None else range(part * size, min(count, (part + 1) * size))
+            urls = ''.join(
+                f'<url><loc>{self.base_url}/{supplier}/produkt/{supplier}-{i}.html</loc>'
+                f'<lastmod>{self.lastmod(i).isoformat()}</lastmod></url>\n'
+                for i in numbers
+            )
+            body = f'<?xml version="1.0" encoding="UTF-8"?>\n<urlset xmlns="{SITEMAP_NS}">\n{urls}</urlset>'
+        data = body.encode('utf-8')
+        self._sitemaps[key] = data
+        return data
+
+    # === CHOVANIE ===
+
+    def throttled(self, supplier: str) -> Optional[int]:
+        """Retry-After v s, ak ma stranka dostat 429 (burst okno alebo prekroceny limit req/s)"""
+        config = self.config
+        now = time.monotonic()
+        if config.burst_every and config.burst_length:
+            phase = (now - self._started) % config.burst_every
+            if phase < config.burst_length:
+                return max(1, math.ceil(config.burst_length - phase))
+        if config.rate_limit:
+            with self._lock:
+                hits = self._hits.setdefault(supplier, deque())
+                while hits and hits[0] <= now - 1:
+                    hits.popleft()
+                if len(hits) >= config.rate_limit:
+                    return 1
+                hits.append(now)
+        return None
+
+    def delay(self):
+        config = self.config
+        if config.latency or config.jitter:
+            time.sleep((config.latency + self._random.uniform(0, config.jitter)) / 1000)
+
+    def error(self) -> Optional[int]:
+        if self.config.error_rate and self._random.random() < self.config.error_rate:
+            return self._random.choice((500, 502, 503))
+        return None
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+    def handle_error(self, request, client_address):
+        # Klient zavrel spojenie (timeout, koniec behu) - nie je chyba servera
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    mock: MockSupplierServer = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def setup(self):
+        super().setup()
+        self.mock.count('connections')  # nove TCP spojenie (keep-alive ich setri)
+
+    def do_HEAD(self):
+        self.do_GET(head=True)
+
+    def do_GET(self, head: bool = False):
+        mock = self.mock
+        parts = urlsplit(self.path)
+        query = parse_qs(parts.query)
+
+        if parts.path == '/_stats':
+            stats = mock.snapshot_stats(reset='reset' in query)
+            stats['config'] = asdict(mock.config)
+            return self._send(200, json.dumps(stats).encode('utf-8'), 'application/json', head=head)
+
+        match = PAGE_PATH.match(parts.path)
+        if match and match['supplier'] in SUPPLIERS:
+            return self._page(match['supplier'], int(match['i']), head)
+
+        match = SITEMAP_PATH.match(parts.path)
+        if match and match['supplier'] in SUPPLIERS:
+            count = int(query['count'][0]) if query.get('count', [''])[0].isdigit() else mock.config.urls
+            return self._sitemap(match, count, head)
+
+        mock.count('requests', 'status_404')
+        self._send(404, b'not found', 'text/plain', head=head)
+
+    def _page(self, supplier: str, i: int, head: bool):
+        mock = self.mock
+        mock.count('requests', 'pages')
+        retry_after = mock.throttled(supplier)
+        if retry_after is not None:
+            mock.count('status_429')
+            return self._send(429, b'too many requests', 'text/plain', {'Retry-After': str(retry_after)}, head=head)
+        mock.delay()
+        status = mock.error()
+        if status:
+            mock.count(f'status_{status}')
+            return self._send(status, b'server error', 'text/plain', head=head)
+        body, etag = mock.page(supplier, i)
+        self._resource(body, 'text/html; charset=utf-8', etag, mock.lastmod(i), head)
+
+    def _sitemap(self, match, count: int, head: bool):
+        mock = self.mock
+        mock.count('requests', 'sitemaps')
+        supplier = match['supplier']
+        if match['index']:
+            body, content_type = mock.sitemap(supplier, count, index=True), 'application/xml'
+        elif match['plain']:
+            body, content_type = mock.sitemap(supplier, count), 'application/xml'
+            if match['gz']:
+                body, content_type = gzip.compress(body, mtime=0), 'application/x-gzip'
+        else:
+            part = int(match['part'])
+            if part * mock.config.sitemap_size >= count:
+                mock.count('status_404')
+                return self._send(404, b'not found', 'text/plain', head=head)
+            body, content_type = gzip.compress(mock.sitemap(supplier, count, part), mtime=0), 'application/x-gzip'
+        etag = f'"{hashlib.sha1(body).hexdigest()[:16]}"'
+        self._resource(body, content_type, etag, BASE_DATE + timedelta(days=mock.config.revision), head)
+
+    def _resource(self, body: bytes, content_type: str, etag: str, modified: date, head: bool):
+        """200 / 304 (If-None-Match) / 206, 416 (Range)"""
+        mock = self.mock
+        headers = {'Last-Modified': _http_date(modified)}
+        if mock.config.etag:
+            headers['ETag'] = etag
+            if self.headers.get('If-None-Match') in (etag, '*'):
+                mock.count('status_304')
+                return self._send(304, b'', content_type, headers, head=True)
+        if mock.config.ranges:
+            headers['Accept-Ranges'] = 'bytes'
+            requested = self.headers.get('Range')
+            if_range = self.headers.get('If-Range')
+            if requested and (not if_range or if_range == etag):
+                byte_range = self._byte_range(requested, len(body))
+                if byte_range is None:
+                    mock.count('status_416')
+                    headers['Content-Range'] = f'bytes */{len(body)}'
+                    return self._send(416, b'', content_type, headers, head=head)
+                if byte_range != (0, len(body) - 1):
+                    start, end = byte_range
+                    headers['Content-Range'] = f'bytes {start}-{end}/{len(body)}'
+                    mock.count('status_206')
+                    return self._send(206, body[start:end + 1], content_type, headers, head=head)
+        mock.count('status_200')
+        self._send(200, body, content_type, headers, head=head)
+
+    @staticmethod
+    def _byte_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+        """Jeden rozsah 'bytes=a-b' / 'a-' / '-n' -> (od, do) vratane; None = nesplnitelny"""
+        match = RANGE.match(header.strip())
+        if not match or not (match[1] or match[2]):
+            return 0, size - 1  # viac rozsahov / neplatny zapis -> cele telo
+        if not match[1]:
+            length = int(match[2])
+            return (max(0, size - length), size - 1) if length and size else None
+        start = int(match[1])
+        end = min(int(match[2]), size - 1) if match[2] else size - 1
+        if start >= size or start > end:
+            return None
+        return start, end
+
+    def _send(self, status: int, body: bytes, content_type: str, headers: Optional[Dict[str, str]] = None,
+              head: bool = False):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if not head and body:
+            self.wfile.write(body)
+            self.mock.count(nbytes=len(body))
+
+
+def main():
+    defaults = MockConfig()
+    parser = argparse.ArgumentParser(description='Lokalny mock server dodavatelov (sitemap + produktove stranky)')
+    parser.add_argument('--host', default=defaults.host)
+    parser.add_argument('--port', type=int, default=8800)
+    parser.add_argument('--urls', type=int, default=defaults.urls, help='URL v sitemap na dodavatela')
+    parser.add_argument('--sitemap-size', type=int, default=defaults.sitemap_size, help='URL v jednej casti indexu')
+    parser.add_argument('--pool', type=int, default=defaults.pool, help='Roznych stranok na dodavatela (0 = vsetky)')
+    parser.add_argument('--seed', type=int, default=defaults.seed)
+    parser.add_argument('--latency', type=float, default=0.0, help='Latencia stranky v ms')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Nahodna latencia navyse 0..N ms')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Podiel odpovedi 500/502/503')
+    parser.add_argument('--rate-limit', type=float, default=0.0, help='Max req/s na dodavatela, inak 429')
+    parser.add_argument('--burst-every', type=float, default=0.0, help='Perioda 429 burstov v s')
+    parser.add_argument('--burst-length', type=float, default=0.0, help='Dlzka 429 burstu v s')
+    parser.add_argument('--revision', type=int, default=0, help='Revizia obsahu stranok')
+    parser.add_argument('--change-rate', type=float, default=0.0, help='Podiel stranok zmenenych v revizii')
+    parser.add_argument('--no-etag', action='store_true', help='Bez ETag / 304')
+    parser.add_argument('--no-ranges', action='store_true', help='Bez Range / 206')
+    args = parser.parse_args()
+
+    config = MockConfig(
+        host=args.host, port=args.port, urls=args.urls, sitemap_size=args.sitemap_size, pool=args.pool,
+        seed=args.seed, latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+        rate_limit=args.rate_limit, burst_every=args.burst_every, burst_length=args.burst_length,
+        revision=args.revision, change_rate=args.change_rate, etag=not args.no_etag, ranges=not args.no_ranges,
+    )
+    server = MockSupplierServer(config)
+    print(f"Mock server {server.base_url} ({', '.join(SUPPLIERS)})", flush=True)
+    print(f"  napr. {server.sitemap_url('3dmx')}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
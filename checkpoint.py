@@ -0,0 +1,132 @@
+"""
+CheckpointJournal - priebezny zapis vysledkov scrapera pre obnovenie po preruseni
+Kazda spracovana URL sa hned pripise do JSONL zurnalu (aj ked produkt nenasla),
+takze pad alebo timeout v CI nestrati hotovu pracu:
+
+    {"journal": 1, "sitemap_url": "...", "started_at": "2026-10-18T06:00:00"}
+    {"url": "https://.../p/1", "row": {"SKU": "A-1", "Nazov": "...", "Pocet_ks": 3}}
+    {"url": "https://.../p/2", "row": null}
+
+run(resume=True) nacita zurnal, hotove URL preskoci a ich riadky prevezme.
+Po uspesnom zapise CSV sa zurnal zmaze. Zapnute cez ScraperConfig(checkpoint=True),
+obnovenie aj cez premennu prostredia SCRAPER_RESUME=1 (run_all.py --resume).
+
+Pouzitie:
+    journal = CheckpointJournal('.scraper_state/3dmx_sklad.csv.journal', sitemap_url)
+    done = journal.load()              # URL -> riadok (None = bez produktu)
+    journal.open(resume=True)
+    journal.record(url, row)
+    journal.close(); journal.remove()
+"""
+
+import os
+import json
+import threading
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+RESUME_ENV = 'SCRAPER_RESUME'
+JOURNAL_VERSION = 1
+
+
+def default_resume() -> bool:
+    """Obnovit preruseny beh? (SCRAPER_RESUME=1, napr. z run_all.py --resume)"""
+    return os.environ.get(RESUME_ENV, '').lower() in ('1', 'true', 'yes')
+
+
+class CheckpointJournal:
+    """Append-only JSONL zurnal spracovanych URL (thread-safe zapis)"""
+
+    def __init__(self, path: str, sitemap_url: str):
+        self.path = path
+        self.sitemap_url = sitemap_url
+        self.recorded = 0
+        self._file = None
+        self._lock = threading.Lock()
+
+    def load(self) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        URL -> riadok z existujuceho zurnalu. Zurnal inej sitemap sa ignoruje,
+        neuplny posledny riadok (proces zabity pocas zapisu) sa preskoci.
+        """
+        done = {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                header = json.loads(f.readline() or 'null')
+                if not isinstance(header, dict) or header.get('sitemap_url') != self.sitemap_url:
+                    return {}
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    done[entry['url']] = entry.get('row')
+        except (OSError, ValueError):
+            return {}
+        return done
+
+    def open(self, resume: bool = False):
+        """Zacne novy zurnal, alebo pri resume pokracuje v existujucom"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if resume and self._usable():
+            self._file = open(self.path, 'a', encoding='utf-8')
+            self._terminate_partial_line()
+            return
+        self._file = open(self.path, 'w', encoding='utf-8')
+        self._write({'journal': JOURNAL_VERSION, 'sitemap_url': self.sitemap_url,
+                     'started_at': datetime.now().isoformat(timespec='seconds')})
+
+    def _usable(self) -> bool:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                header = json.loads(f.readline() or 'null')
+        except (OSError, ValueError):
+            return False
+        return isinstance(header, dict) and header.get('sitemap_url') == self.sitemap_url
+
+    def _terminate_partial_line(self):
+        # Po zabiti procesu moze subor koncit v polovici riadku - dalsi zaznam zacne na novom
+        with open(self.path, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            if f.tell() == 0:
+                return
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b'\n':
+                self._file.write('\n')
+
+    def _write(self, entry: Dict[str, Any]):
+        # flush po kazdom zazname - pri zabiti procesu ostane v subore vsetko zapisane
+        self._file.write(json.dumps(entry, ensure_ascii=False, default=str) + '\n')
+        self._file.flush()
+
+    def record(self, url: str, row: Optional[Dict[str, Any]]):
+        with self._lock:
+            if self._file is None:
+                return
+            self._write({'url': url, 'row': row})
+            self.recorded += 1
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def remove(self):
+        """Beh dobehol a CSV je zapisany - zurnal uz nie je potrebny"""
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def __getstate__(self):
+        # Scraper sa posiela do parsovacich procesov (pipeline engine) - tie do zurnalu nepisu
+        state = self.__dict__.copy()
+        state['_file'] = None
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
@@ -0,0 +1,135 @@
+"""
+CsvSink - streamovany zapis CSV s atomickym nahradenim vystupu
+Riadky idu do docasneho suboru, ktory nahradi vystupny subor (os.replace) az ked
+je zapisany cely - konzumenti (import obchodu, git commit v CI) nikdy neuvidia
+ciastocny CSV. Pamat nezavisi od poctu riadkov.
+
+Pouzivaju ho feed konvertory (feed_converter.py) aj scrapery (BaseScraper.run).
+
+Pouzitie:
+    with CsvSink('kytary_sklad.csv', ['ProductCode', 'AvailableVolume']) as sink:
+        for row in rows:
+            sink.write(row)
+
+    sink = CsvSink('3dmx_sklad.csv', encoding='utf-8-sig', lineterminator='\\n')
+    sink.write(row)        # bez fieldnames su stlpce zjednotenie klucov vsetkych riadkov
+    sink.commit()          # alebo sink.abort() - povodny subor ostane
+"""
+
+import os
+import csv
+import json
+import tempfile
+from typing import Any, Dict, List, Optional, Set
+
+
+class CsvSink:
+    """
+    CSV zapisovany po riadkoch s pevnou schemou stlpcov. Stlpce riadku mimo
+    schemy sa nezapisu (zoznam v extra_columns), chybajuce ostanu prazdne.
+
+    Bez fieldnames sa riadky odkladaju do docasneho suboru (JSON lines) a
+    hlavicka je az v commit() - zjednotenie klucov vsetkych riadkov v poradi
+    prveho vyskytu (ako predtym pandas DataFrame), pamat aj tak nezavisi od
+    poctu riadkov.
+    """
+
+    def __init__(self, output_file: str, fieldnames: Optional[List[str]] = None, delimiter: str = ";",
+                 encoding: str = "utf-8", lineterminator: str = "\r\n"):
+        self.output_file = output_file
+        self.fieldnames = list(fieldnames) if fieldnames else None
+        self.delimiter = delimiter
+        self.encoding = encoding
+        self.lineterminator = lineterminator
+        self.tmp_file = f"{output_file}.{os.getpid()}.tmp"
+        self.written = 0
+        self.extra_columns: Set[str] = set()
+        self._columns: Set[str] = set()
+        self._keys: Dict[str, None] = {}  # kluce odlozenych riadkov (zoradeny set)
+        self._spool = None
+        self._file = None
+        self._writer = None
+
+    def open(self):
+        """Otvori docasny subor; hlavicka sa zapise hned, ak su stlpce zname"""
+        self._file = open(self.tmp_file, "w", newline="", encoding=self.encoding)
+        if self.fieldnames:
+            self._start(self.fieldnames)
+        else:
+            self._spool = tempfile.TemporaryFile("w+", encoding="utf-8", dir=os.path.dirname(self.tmp_file) or None)
+
+    def _start(self, fieldnames: List[str]):
+        self.fieldnames = fieldnames
+        self._columns = set(fieldnames)
+        self._writer = csv.DictWriter(
+            self._file,
+            fieldnames=fieldnames,
+            delimiter=self.delimiter,
+            quoting=csv.QUOTE_MINIMAL,
+            lineterminator=self.lineterminator,
+            extrasaction="ignore"
+        )
+        self._writer.writeheader()
+
+    def write(self, row: Dict[str, Any]):
+        if self._file is None:
+            self.open()
+        if self._spool is not None:
+            self._keys.update(dict.fromkeys(row))
+            self._spool.write(json.dumps(row, ensure_ascii=False, default=str) + "\n")
+            self.written += 1
+            return
+        if not row.keys() <= self._columns:
+            self.extra_columns.update(row.keys() - self._columns)
+        self._writer.writerow(row)
+        self.written += 1
+
+    def write_frame(self, frame):
+        """Zapise davku (pandas DataFrame) - rovnake uvodzovky a konce riadkov ako write(), len s fieldnames"""
+        if self._writer is None:
+            raise ValueError("write_frame() potrebuje CsvSink s fieldnames")
+        frame[self.fieldnames].to_csv(self._file, sep=self.delimiter, header=False, index=False,
+                                      lineterminator=self.lineterminator, quoting=csv.QUOTE_MINIMAL)
+        self.written += len(frame)
+
+    def commit(self) -> str:
+        """Dokonci zapis a nahradi vystupny subor"""
+        if self._file is None:
+            self.open()
+        if self._spool is not None:
+            self._flush_spool()
+        self._file.close()
+        os.replace(self.tmp_file, self.output_file)
+        return self.output_file
+
+    def _flush_spool(self):
+        """Hlavicka zo zjednotenych klucov a odlozene riadky do docasneho CSV"""
+        spool, self._spool = self._spool, None
+        with spool:
+            if not self._keys:
+                return
+            self._start(list(self._keys))
+            spool.seek(0)
+            for line in spool:
+                self._writer.writerow(json.loads(line))
+
+    def abort(self):
+        """Zahodi rozpisany subor, povodny vystup ostane nezmeneny"""
+        if self._spool is not None:
+            self._spool.close()
+            self._spool = None
+        if self._file is not None:
+            self._file.close()
+        if os.path.exists(self.tmp_file):
+            os.remove(self.tmp_file)
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.abort()
+        return False
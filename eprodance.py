@@ -46,13 +46,17 @@ class ScraperEprodance(BaseScraper):
         }
 
 
+# Konfiguracia behu - run_all.py z nej berie host a pocet spojeni
+CONFIG = ScraperConfig(
+    sitemap_url='https://www.eprodance.cz/sitemap.xml',
+    output_file='eprodance_sklad.csv',
+    max_workers=10,
+    engine='async',
+    max_in_flight=10,
+    url_blacklist=['/znacka/', '/clanky/', '/blog/', '/vyrobce/', '/kontakt', '/o-nas', '/kosik', '/zakaznik']
+)
+
+
 if __name__ == "__main__":
-    config = ScraperConfig(
-        sitemap_url='https://www.eprodance.cz/sitemap.xml',
-        output_file='eprodance_sklad.csv',
-        max_workers=10,
-        url_blacklist=['/znacka/', '/clanky/', '/blog/', '/vyrobce/', '/kontakt', '/o-nas', '/kosik', '/zakaznik']
-    )
-
-    scraper = ScraperEprodance(config)
+    scraper = ScraperEprodance(CONFIG)
     scraper.run()
@@ -0,0 +1,505 @@
+"""
+Shared framework for B2B feed -> CSV converters (kytary.py, pmc.py, muziker.py)
+
+A converter is a source (HTTP stream, resumable HTTP download or local file),
+a record parser written as a generator, a batch normalization stage and a
+streaming CSV sink. Raw records are grouped into DataFrames of batch_size rows;
+normalize() coerces quantities/prices, cleans names and filters rows with
+vectorized column operations. Memory is bounded by one batch, not feed size.
+
+Adding a supplier feed:
+
+    class MyFeedConverter(FeedConverter):
+        title = "MyFeed XML -> CSV Converter"
+        feed_format = "XML"
+        fieldnames = ["Code", "Qty"]
+        output_file = "myfeed_sklad.csv"
+
+        def default_source(self):
+            return HttpSource("https://example.com/feed.xml")
+
+        def parse(self, stream, stats):
+            for item in iter_xml_elements(iter_chunks(stream), "ITEM"):
+                stats["total"] += 1
+                yield {"Code": item.findtext("CODE"), "Qty": item.findtext("QTY")}
+
+        def normalize(self, frame, stats):
+            frame["Code"] = text_column(frame["Code"])
+            frame["Qty"] = int_column(frame["Qty"])
+            return frame[frame["Code"] != ""]
+"""
+
+import io
+import os
+import csv
+import sys
+import gzip
+import json
+import time
+import base64
+import hashlib
+from contextlib import contextmanager
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Union
+from xml.etree import ElementTree as ET
+
+import numpy as np
+import pandas as pd
+import requests
+import urllib3
+
+from csv_sink import CsvSink
+from snapshot_delta import SnapshotDelta
+from snapshot_store import SnapshotWriter, default_snapshot_dir, supplier_name
+
+USER_AGENT = "All4music-FeedImport/1.0"
+CHUNK_SIZE = 64 * 1024
+DOWNLOAD_DIR = ".feed_downloads"
+
+
+class DownloadError(IOError):
+    """Downloaded file does not match the expected size or checksum."""
+
+
+# Errors that can happen mid-stream (connection drop, truncated feed) -> retry whole feed
+STREAM_ERRORS = (requests.RequestException, urllib3.exceptions.HTTPError,
+                 ET.ParseError, UnicodeDecodeError, csv.Error, pd.errors.ParserError, DownloadError)
+
+# Connection drops during a download that are worth resuming with Range
+RESUMABLE_ERRORS = (requests.ConnectionError, requests.Timeout,
+                    requests.exceptions.ChunkedEncodingError, urllib3.exceptions.HTTPError)
+
+
+class HttpSource:
+    """Feed downloaded over HTTP; the body is read lazily by the parser."""
+
+    def __init__(self, url: str, timeout: int = 120, verify: bool = True,
+                 headers: Optional[Dict[str, str]] = None):
+        self.url = url
+        self.timeout = timeout
+        self.verify = verify
+        self.headers = {"User-Agent": USER_AGENT, **(headers or {})}
+
+    @contextmanager
+    def open(self) -> Iterator[BinaryIO]:
+        resp = requests.get(self.url, timeout=self.timeout, headers=self.headers,
+                            verify=self.verify, stream=True)
+        with resp:
+            resp.raise_for_status()
+            # Transparently decompress gzip/deflate while reading resp.raw
+            resp.raw.decode_content = True
+            resp.raw.auto_close = False
+            yield resp.raw
+
+    def __str__(self):
+        return self.url
+
+
+class ResumableHttpSource(HttpSource):
+    """
+    Feed downloaded to a temporary file first, then parsed from disk.
+
+    After a connection drop the download continues with a Range request
+    (If-Range guards against the file changing in between) instead of
+    starting over. Servers without range support answer 200 and the
+    download simply restarts. The finished file is checked against the
+    expected size and, when known, its SHA-256 / MD5 checksum.
+
+    A partial download survives converter retries (and process restarts),
+    it is removed only after the feed was parsed successfully.
+    """
+
+    def __init__(self, url: str, timeout: int = 120, verify: bool = True,
+                 headers: Optional[Dict[str, str]] = None, download_dir: str = DOWNLOAD_DIR,
+                 max_resumes: int = 5, expected_sha256: Optional[str] = None):
+        super().__init__(url, timeout, verify, headers)
+        # Byte ranges must refer to the stored bytes, not to a gzip stream
+        # the server may compress differently on every request
+        self.headers["Accept-Encoding"] = "identity"
+        self.max_resumes = max_resumes
+        self.expected_sha256 = expected_sha256
+
+        key = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        os.makedirs(download_dir, exist_ok=True)
+        self.part_path = os.path.join(download_dir, key + ".part")
+        self.meta_path = os.path.join(download_dir, key + ".json")
+
+    def _load_meta(self) -> Dict[str, Any]:
+        try:
+            with open(self.meta_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_meta(self, meta: Dict[str, Any]):
+        with open(self.meta_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+
+    def discard(self):
+        """Remove the partial/finished download and its metadata."""
+        for path in (self.part_path, self.meta_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def _resume_offset(self, meta: Dict[str, Any]) -> int:
+        # Without a validator we can't tell whether the bytes on disk are still current
+        if not (meta.get("etag") or meta.get("last_modified")) or not os.path.exists(self.part_path):
+            return 0
+        return os.path.getsize(self.part_path)
+
+    def _request(self, session: requests.Session, offset: int, meta: Dict[str, Any]):
+        headers = dict(self.headers)
+        if offset:
+            headers["Range"] = f"bytes={offset}-"
+            headers["If-Range"] = meta.get("etag") or meta["last_modified"]
+        return session.get(self.url, timeout=self.timeout, headers=headers,
+                           verify=self.verify, stream=True)
+
+    def _download_once(self, session: requests.Session, meta: Dict[str, Any]) -> Dict[str, Any]:
+        """One request: appends to the partial file; returns updated metadata."""
+        offset = self._resume_offset(meta)
+        with self._request(session, offset, meta) as resp:
+            if offset and resp.status_code == 416 and meta.get("size") == offset:
+                # Everything was already downloaded before the drop
+                return meta
+
+            if offset and resp.status_code == 206:
+                start = resp.headers.get("Content-Range", "").split(" ")[-1].split("-")[0]
+                if start != str(offset):
+                    raise DownloadError(f"Unexpected Content-Range: {resp.headers.get('Content-Range')}")
+                print(f"  Resuming download at {offset:,} bytes")
+                mode = "ab"
+            else:
+                # Fresh download (also when the server ignored Range or the file changed)
+                if offset and not resp.ok:
+                    self.discard()
+                resp.raise_for_status()
+                length = resp.headers.get("Content-Length")
+                meta = {
+                    "etag": resp.headers.get("ETag"),
+                    "last_modified": resp.headers.get("Last-Modified"),
+                    "size": int(length) if length and length.isdigit() else None,
+                    "sha256": _header_digest(resp.headers, "sha-256"),
+                    "md5": resp.headers.get("Content-MD5"),
+                    "encoding": resp.headers.get("Content-Encoding", "identity").lower(),
+                }
+                self._save_meta(meta)
+                mode = "wb"
+
+            # Bytes are stored exactly as sent (ranges and checksums refer to them)
+            with open(self.part_path, mode) as f:
+                for chunk in resp.raw.stream(CHUNK_SIZE, decode_content=False):
+                    f.write(chunk)
+
+        size = os.path.getsize(self.part_path)
+        if meta.get("size") is not None and size < meta["size"]:
+            raise requests.ConnectionError(f"Connection closed at {size:,} of {meta['size']:,} bytes")
+        return meta
+
+    def download(self) -> str:
+        """Download (or finish downloading) the feed; returns the verified file path."""
+        meta = self._load_meta()
+        with requests.Session() as session:
+            for resume in range(self.max_resumes + 1):
+                try:
+                    meta = self._download_once(session, meta)
+                    break
+                except RESUMABLE_ERRORS as e:
+                    if resume == self.max_resumes:
+                        raise
+                    meta = self._load_meta()
+                    print(f"  Download interrupted ({e}), resuming...")
+                    time.sleep(min(2 ** resume, 30))
+
+        self._verify(meta)
+        return self.part_path
+
+    def _verify(self, meta: Dict[str, Any]):
+        size = os.path.getsize(self.part_path)
+        if meta.get("size") is not None and size != meta["size"]:
+            self.discard()
+            raise DownloadError(f"Size mismatch: got {size:,} bytes, expected {meta['size']:,}")
+
+        expected_sha256 = self.expected_sha256 or meta.get("sha256")
+        expected_md5 = meta.get("md5")
+        if not expected_sha256 and not expected_md5:
+            return
+
+        sha256 = hashlib.sha256()
+        md5 = hashlib.md5()
+        with open(self.part_path, "rb") as f:
+            for chunk in iter_chunks(f):
+                sha256.update(chunk)
+                md5.update(chunk)
+
+        if expected_sha256 and expected_sha256.lower() != sha256.hexdigest():
+            self.discard()
+            raise DownloadError("SHA-256 checksum mismatch")
+        if expected_md5 and expected_md5 != base64.b64encode(md5.digest()).decode():
+            self.discard()
+            raise DownloadError("MD5 checksum mismatch")
+
+    @contextmanager
+    def open(self) -> Iterator[BinaryIO]:
+        path = self.download()
+        encoding = self._load_meta().get("encoding", "identity")
+        with open(path, "rb") as f:
+            # Server compressed the body despite Accept-Encoding: identity
+            yield gzip.GzipFile(fileobj=f) if encoding in ("gzip", "x-gzip") else f
+        # Parsed successfully - the next run downloads a fresh copy
+        self.discard()
+
+
+def _header_digest(headers, algorithm: str) -> Optional[str]:
+    """Hex digest from a 'Digest: sha-256=<base64>' response header, if present."""
+    for part in headers.get("Digest", "").split(","):
+        name, _, value = part.strip().partition("=")
+        if name.lower() == algorithm and value:
+            try:
+                return base64.b64decode(value).hex()
+            except ValueError:
+                return None
+    return None
+
+
+class FileSource:
+    """Feed stored in a local file (manual download, tests)."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    @contextmanager
+    def open(self) -> Iterator[BinaryIO]:
+        with open(self.path, "rb") as f:
+            yield f
+
+    def __str__(self):
+        return self.path
+
+
+class _CountingReader(io.RawIOBase):
+    """Raw stream wrapper counting bytes read (download size metric)."""
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.bytes_read = 0
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        data = self.raw.read(len(buffer))
+        if not data:
+            return 0
+        buffer[:len(data)] = data
+        self.bytes_read += len(data)
+        return len(data)
+
+
+def iter_chunks(stream: BinaryIO, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """Read a binary stream in fixed-size chunks."""
+    while True:
+        data = stream.read(chunk_size)
+        if not data:
+            return
+        yield data
+
+
+def local_name(tag: str) -> str:
+    """Tag without namespace ('{ns}Item' -> 'Item')."""
+    return tag.rsplit("}", 1)[-1]
+
+
+def namespace(tag: str) -> str:
+    """Namespace prefix of a tag usable in findtext ('{ns}Item' -> '{ns}')."""
+    return tag[:tag.index("}") + 1] if tag.startswith("{") else ""
+
+
+def iter_xml_elements(chunks: Iterable[Union[bytes, str]], tag: str) -> Iterator[ET.Element]:
+    """
+    Incrementally parse XML from byte or text chunks and yield every
+    complete element whose local name is `tag`. Each yielded element is
+    removed from the tree afterwards, so the tree never grows.
+    """
+    parser = ET.XMLPullParser(events=("start", "end"))
+    open_elements = []
+
+    def complete_elements():
+        for event, elem in parser.read_events():
+            if event == "start":
+                open_elements.append(elem)
+                continue
+            open_elements.pop()
+            if local_name(elem.tag) == tag:
+                yield elem
+                # Drop the processed element from its parent
+                if open_elements:
+                    open_elements[-1].remove(elem)
+
+    for chunk in chunks:
+        parser.feed(chunk)
+        yield from complete_elements()
+    parser.close()
+    yield from complete_elements()
+
+
+def text_column(series: pd.Series) -> pd.Series:
+    """Stripped text, missing values -> ''."""
+    return series.fillna("").astype(str).str.strip()
+
+
+def name_column(series: pd.Series) -> pd.Series:
+    """Product name safe for the semicolon-delimited output (';' -> ',')."""
+    return text_column(series).str.replace(";", ",", regex=False)
+
+
+def int_column(series: pd.Series) -> pd.Series:
+    """Quantity as int - some feeds use decimals ('2.0'); missing/invalid -> 0."""
+    numbers = pd.to_numeric(text_column(series), errors="coerce").astype("float64")
+    numbers = numbers.where(np.isfinite(numbers), 0.0)
+    return np.trunc(numbers).astype("int64")
+
+
+def price_column(series: pd.Series) -> pd.Series:
+    """Price rounded to 2 decimals like round(); missing/invalid -> NaN (written as '')."""
+    numbers = pd.to_numeric(text_column(series), errors="coerce").astype("float64")
+    rounded = numbers.round(2)
+    # NumPy rounds half-way cases differently than round(); prices with more than
+    # 2 decimals are rare, so those few go through round() to keep the output identical
+    inexact = numbers.notna() & (rounded != numbers)
+    if inexact.any():
+        rounded[inexact] = [round(value, 2) for value in numbers[inexact]]
+    return rounded
+
+
+class FeedConverter:
+    """
+    Base class for feed converters. Subclasses define fieldnames,
+    default_source() and parse(); run() handles streaming, retries and stats.
+    """
+
+    title = "Feed Converter"
+    feed_format = "feed"
+    fieldnames: List[str] = []
+    output_file = ""
+
+    retries = 3
+    retry_wait = 10  # seconds, multiplied by attempt number
+    batch_size = 20000  # raw records per normalize() batch
+
+    # Output columns used for <output>_delta.csv and Parquet snapshots; no key = neither
+    key_field: Optional[Union[str, List[str]]] = None
+    name_field: Optional[str] = None
+    qty_field: Optional[str] = None
+    price_field: Optional[str] = None
+    write_delta = True
+
+    def __init__(self, source=None, output_file: Optional[str] = None,
+                 snapshot_dir: Optional[str] = None):
+        self.source = source or self.default_source()
+        if output_file:
+            self.output_file = output_file
+        # Parquet snapshots are optional (pyarrow); SNAPSHOT_DIR enables them for all converters
+        self.snapshot_dir = snapshot_dir or default_snapshot_dir()
+
+    def default_source(self):
+        raise NotImplementedError("Subclass must define default_source()")
+
+    def new_stats(self) -> Dict[str, int]:
+        """Counters updated by parse(), normalize() and count_rows()."""
+        return {"total": 0, "written": 0, "bytes": 0}
+
+    def parse(self, stream: BinaryIO, stats: Dict[str, int]) -> Iterator[Dict[str, Any]]:
+        """Yield raw records (text values as found in the feed)."""
+        raise NotImplementedError("Subclass must implement parse()")
+
+    def parse_batches(self, stream: BinaryIO, stats: Dict[str, int]) -> Iterator[pd.DataFrame]:
+        """Raw records from parse() grouped into DataFrames of batch_size rows."""
+        batch = []
+        for record in self.parse(stream, stats):
+            batch.append(record)
+            if len(batch) >= self.batch_size:
+                yield pd.DataFrame.from_records(batch)
+                batch = []
+        if batch:
+            yield pd.DataFrame.from_records(batch)
+
+    def normalize(self, frame: pd.DataFrame, stats: Dict[str, int]) -> pd.DataFrame:
+        """Coerce, clean and filter one batch; must return the output fieldnames."""
+        return frame
+
+    def count_rows(self, frame: pd.DataFrame, stats: Dict[str, int]):
+        """Hook for summary counters of written rows (one normalized batch)."""
+
+    def report(self, stats: Dict[str, int]):
+        """Print the final summary."""
+        print(f"\nDone! {stats['written']} products")
+
+    def convert(self) -> Dict[str, int]:
+        """One attempt: stream source -> parse -> sink."""
+        stats = self.new_stats()
+        started = time.time()
+        # Index of the previous snapshot must be built before the sink replaces it
+        delta = None
+        if self.key_field and self.write_delta:
+            delta = SnapshotDelta(self.output_file, self.key_field, self.qty_field, self.price_field)
+        snapshot = None
+        if self.key_field and self.snapshot_dir:
+            snapshot = SnapshotWriter(self.snapshot_dir, supplier_name(self.output_file), self.key_field,
+                                      self.qty_field, self.price_field, self.name_field)
+
+        try:
+            with self.source.open() as raw:
+                counted = _CountingReader(raw)
+                stream = io.BufferedReader(counted, buffer_size=CHUNK_SIZE)
+                with CsvSink(self.output_file, self.fieldnames) as sink:
+                    for frame in self.parse_batches(stream, stats):
+                        frame = self.normalize(frame, stats)
+                        if frame.empty:
+                            continue
+                        sink.write_frame(frame)
+                        self.count_rows(frame, stats)
+                        if delta:
+                            delta.add_frame(frame)
+                        if snapshot:
+                            snapshot.add_all(frame.to_dict("records"))
+                stats["written"] = sink.written
+                stats["bytes"] = counted.bytes_read
+        except BaseException:
+            if snapshot:
+                snapshot.abort()
+            raise
+        stats["seconds"] = round(time.time() - started, 1)
+        print(f"Downloaded: {stats['bytes']:,} bytes")
+        print(f"Written: {stats['written']} rows to {self.output_file} in {stats['seconds']}s")
+
+        if delta:
+            stats["delta"] = delta.write()
+            print(f"Delta: {SnapshotDelta.describe(stats['delta'])} -> {delta.delta_file}")
+        if snapshot:
+            snapshot.close()
+            print(f"Snapshot: {snapshot.rows} rows -> {snapshot.path}")
+        return stats
+
+    def run(self) -> Dict[str, int]:
+        """Convert the feed, retrying the whole download on failure."""
+        for attempt in range(self.retries):
+            try:
+                print(f"Downloading {self.feed_format} (attempt {attempt + 1})...")
+                return self.convert()
+            except STREAM_ERRORS as e:
+                print(f"  Error: {e}")
+                if attempt < self.retries - 1:
+                    wait = self.retry_wait * (attempt + 1)
+                    print(f"  Retrying in {wait}s...")
+                    time.sleep(wait)
+        print(f"FATAL: Failed to download {self.feed_format} after {self.retries} attempts")
+        sys.exit(1)
+
+    def main(self):
+        print("=" * 50)
+        print(self.title)
+        print("=" * 50)
+
+        stats = self.run()
+        self.report(stats)
+        return stats
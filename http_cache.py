@@ -0,0 +1,128 @@
+"""
+HttpCache - lokalna on-disk cache pre podmienene GET requesty
+Uklada ETag/Last-Modified podla URL a k nim naposledy spracovany riadok
+(produkt) alebo cele telo odpovede (sitemap). Pri 304 sa pouzije ulozena verzia.
+"""
+
+import os
+import json
+import time
+import hashlib
+import threading
+from typing import Optional, Dict, Any, Mapping
+
+CACHE_DIR = '.http_cache'
+
+
+class HttpCache:
+    """
+    Cache validatorov podla URL, jeden JSON subor na URL (thread-safe zapis cez os.replace).
+
+    version: verzia parsovania - zaznamy ulozene s inou verziou sa ignoruju, takze
+             po oprave parsera sa pri 304 nevrati riadok spracovany starym kodom.
+
+    Pouzitie:
+        cache = HttpCache('.http_cache/MojScraper', version=scraper.parser_version())
+        headers = cache.conditional_headers(url)
+        response = session.get(url, headers=headers)
+        if response.status_code == 304:
+            row = cache.get_row(url)
+        else:
+            cache.store(url, response.headers, row=row)
+    """
+
+    def __init__(self, cache_dir: str, max_age_days: float = 7, version: Optional[str] = None):
+        self.cache_dir = cache_dir
+        self.version = version
+        # Po max_age sa zaznam ignoruje - ochrana pred vecnym 304 po zmene parsovania
+        self.max_age = max_age_days * 86400
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, url: str, suffix: str = '.json') -> str:
+        key = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, key[:2], key + suffix)
+
+    def _write_atomic(self, path: str, data: bytes):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """Vrati cache zaznam pre URL alebo None (neexistuje / poskodeny / expirovany / ina verzia)"""
+        try:
+            with open(self._path(url), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if time.time() - entry.get('stored_at', 0) > self.max_age:
+            return None
+        if entry.get('version') != self.version:
+            return None
+        return entry
+
+    def conditional_headers(self, url: str, need_body: bool = False) -> Dict[str, str]:
+        """If-None-Match / If-Modified-Since hlavicky pre URL (prazdne ak nie je co poslat)"""
+        entry = self.get(url)
+        if not entry:
+            return {}
+        if need_body and not os.path.exists(self._path(url, '.body')):
+            return {}
+
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def get_row(self, url: str) -> Optional[Dict[str, Any]]:
+        """Naposledy spracovany riadok pre URL (po 304)"""
+        entry = self.get(url)
+        return dict(entry['row']) if entry and entry.get('row') else None
+
+    def get_body(self, url: str) -> Optional[bytes]:
+        """Naposledy ulozene telo odpovede pre URL (po 304)"""
+        try:
+            with open(self._path(url, '.body'), 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def get_body_path(self, url: str) -> Optional[str]:
+        """Cesta k ulozenemu telu odpovede (pre streamovane citanie po 304)"""
+        path = self._path(url, '.body')
+        return path if os.path.exists(path) else None
+
+    def temp_body_path(self, url: str) -> str:
+        """Docasny subor, do ktoreho sa da telo streamovat a potom ulozit cez store(body_file=...)"""
+        path = self._path(url, '.body')
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        return f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+    def store(self, url: str, headers: Mapping[str, str], row: Optional[Dict[str, Any]] = None,
+              body: Optional[bytes] = None, body_file: Optional[str] = None):
+        """Ulozi validatory z odpovede; bez ETag aj Last-Modified nie je co cachovat"""
+        etag = headers.get('ETag')
+        last_modified = headers.get('Last-Modified')
+        if not etag and not last_modified:
+            if body_file:
+                os.remove(body_file)
+            return
+
+        if body is not None:
+            self._write_atomic(self._path(url, '.body'), body)
+        if body_file is not None:
+            os.replace(body_file, self._path(url, '.body'))
+
+        entry = {
+            'url': url,
+            'etag': etag,
+            'last_modified': last_modified,
+            'stored_at': time.time(),
+            'version': self.version,
+            'row': row,
+        }
+        self._write_atomic(self._path(url), json.dumps(entry, ensure_ascii=False).encode('utf-8'))
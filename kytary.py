@@ -7,11 +7,8 @@ Output: kytary_sklad.csv (semicolon-delimited)
 Columns: ProductCode;ProductName;AvailableVolume;RetailPriceWithVAT
 """
 
-import csv
-import sys
-import time
-import requests
-from xml.etree import ElementTree as ET
+from feed_converter import (FeedConverter, ResumableHttpSource, int_column, iter_chunks, iter_xml_elements,
+                            name_column, namespace, price_column, text_column)
 
 # Kytary B2B feed URL
 XML_URL = (
@@ -23,107 +20,60 @@ XML_URL = (
 OUTPUT_FILE = "kytary_sklad.csv"
 
 
-def fetch_xml(url, timeout=300):
-    """Download XML feed with retry logic."""
-    for attempt in range(3):
-        try:
-            print(f"Downloading XML (attempt {attempt + 1})...")
-            resp = requests.get(url, timeout=timeout, headers={
-                "User-Agent": "All4music-FeedImport/1.0"
-            })
-            resp.raise_for_status()
-            print(f"Downloaded: {len(resp.content):,} bytes")
-            return resp.content
-        except requests.RequestException as e:
-            print(f"  Error: {e}")
-            if attempt < 2:
-                wait = 10 * (attempt + 1)
-                print(f"  Retrying in {wait}s...")
-                time.sleep(wait)
-    print("FATAL: Failed to download XML after 3 attempts")
-    sys.exit(1)
-
-
-def parse_xml_to_rows(xml_bytes):
-    """Parse XML and extract product data rows."""
-    root = ET.fromstring(xml_bytes)
-
-    # Handle namespace if present
-    ns = ""
-    if root.tag.startswith("{"):
-        ns = root.tag.split("}")[0] + "}"
-
-    rows = []
-    total = 0
-    in_stock = 0
-
-    for item in root.iter(f"{ns}VOPriceListItem"):
-        total += 1
-        code = (item.findtext(f"{ns}ProductCode") or "").strip()
-        name = (item.findtext(f"{ns}ProductName") or "").strip()
-        qty_str = (item.findtext(f"{ns}AvailableVolume") or "0").strip()
-        retail_str = (item.findtext(f"{ns}RetailPriceWithVAT") or "").strip()
-        stock_flag = (item.findtext(f"{ns}InStock") or "false").strip().lower()
-
-        # Convert quantity - some may be decimal
-        try:
-            qty = int(float(qty_str))
-        except ValueError:
-            qty = 0
-
-        if not code:
-            continue
-
-        if stock_flag == "true":
-            in_stock += 1
+class KytaryConverter(FeedConverter):
+    """Streams VOPriceListItem elements from the Kytary price list into CSV."""
+
+    title = "Kytary B2B XML → CSV Converter"
+    feed_format = "XML"
+    fieldnames = ["ProductCode", "ProductName", "AvailableVolume", "RetailPriceWithVAT"]
+    output_file = OUTPUT_FILE
+    key_field = "ProductCode"
+    name_field = "ProductName"
+    qty_field = "AvailableVolume"
+    price_field = "RetailPriceWithVAT"
+
+    def default_source(self):
+        # Large feed - resume with Range after a connection drop instead of re-downloading
+        return ResumableHttpSource(XML_URL, timeout=300)
+
+    def new_stats(self):
+        return {**super().new_stats(), "in_stock": 0, "with_qty": 0}
+
+    def parse(self, stream, stats):
+        for item in iter_xml_elements(iter_chunks(stream), "VOPriceListItem"):
+            stats["total"] += 1
+            # Handle namespace if present
+            ns = namespace(item.tag)
+            yield {
+                "ProductCode": item.findtext(f"{ns}ProductCode"),
+                "ProductName": item.findtext(f"{ns}ProductName"),
+                "InStock": item.findtext(f"{ns}InStock"),
+                "AvailableVolume": item.findtext(f"{ns}AvailableVolume"),
+                "RetailPriceWithVAT": item.findtext(f"{ns}RetailPriceWithVAT")
+            }
+
+    def normalize(self, frame, stats):
+        frame["ProductCode"] = text_column(frame["ProductCode"])
+        frame = frame[frame["ProductCode"] != ""].copy()
+
+        stats["in_stock"] += int((text_column(frame["InStock"]).str.lower() == "true").sum())
 
         # Clean name (remove semicolons for CSV compatibility)
-        name = name.replace(";", ",")
+        frame["ProductName"] = name_column(frame["ProductName"])
+        frame["AvailableVolume"] = int_column(frame["AvailableVolume"])
+        frame["RetailPriceWithVAT"] = price_column(frame["RetailPriceWithVAT"])
+        return frame[self.fieldnames]
 
-        # Parse retail price
-        try:
-            retail_price = round(float(retail_str), 2) if retail_str else ""
-        except ValueError:
-            retail_price = ""
+    def count_rows(self, frame, stats):
+        stats["with_qty"] += int((frame["AvailableVolume"] > 0).sum())
 
-        rows.append({
-            "ProductCode": code,
-            "ProductName": name,
-            "AvailableVolume": qty,
-            "RetailPriceWithVAT": retail_price
-        })
-
-    print(f"Parsed: {total} items, {in_stock} in stock")
-    return rows
-
-
-def write_csv(rows, output_file):
-    """Write rows to semicolon-delimited CSV."""
-    with open(output_file, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(
-            f,
-            fieldnames=["ProductCode", "ProductName", "AvailableVolume", "RetailPriceWithVAT"],
-            delimiter=";",
-            quoting=csv.QUOTE_MINIMAL
-        )
-        writer.writeheader()
-        writer.writerows(rows)
-
-    print(f"Written: {len(rows)} rows to {output_file}")
+    def report(self, stats):
+        print(f"Parsed: {stats['total']} items, {stats['in_stock']} in stock")
+        print(f"\nDone! {stats['written']} products, {stats['with_qty']} with stock > 0")
 
 
 def main():
-    print("=" * 50)
-    print("Kytary B2B XML → CSV Converter")
-    print("=" * 50)
-
-    xml_bytes = fetch_xml(XML_URL)
-    rows = parse_xml_to_rows(xml_bytes)
-    write_csv(rows, OUTPUT_FILE)
-
-    # Summary
-    with_qty = sum(1 for r in rows if r["AvailableVolume"] > 0)
-    print(f"\nDone! {len(rows)} products, {with_qty} with stock > 0")
+    KytaryConverter().main()
 
 
 if __name__ == "__main__":
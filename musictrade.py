@@ -2,6 +2,8 @@
 MusicTrade.cz Scraper
 Stiahne produkty z musictrade.cz
 Poznamka: Extrahuje data z JavaScript dataLayer objektu (robustnejsie ako HTML parsing)
+Rychla cesta (parse_raw) najde objekt "product" z dataLayer.push priamo v bajtoch
+stranky a dekoduje ho JSON dekoderom bez stavby DOM; soup sa pouzije len ked zlyha.
 """
 
 import re
@@ -9,10 +11,43 @@ import json
 from bs4 import BeautifulSoup
 from base_scraper import BaseScraper, ScraperConfig
 
+DATALAYER_MARKER = b'dataLayer.push'
+SCRIPT_END = b'</script>'
+PRODUCT_KEY = re.compile(r'"product"\s*:\s*(?={)')
+MAX_SCRIPT_BYTES = 512 * 1024  # dlhsi dataLayer skript sa neskenuje (fallback na soup)
+MAX_PUSHES = 10  # kolko dataLayer.push na stranke sa najviac preskuma
+
+_decoder = json.JSONDecoder()
+
 
 class ScraperMusicTrade(BaseScraper):
     """Scraper pre musictrade.cz"""
 
+    def parse_raw(self, content: bytes, url: str, encoding=None):
+        """Produkt z dataLayer.push priamo zo surovych bajtov - None = fallback na parse_product"""
+        position = 0
+        for _ in range(MAX_PUSHES):
+            start = content.find(DATALAYER_MARKER, position)
+            if start < 0:
+                return None
+            end = content.find(SCRIPT_END, start, start + MAX_SCRIPT_BYTES)
+            if end < 0:
+                return None
+            try:
+                script = content[start:end].decode(encoding or 'utf-8')
+            except (LookupError, UnicodeDecodeError):
+                return None  # kodovanie zisti az soup
+
+            for match in PRODUCT_KEY.finditer(script):
+                try:
+                    product_data, _ = _decoder.raw_decode(script, match.end())
+                except ValueError:
+                    continue
+                if product_data.get('code'):
+                    return self._product_row(product_data)
+            position = end
+        return None
+
     def parse_product(self, soup: BeautifulSoup, url: str):
         # Hladame dataLayer.push v scriptoch
         scripts = soup.find_all('script')
@@ -34,6 +69,10 @@ class ScraperMusicTrade(BaseScraper):
         except json.JSONDecodeError:
             return None
 
+        return self._product_row(product_data)
+
+    @staticmethod
+    def _product_row(product_data):
         # SKU
         sku = product_data.get('code')
         if not sku:
@@ -60,13 +99,17 @@ class ScraperMusicTrade(BaseScraper):
         }
 
 
+# Konfiguracia behu - run_all.py z nej berie host a pocet spojeni
+CONFIG = ScraperConfig(
+    sitemap_url='https://www.musictrade.cz/sitemap.xml',
+    output_file='musictrade_sklad.csv',
+    max_workers=20,
+    engine='async',
+    max_in_flight=20,
+    url_blacklist=['/znacka/', '/kategorie/']
+)
+
+
 if __name__ == "__main__":
-    config = ScraperConfig(
-        sitemap_url='https://www.musictrade.cz/sitemap.xml',
-        output_file='musictrade_sklad.csv',
-        max_workers=20,
-        url_blacklist=['/znacka/', '/kategorie/']
-    )
-
-    scraper = ScraperMusicTrade(config)
+    scraper = ScraperMusicTrade(CONFIG)
     scraper.run()
@@ -7,99 +7,62 @@ Output: muziker_sklad.csv (semicolon-delimited)
 Columns: Code;EAN;SKU;StockQTY
 """
 
-import csv
 import io
-import sys
-import time
-import requests
+
+import pandas as pd
+
+from feed_converter import FeedConverter, HttpSource, int_column, text_column
 
 CSV_URL = "https://pyfeed.muzmuz.tech/feeds/output/bjfifkwodvbba3124emkhfpzf.csv"
 OUTPUT_FILE = "muziker_sklad.csv"
 
 
-def fetch_csv(url, timeout=120):
-    """Download CSV feed with retry logic."""
-    for attempt in range(3):
-        try:
-            print(f"Downloading CSV (attempt {attempt + 1})...")
-            resp = requests.get(url, timeout=timeout, headers={
-                "User-Agent": "All4music-FeedImport/1.0"
-            })
-            resp.raise_for_status()
-            print(f"Downloaded: {len(resp.content):,} bytes")
-            return resp.text
-        except requests.RequestException as e:
-            print(f"  Error: {e}")
-            if attempt < 2:
-                wait = 10 * (attempt + 1)
-                print(f"  Retrying in {wait}s...")
-                time.sleep(wait)
-    print("FATAL: Failed to download CSV after 3 attempts")
-    sys.exit(1)
-
-
-def process_csv(csv_text):
-    """Parse source CSV and extract needed columns."""
-    reader = csv.DictReader(io.StringIO(csv_text))
-    rows = []
-    total = 0
-    in_stock = 0
-
-    for row in reader:
-        total += 1
-        code = (row.get("Code") or "").strip()
-        ean = (row.get("EAN") or "").strip()
-        sku = (row.get("SKU") or "").strip()
-        qty_str = (row.get("StockQTY") or "0").strip()
-
-        try:
-            qty = int(float(qty_str))
-        except ValueError:
-            qty = 0
-
-        if qty > 0:
-            in_stock += 1
-
-        if not code and not ean:
-            continue
-
-        rows.append({
-            "Code": code,
-            "EAN": ean,
-            "SKU": sku,
-            "StockQTY": qty
-        })
-
-    print(f"Parsed: {total} items, {in_stock} in stock")
-    return rows
-
-
-def write_csv(rows, output_file):
-    """Write rows to semicolon-delimited CSV."""
-    with open(output_file, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(
-            f,
-            fieldnames=["Code", "EAN", "SKU", "StockQTY"],
-            delimiter=";",
-            quoting=csv.QUOTE_MINIMAL
-        )
-        writer.writeheader()
-        writer.writerows(rows)
-
-    print(f"Written: {len(rows)} rows to {output_file}")
+class MuzikerConverter(FeedConverter):
+    """Streams the Muziker CSV feed, keeping only the columns needed for stock import."""
 
+    title = "Muziker CSV Feed Fetcher"
+    feed_format = "CSV"
+    fieldnames = ["Code", "EAN", "SKU", "StockQTY"]
+    output_file = OUTPUT_FILE
+    # Rows may have only an EAN
+    key_field = ["Code", "EAN"]
+    qty_field = "StockQTY"
 
-def main():
-    print("=" * 50)
-    print("Muziker CSV Feed Fetcher")
-    print("=" * 50)
+    def default_source(self):
+        return HttpSource(CSV_URL)
+
+    def new_stats(self):
+        return {**super().new_stats(), "in_stock": 0, "with_stock": 0}
+
+    def parse_batches(self, stream, stats):
+        # CSV feed - read straight into DataFrames, only the needed columns, all as text
+        text = io.TextIOWrapper(stream, encoding="utf-8-sig", errors="replace", newline="")
+        # Lines the tokenizer cannot split are skipped with a warning instead of failing the whole feed
+        reader = pd.read_csv(text, dtype=str, keep_default_na=False, chunksize=self.batch_size,
+                             usecols=lambda column: column in self.fieldnames, on_bad_lines="warn")
+        for frame in reader:
+            stats["total"] += len(frame)
+            # Columns missing in the feed are empty, as with csv.DictReader
+            yield frame.reindex(columns=self.fieldnames, fill_value="")
 
-    csv_text = fetch_csv(CSV_URL)
-    rows = process_csv(csv_text)
-    write_csv(rows, OUTPUT_FILE)
+    def normalize(self, frame, stats):
+        for column in ("Code", "EAN", "SKU"):
+            frame[column] = text_column(frame[column])
+        frame["StockQTY"] = int_column(frame["StockQTY"])
 
-    with_stock = sum(1 for r in rows if r["StockQTY"] > 0)
-    print(f"\nDone! {len(rows)} products, {with_stock} in stock")
+        stats["in_stock"] += int((frame["StockQTY"] > 0).sum())
+        return frame[(frame["Code"] != "") | (frame["EAN"] != "")]
+
+    def count_rows(self, frame, stats):
+        stats["with_stock"] += int((frame["StockQTY"] > 0).sum())
+
+    def report(self, stats):
+        print(f"Parsed: {stats['total']} items, {stats['in_stock']} in stock")
+        print(f"\nDone! {stats['written']} products, {stats['with_stock']} in stock")
+
+
+def main():
+    MuzikerConverter().main()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,136 @@
+"""
+PageReader - ciastocne citanie tela produktovej stranky
+SKU a sklad su vacsinou v hornej casti HTML, kym paticka, inline skripty
+a JSON-LD mozu mat stovky kB. Telo sa cita po blokoch a citanie skonci, ked
+sa najdu vsetky znacky (markers) a za poslednou je este MARKER_TAIL bajtov
+(hodnota elementu za znackou), alebo po max_bytes bajtoch. Parser dostane
+len precitany zaciatok stranky (html.parser / lxml / selectolax neuzavrete
+tagy doplnia).
+
+Znacky musia pochadzat zo selectorov FIELDS / specifikacie (kontroluje
+BaseScraper) a stranka, v ktorej zaciatku chyba niektore pole, sa stiahne
+znova cela - znacka pred datami produktu tak stranku potichu neoreze.
+
+Zvysok tela po predcasnom konci: ak je maly (Content-Length, najviac
+DRAIN_LIMIT), docita sa a spojenie sa vrati do poolu; inak sa spojenie
+zatvori - stahovat stovky kB len kvoli keep-alive sa neoplati.
+
+Zapnute per scraper cez ScraperConfig(stream_markers=[...], max_page_bytes=...),
+thread aj pipeline engine (requests) aj async engine (aiohttp).
+
+Pouzitie:
+    reader = PageReader(['class="description"'], max_bytes=256 * 1024)
+    response = session.get(url, stream=True)
+    body, nbytes, partial = reader.read(response)
+"""
+
+from typing import Iterable, Optional, Tuple
+
+CHUNK_SIZE = 16 * 1024
+DRAIN_LIMIT = 64 * 1024  # mensi zvysok tela sa docita, aby spojenie islo spat do poolu
+MARKER_TAIL = 4 * 1024  # po konci poslednej znacky sa cita este aspon tolko bajtov
+
+
+class _Scan:
+    """Stav citania jedneho tela: buffer a znacky, ktore este neboli najdene"""
+
+    def __init__(self, markers: Tuple[bytes, ...], max_bytes: Optional[int]):
+        self.buffer = bytearray()
+        self.pending = list(markers)
+        self.stop_on_markers = bool(markers)
+        self.max_bytes = max_bytes
+        self.read = 0
+        self.markers_end = 0  # koniec najneskor najdenej znacky v buffri
+
+    def feed(self, chunk: bytes) -> bool:
+        """Prida blok tela, vrati True ak uz netreba citat dalej"""
+        start = len(self.buffer)
+        self.buffer += chunk
+        self.read += len(chunk)
+        if self.pending:
+            # Znacka moze zacinat v predoslom bloku
+            pending = []
+            for marker in self.pending:
+                position = self.buffer.find(marker, max(0, start - len(marker) + 1))
+                if position < 0:
+                    pending.append(marker)
+                else:
+                    self.markers_end = max(self.markers_end, position + len(marker))
+            self.pending = pending
+        if self.stop_on_markers and not self.pending and len(self.buffer) >= self.markers_end + MARKER_TAIL:
+            return True
+        if self.max_bytes and len(self.buffer) >= self.max_bytes:
+            del self.buffer[self.max_bytes:]
+            return True
+        return False
+
+
+class PageReader:
+    """
+    Cita telo odpovede po znacky / limit bajtov.
+
+    markers:   retazce (UTF-8), po ktorych najdeni (vsetkych) a MARKER_TAIL bajtoch sa citanie skonci
+    max_bytes: najviac tolko bajtov tela (None = bez limitu)
+    """
+
+    def __init__(self, markers: Optional[Iterable[str]] = None, max_bytes: Optional[int] = None):
+        self.markers = tuple(marker.encode('utf-8') for marker in markers or ())
+        self.max_bytes = max_bytes
+
+    def read(self, response) -> Tuple[bytes, int, bool]:
+        """
+        Telo odpovede requests (stream=True) -> (telo alebo jeho zaciatok,
+        prenesene bajty vratane docitaneho zvysku, ci sa citanie skoncilo
+        predcasne). Spojenie uvolni.
+        """
+        scan = _Scan(self.markers, self.max_bytes)
+        stopped = False
+        for chunk in response.iter_content(CHUNK_SIZE):
+            if scan.feed(chunk):
+                stopped = True
+                break
+
+        raw = response.raw
+        nbytes = scan.read
+        partial = stopped and not _at_end(raw)
+        if partial:
+            length = response.headers.get('Content-Length', '')
+            # tell() su bajty zo siete (pred dekompresiou), rovnako ako Content-Length
+            remaining = int(length) - raw.tell() if length.isdigit() else None
+            if remaining is not None and remaining <= DRAIN_LIMIT:
+                before = raw.tell()
+                raw.drain_conn()
+                raw.release_conn()
+                nbytes += raw.tell() - before
+            else:
+                response.close()
+        return bytes(scan.buffer), nbytes, partial
+
+    async def read_async(self, response) -> Tuple[bytes, int, bool]:
+        """Obdoba read() pre aiohttp.ClientResponse (volat vnutri `async with`)"""
+        scan = _Scan(self.markers, self.max_bytes)
+        stopped = False
+        async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+            if scan.feed(chunk):
+                stopped = True
+                break
+
+        nbytes = scan.read
+        partial = stopped and not response.content.at_eof()
+        if partial:
+            # aiohttp telo rozbaluje - pri kompresii sa zvysok z Content-Length neda urcit
+            length = response.content_length
+            compressed = 'Content-Encoding' in response.headers
+            if length is not None and not compressed and length - scan.read <= DRAIN_LIMIT:
+                nbytes += len(await response.read())
+            else:
+                response.close()
+        return bytes(scan.buffer), nbytes, partial
+
+
+def _at_end(raw) -> bool:
+    """Telo requests odpovede je cele precitane (urllib3 HTTPResponse)"""
+    try:
+        return raw.length_remaining == 0 or raw.isclosed()
+    except AttributeError:
+        return False
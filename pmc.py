@@ -9,121 +9,94 @@ Output: pmc_sklad.csv (semicolon-delimited)
 Columns: ITEM_ID;PRODUCTNAME;EAN;Availability;RetailPrice
 """
 
-import csv
-import sys
-import time
-import requests
-from xml.etree import ElementTree as ET
+import codecs
+
+from feed_converter import (FeedConverter, ResumableHttpSource, CHUNK_SIZE, int_column, iter_xml_elements,
+                            name_column, price_column, text_column)
 
 XML_URL = "http://b2b.pmc.cz/xml/XML_PMCOS.xml"
 OUTPUT_FILE = "pmc_sklad.csv"
 
 
-def fetch_xml(url, timeout=120):
-    """Download XML feed with retry logic."""
-    for attempt in range(3):
-        try:
-            print(f"Downloading XML (attempt {attempt + 1})...")
-            resp = requests.get(url, timeout=timeout, headers={
-                "User-Agent": "All4music-FeedImport/1.0"
-            }, verify=False)  # SSL cert issue on b2b.pmc.cz
-            resp.raise_for_status()
-            print(f"Downloaded: {len(resp.content):,} bytes")
-            return resp.content
-        except requests.RequestException as e:
-            print(f"  Error: {e}")
-            if attempt < 2:
-                wait = 10 * (attempt + 1)
-                print(f"  Retrying in {wait}s...")
-                time.sleep(wait)
-    print("FATAL: Failed to download XML after 3 attempts")
-    sys.exit(1)
-
-
-def parse_xml_to_rows(xml_bytes):
-    """Parse UTF-16 XML and extract product data rows."""
-    # PMC XML is UTF-16 encoded - decode first
-    try:
-        xml_text = xml_bytes.decode("utf-16")
-    except UnicodeDecodeError:
+def iter_utf16_chunks(stream, chunk_size=CHUNK_SIZE):
+    """
+    Incrementally decode a UTF-16 byte stream into text chunks.
+    A BOM decides the byte order; without BOM the feed is UTF-16 LE.
+    Odd byte counts split across chunks are carried over by the decoder.
+    """
+    head = stream.read(2)
+    if head in (codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE):
+        decoder = codecs.getincrementaldecoder("utf-16")()
+    else:
         # Try UTF-16 LE without BOM
-        xml_text = xml_bytes.decode("utf-16-le")
-
-    root = ET.fromstring(xml_text)
-
-    rows = []
-    total = 0
-    in_stock = 0
-    no_ean = 0
-
-    for item in root.iter("SHOP_ITEM"):
-        total += 1
-        item_id = (item.findtext("ITEM_ID") or "").strip()
-        ean = (item.findtext("EAN") or "").strip()
-        avail_str = (item.findtext("AVAILABILITY") or "0").strip()
-
-        try:
-            availability = int(float(avail_str))
-        except ValueError:
-            availability = 0
-
-        if availability > 0:
-            in_stock += 1
-
-        if not ean:
-            no_ean += 1
-
-        if not item_id:
-            continue
-
-        productname = (item.findtext("PRODUCTNAME") or "").strip()
-        productname = productname.replace(";", ",")
-
-        retail_str = (item.findtext("RETAIL_PRICE") or "").strip()
-        try:
-            retail_price = round(float(retail_str), 2) if retail_str else ""
-        except ValueError:
-            retail_price = ""
-
-        rows.append({
-            "ITEM_ID": item_id,
-            "PRODUCTNAME": productname,
-            "EAN": ean,
-            "Availability": availability,
-            "RetailPrice": retail_price
-        })
-
-    print(f"Parsed: {total} items, {in_stock} in stock, {no_ean} without EAN")
-    return rows
-
-
-def write_csv(rows, output_file):
-    """Write rows to semicolon-delimited CSV."""
-    with open(output_file, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(
-            f,
-            fieldnames=["ITEM_ID", "PRODUCTNAME", "EAN", "Availability", "RetailPrice"],
-            delimiter=";",
-            quoting=csv.QUOTE_MINIMAL
-        )
-        writer.writeheader()
-        writer.writerows(rows)
-
-    print(f"Written: {len(rows)} rows to {output_file}")
+        decoder = codecs.getincrementaldecoder("utf-16-le")()
+
+    data = head
+    while data:
+        text = decoder.decode(data)
+        if text:
+            yield text
+        data = stream.read(chunk_size)
+    text = decoder.decode(b"", final=True)
+    if text:
+        yield text
+
+
+class PmcConverter(FeedConverter):
+    """Streams SHOP_ITEM elements from the UTF-16 PMC feed into CSV."""
+
+    title = "PMC B2B XML -> CSV Converter"
+    feed_format = "XML"
+    fieldnames = ["ITEM_ID", "PRODUCTNAME", "EAN", "Availability", "RetailPrice"]
+    output_file = OUTPUT_FILE
+    key_field = "ITEM_ID"
+    name_field = "PRODUCTNAME"
+    qty_field = "Availability"
+    price_field = "RetailPrice"
+
+    def default_source(self):
+        return ResumableHttpSource(XML_URL, verify=False)  # SSL cert issue on b2b.pmc.cz
+
+    def new_stats(self):
+        return {**super().new_stats(), "in_stock": 0, "no_ean": 0, "with_ean": 0, "with_stock": 0}
+
+    def parse(self, stream, stats):
+        # PMC XML is UTF-16 encoded - decoded while streaming
+        for item in iter_xml_elements(iter_utf16_chunks(stream), "SHOP_ITEM"):
+            stats["total"] += 1
+            yield {
+                "ITEM_ID": item.findtext("ITEM_ID"),
+                "PRODUCTNAME": item.findtext("PRODUCTNAME"),
+                "EAN": item.findtext("EAN"),
+                "Availability": item.findtext("AVAILABILITY"),
+                "RetailPrice": item.findtext("RETAIL_PRICE")
+            }
+
+    def normalize(self, frame, stats):
+        frame["ITEM_ID"] = text_column(frame["ITEM_ID"])
+        frame["EAN"] = text_column(frame["EAN"])
+        frame["Availability"] = int_column(frame["Availability"])
+
+        # Counted over all items, including those without ITEM_ID
+        stats["in_stock"] += int((frame["Availability"] > 0).sum())
+        stats["no_ean"] += int((frame["EAN"] == "").sum())
+
+        frame = frame[frame["ITEM_ID"] != ""].copy()
+        frame["PRODUCTNAME"] = name_column(frame["PRODUCTNAME"])
+        frame["RetailPrice"] = price_column(frame["RetailPrice"])
+        return frame[self.fieldnames]
+
+    def count_rows(self, frame, stats):
+        stats["with_ean"] += int((frame["EAN"] != "").sum())
+        stats["with_stock"] += int((frame["Availability"] > 0).sum())
+
+    def report(self, stats):
+        print(f"Parsed: {stats['total']} items, {stats['in_stock']} in stock, {stats['no_ean']} without EAN")
+        print(f"\nDone! {stats['written']} products, {stats['with_ean']} with EAN, {stats['with_stock']} in stock")
 
 
 def main():
-    print("=" * 50)
-    print("PMC B2B XML -> CSV Converter")
-    print("=" * 50)
-
-    xml_bytes = fetch_xml(XML_URL)
-    rows = parse_xml_to_rows(xml_bytes)
-    write_csv(rows, OUTPUT_FILE)
-
-    with_stock = sum(1 for r in rows if r["Availability"] > 0)
-    with_ean = sum(1 for r in rows if r["EAN"])
-    print(f"\nDone! {len(rows)} products, {with_ean} with EAN, {with_stock} in stock")
+    PmcConverter().main()
 
 
 if __name__ == "__main__":
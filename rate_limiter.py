@@ -0,0 +1,243 @@
+"""
+RateLimiter - adaptivny token bucket pre kazdy host
+Namiesto pevneho time.sleep(delay) pred kazdym requestom si workery beru
+tokeny zo spolocneho bucketu hostu. Rychlost sa riadi signalmi servera:
+  - 429 / 503 s Retry-After: host sa zablokuje na Retry-After, rychlost ostava
+    (server povedal, kedy pokracovat - kratky burst nema zrazit tempo)
+  - 429 / 503 bez Retry-After: rychlost sa znizi (nasobne)
+  - rastuca latencia (EWMA nad zakladnou latenciou): mierne spomalenie
+  - zdravy host po spomaleni: rychlost sa nasobne (2x za sekundu) vrati
+    k rychlosti pred spomalenim (strop)
+  - zdravy host na strope: rychlost rastie (o increase, napr. 10 % za sekundu),
+    ale len ked limiter naozaj brzdi (inak nie je co zrychlovat)
+
+Bez pociatocnej rychlosti (rate=None) limiter nebrzdi, kym server
+neposle prvy 429/503 - potom zacne na polovici pozorovanej rychlosti.
+
+Pouzitie:
+    limiter = RateLimiter(rate=10)
+    limiter.wait(url)                  # async: await limiter.wait_async(url)
+    response = session.get(url)
+    limiter.record(url, response.status_code, response.elapsed.total_seconds(),
+                   response.headers.get('Retry-After'))
+"""
+
+import time
+import asyncio
+import threading
+from collections import deque
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+THROTTLE_STATUSES = (429, 503)
+
+# Najviac jedno spomalenie za tento cas - odpovede requestov, ktore uz boli
+# na ceste, by inak rychlost zrazili az na minimum
+DECREASE_COOLDOWN = 1.0
+LATENCY_ALPHA = 0.2     # vaha novej vzorky v EWMA latencie
+LATENCY_WARMUP = 10     # vzorky pred urcenim zakladnej latencie
+LATENCY_CLIP = 4.0      # vzorka max. 4x zakladna latencia - jedna pomala stranka nie je pretazenie
+MAX_RETRY_AFTER = 300   # ochrana pred nezmyselnym Retry-After
+RECOVERY_PER_SECOND = 2.0  # nasobok rychlosti za sekundu pri navrate k stropu
+CEILING_DECAY = 0.9     # spomalenie este pocas navratu = strop bol privysoko, mierne sa znizi
+BLOCK_GRACE = 2.0       # s po Retry-After bloku - latencia meria dobiehanie fronty, nie server
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After v sekundach ('120' alebo HTTP datum), None ak chyba / neda sa precitat"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        seconds = float(value)
+    else:
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        seconds = (retry_at - datetime.now(timezone.utc)).total_seconds()
+    return min(max(seconds, 0.0), MAX_RETRY_AFTER)
+
+
+def url_host(url: str) -> str:
+    return urlsplit(url).netloc.lower()
+
+
+class _HostBucket:
+    """Stav jedneho hostu; vsetky metody volat pod zamkom limitera"""
+
+    def __init__(self, rate: Optional[float], burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()  # cas posledneho doplnenia (alebo koniec Retry-After)
+        self.latency: Optional[float] = None
+        self.baseline: Optional[float] = None
+        self.samples = 0
+        self.last_decrease = 0.0
+        self.last_increase = 0.0
+        self.ceiling: Optional[float] = None  # rychlost pred spomalenim - cielova pri navrate
+        self.blocked_until = 0.0  # koniec posledneho Retry-After
+        self.recent = deque(maxlen=50)  # casy requestov - pozorovana rychlost
+
+    def refill(self, now: float):
+        if now > self.updated:
+            if self.rate:
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+    def reserve(self, now: float) -> float:
+        """Zoberie token (aj do minusu) a vrati, kolko treba cakat"""
+        self.refill(now)
+        self.recent.append(now)
+        ready = self.updated
+        if self.rate:
+            self.tokens -= 1
+            ready += max(0.0, -self.tokens) / self.rate
+        return max(0.0, ready - now)
+
+    def observed_rate(self, now: float) -> Optional[float]:
+        # Okno cez Retry-After blok nemeria server, ale cakanie workerov
+        if len(self.recent) < 2 or now <= self.recent[0] or self.recent[0] < self.blocked_until + BLOCK_GRACE:
+            return None
+        return len(self.recent) / (now - self.recent[0])
+
+    def set_rate(self, rate: float, now: float):
+        self.refill(now)
+        self.rate = rate
+
+
+class RateLimiter:
+    """
+    Token bucket pre kazdy host, thread-safe (thread/pipeline engine) aj pre asyncio.
+
+    rate:     pociatocna rychlost v req/s (None = bez limitu do prveho 429/503)
+    burst:    kolko requestov moze ist naraz po necinnosti
+    min_rate / max_rate: hranice adaptacie
+    decrease: nasobok rychlosti po 429/503
+    increase: relativny rast rychlosti za sekundu, ked je host zdravy (0.1 = +10 %/s)
+    latency_factor: EWMA latencie nad zakladnou latenciou x faktor = host je pretazeny
+    """
+
+    def __init__(self, rate: Optional[float] = None, burst: float = 1, min_rate: float = 0.2,
+                 max_rate: Optional[float] = None, decrease: float = 0.5, increase: float = 0.1,
+                 latency_factor: float = 2.0):
+        self.initial_rate = min(rate, max_rate) if rate and max_rate else rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.decrease = decrease
+        self.increase = increase
+        self.latency_factor = latency_factor
+        self.hosts: Dict[str, _HostBucket] = {}
+        self.lock = threading.Lock()
+
+    def __getstate__(self):
+        # Scraper sa posiela do parsovacich procesov (pipeline engine) - tie limiter nepouzivaju
+        state = self.__dict__.copy()
+        state['hosts'] = {}
+        del state['lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
+
+    def _bucket(self, host: str) -> _HostBucket:
+        bucket = self.hosts.get(host)
+        if bucket is None:
+            bucket = self.hosts[host] = _HostBucket(self.initial_rate, self.burst)
+        return bucket
+
+    def reserve(self, url: str) -> float:
+        """Rezervuje request na host URL a vrati pocet sekund, ktore treba pred nim pockat"""
+        with self.lock:
+            return self._bucket(url_host(url)).reserve(time.monotonic())
+
+    def wait(self, url: str):
+        delay = self.reserve(url)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def wait_async(self, url: str):
+        delay = self.reserve(url)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def record(self, url: str, status: Optional[int], latency: Optional[float] = None,
+               retry_after: Optional[str] = None):
+        """Spatna vazba z odpovede: status, latencia (s) a hlavicka Retry-After"""
+        now = time.monotonic()
+        with self.lock:
+            bucket = self._bucket(url_host(url))
+            if status in THROTTLE_STATUSES:
+                blocked = parse_retry_after(retry_after)
+                if blocked:
+                    # Server povedal, kedy pokracovat - staci pockat, rychlost sa neznizuje
+                    bucket.refill(now)
+                    bucket.updated = max(bucket.updated, now + blocked)
+                    bucket.blocked_until = max(bucket.blocked_until, now + blocked)
+                    bucket.tokens = min(bucket.tokens, 0.0)
+                else:
+                    self._slow_down(bucket, now, self.decrease)
+                return
+
+            if latency is None or status is None or status >= 500:
+                return
+            if now < bucket.blocked_until + BLOCK_GRACE:
+                return
+            if bucket.baseline is not None:
+                latency = min(latency, bucket.baseline * LATENCY_CLIP)
+            bucket.latency = latency if bucket.latency is None else \
+                bucket.latency + LATENCY_ALPHA * (latency - bucket.latency)
+            bucket.samples += 1
+            if bucket.samples < LATENCY_WARMUP:
+                return
+            if bucket.baseline is None or bucket.latency < bucket.baseline:
+                bucket.baseline = bucket.latency
+            else:
+                # Zakladna latencia pomaly sleduje trvalu zmenu (inak by spomaloval donekonecna)
+                bucket.baseline += 0.01 * (bucket.latency - bucket.baseline)
+
+            if bucket.latency > bucket.baseline * self.latency_factor:
+                self._slow_down(bucket, now, 0.8)
+                return
+            bucket.refill(now)
+            if not bucket.rate:
+                return
+            if bucket.ceiling and bucket.rate < bucket.ceiling:
+                # Navrat po spomaleni - nasobne podla casu, nie poctu odpovedi (pri nizkej rychlosti ich je malo)
+                elapsed = now - max(bucket.last_decrease, bucket.last_increase)
+                rate = min(bucket.ceiling, bucket.rate * RECOVERY_PER_SECOND ** elapsed)
+            elif bucket.tokens < 1:
+                # Za sekundu pride ~rate odpovedi, kazda prida increase -> rast increase * rate za sekundu
+                rate = bucket.rate + self.increase
+            else:
+                return
+            bucket.last_increase = now
+            bucket.set_rate(min(rate, self.max_rate) if self.max_rate else rate, now)
+
+    def _slow_down(self, bucket: _HostBucket, now: float, factor: float):
+        if now - bucket.last_decrease < DECREASE_COOLDOWN:
+            return
+        bucket.last_decrease = now
+        # Od skutocnej rychlosti - limit nad nou (brzdia workery, nie limiter) by nic nezmenil
+        rates = [rate for rate in (bucket.rate, bucket.observed_rate(now)) if rate]
+        if not rates:
+            return
+        current = min(rates)
+        if bucket.ceiling is None or not bucket.rate or bucket.rate >= bucket.ceiling:
+            # Prve spomalenie po zdravom obdobi - navrat sa vrati na rychlost pred nim
+            bucket.ceiling = bucket.rate or current
+        else:
+            bucket.ceiling = max(current, bucket.ceiling * CEILING_DECAY)
+        bucket.set_rate(max(self.min_rate, current * factor), now)
+
+    def rates(self) -> Dict[str, Optional[float]]:
+        """Aktualna rychlost kazdeho hostu (req/s, None = bez limitu)"""
+        with self.lock:
+            return {host: bucket.rate for host, bucket in self.hosts.items()}
@@ -0,0 +1,377 @@
+"""
+run_all - spusti vsetky scrapery a B2B konvertory naraz
+Kazdy dodavatel bezi ako samostatny proces (svoj __main__), ale paralelne:
+  - globalny rozpocet spojeni: sucet max_workers/max_in_flight beziacich
+    zdrojov neprekroci --max-connections
+  - limit procesov na jeden host (--per-host)
+  - zdroje sa najdu automaticky: Python scrapery s CONFIG = ScraperConfig(...),
+    feed konvertory (FeedConverter) a scrapers/*.json; host a pocet spojeni
+    sa beru z ich konfiguracie, nazov z feeds/*.json
+  - zdroje vypnute vo feeds/*.json (enabled: false) sa preskocia
+  - najdlhsie zdroje (podla predosleho behu) startuju ako prve,
+    takze cely beh trva priblizne ako najpomalsi dodavatel
+
+Vysledok: reports/run_summary.json (stav, cas, pocet riadkov pre kazdy zdroj),
+scrapery zapisuju reports/metrics/<dodavatel>.json (casy faz, statusy, chyby)
+
+Pouzitie:
+    python run_all.py
+    python run_all.py --only Kytary PMC --max-connections 32
+    python run_all.py --list
+    python run_all.py --resume             # scrapery pokracuju v prerusenych behoch
+    python run_all.py --sku-index          # po behu aktualizuje sku_index.sqlite
+    python run_all.py --prometheus         # metriky scraperov aj v Prometheus formate (.prom)
+"""
+
+import os
+import ast
+import sys
+import json
+import glob
+import time
+import importlib
+import argparse
+import threading
+import subprocess
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import unquote, urlparse
+
+from base_scraper import ScraperConfig
+from checkpoint import RESUME_ENV
+from feed_converter import FeedConverter
+from scraper_metrics import PROMETHEUS_ENV
+from sku_index import SkuIndex
+from snapshot_store import SNAPSHOT_DIR_ENV
+from spec_scraper import SPECS_DIR, load_specs
+
+FEEDS_DIR = 'feeds'
+SUMMARY_FILE = os.path.join('reports', 'run_summary.json')
+
+
+@dataclass
+class Source:
+    """Jeden dodavatel: prikaz, vystupny CSV a kolko spojeni naraz otvara"""
+    name: str
+    command: List[str]
+    output_file: str
+    host: str
+    connections: int = 1           # max_workers / max_in_flight scrapera
+    timeout: int = 3 * 3600        # sekundy
+
+
+# Node.js skripty nemaju Python konfiguraciu - host a spojenia su len tu
+NODE_SOURCES = [
+    Source('Music Meyer (SOAP API)', ['node', 'music_meyer.js'], 'MM.csv', 'extra.musik-meyer.net'),
+    Source('Sound Service Labs', ['node', 'sound_service.js'], 'sound serivce.csv', 'soundservicelabs.com'),
+]
+
+
+def load_feeds(feeds_dir: str = FEEDS_DIR) -> Dict[str, Dict[str, Any]]:
+    """Nazov CSV suboru -> konfiguracia z feeds/*.json (csv_url konci nazvom vystupu)"""
+    feeds = {}
+    for path in glob.glob(os.path.join(feeds_dir, '*.json')):
+        with open(path, 'r', encoding='utf-8') as f:
+            feed = json.load(f)
+        if feed.get('csv_url'):
+            feeds[unquote(os.path.basename(urlparse(feed['csv_url']).path))] = feed
+    return feeds
+
+
+def _feed_name(feeds: Dict[str, Dict[str, Any]], output_file: str, default: str) -> str:
+    return feeds.get(output_file, {}).get('name', default)
+
+
+def find_python_sources(root: str = '.') -> List[Tuple[str, str]]:
+    """
+    (modul, druh) skriptov v root: 'scraper' ak definuje CONFIG = ScraperConfig(...),
+    'feed' ak ma triedu odvodenu od FeedConverter. Hlada sa v zdrojaku (ast), ostatne
+    skripty sa neimportuju - niektore pri importe rovno bezia.
+    """
+    found = []
+    for path in sorted(glob.glob(os.path.join(root, '*.py'))):
+        try:
+            with open(path, 'rb') as f:
+                tree = ast.parse(f.read(), path)
+        except (OSError, SyntaxError, ValueError):
+            continue
+        module = os.path.splitext(os.path.basename(path))[0]
+        for node in tree.body:
+            if isinstance(node, ast.Assign) and isinstance(node.value, ast.Call) \
+                    and getattr(node.value.func, 'id', None) == 'ScraperConfig' \
+                    and any(getattr(target, 'id', None) == 'CONFIG' for target in node.targets):
+                found.append((module, 'scraper'))
+                break
+            if isinstance(node, ast.ClassDef) and any(getattr(base, 'id', None) == 'FeedConverter'
+                                                      for base in node.bases):
+                found.append((module, 'feed'))
+                break
+    return found
+
+
+def scraper_source(name: str, command: List[str], config: ScraperConfig,
+                   feeds: Dict[str, Dict[str, Any]]) -> Source:
+    """Zdroj z konfiguracie scrapera - host zo sitemap_url, spojenia podla enginu"""
+    return Source(_feed_name(feeds, config.output_file, name), command, config.output_file,
+                  urlparse(config.sitemap_url).netloc, config.connections)
+
+
+def python_sources(feeds: Dict[str, Dict[str, Any]], root: str = '.') -> List[Source]:
+    """Python scrapery (CONFIG) a feed konvertory (FeedConverter) - jedno spojenie na feed"""
+    sources = []
+    for module_name, kind in find_python_sources(root):
+        command = [sys.executable, '-u', f"{module_name}.py"]
+        try:
+            module = importlib.import_module(module_name)
+            if kind == 'scraper':
+                sources.append(scraper_source(module_name, command, module.CONFIG, feeds))
+                continue
+            converter = next(cls for cls in vars(module).values()
+                             if isinstance(cls, type) and issubclass(cls, FeedConverter)
+                             and cls.__module__ == module.__name__)()
+            host = urlparse(getattr(converter.source, 'url', '')).netloc or module_name
+            sources.append(Source(_feed_name(feeds, converter.output_file, module_name), command,
+                                  converter.output_file, host))
+        except Exception as e:
+            # Zdroj sa spusti aj tak - chyba sa ukaze v jeho vystupe a v suhrne behu
+            print(f"::warning title=Zdroj bez konfiguracie::{module_name}: {e}")
+            sources.append(Source(module_name, command, f"{module_name}.csv", module_name))
+    return sources
+
+
+def spec_sources(feeds: Dict[str, Dict[str, Any]], specs_dir: str = SPECS_DIR) -> List[Source]:
+    """Zdroje zo scrapers/*.json (enabled) - novy spec sa spusti bez zmeny run_all.py"""
+    sources = []
+    for spec in load_specs(specs_dir):
+        config = ScraperConfig(spec['sitemap_url'], spec['output_file'], **spec.get('config', {}))
+        command = [sys.executable, '-u', 'spec_scraper.py', os.path.join(specs_dir, f"{spec['name']}.json")]
+        sources.append(scraper_source(spec['name'], command, config, feeds))
+    return sources
+
+
+def unique_sources(sources: List[Source]) -> List[Source]:
+    """Nazov identifikuje zdroj (--only, poradie podla trvania, suhrn) - dalsi zdroj s rovnakym nazvom sa vynecha"""
+    unique = {}
+    for source in sources:
+        if source.name in unique:
+            print(f"::warning title=Duplicitny zdroj::{source.name}: {' '.join(source.command)} sa vynecha "
+                  f"(uz je {' '.join(unique[source.name].command)})")
+            continue
+        unique[source.name] = source
+    return list(unique.values())
+
+
+def build_sources(feeds: Dict[str, Dict[str, Any]]) -> List[Source]:
+    """Vsetky zdroje: Node.js skripty, Python scrapery a konvertory, scrapers/*.json"""
+    return unique_sources(NODE_SOURCES + python_sources(feeds) + spec_sources(feeds))
+
+
+def load_previous_durations(summary_file: str = SUMMARY_FILE) -> Dict[str, float]:
+    """Trvanie zdrojov z posledneho behu (pre poradie spustania)"""
+    try:
+        with open(summary_file, 'r', encoding='utf-8') as f:
+            summary = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return {r['name']: r.get('seconds', 0) for r in summary.get('sources', [])}
+
+
+def select_sources(sources: List[Source], feeds: Dict[str, Dict[str, Any]],
+                   only: Optional[List[str]] = None) -> List[Source]:
+    """Zdroje na spustenie - vynecha vypnute vo feeds/*.json, pripadne len vybrane"""
+    selected = []
+    for source in sources:
+        if only:
+            if source.name.lower() not in {name.lower() for name in only}:
+                continue
+        elif not feeds.get(source.output_file, {}).get('enabled', True):
+            continue
+        selected.append(source)
+    return selected
+
+
+class ConnectionBudget:
+    """Globalny rozpocet spojeni + limit beziacich procesov na host"""
+
+    def __init__(self, max_connections: int, per_host: int):
+        self.max_connections = max_connections
+        self.per_host = per_host
+        self.free = max_connections
+        self.hosts = Counter()
+        self.condition = threading.Condition()
+
+    @contextmanager
+    def acquire(self, source: Source):
+        # Zdroj vacsi ako cely rozpocet dostane cely rozpocet (inak by nikdy nezacal)
+        need = min(source.connections, self.max_connections)
+        with self.condition:
+            self.condition.wait_for(
+                lambda: self.free >= need and self.hosts[source.host] < self.per_host
+            )
+            self.free -= need
+            self.hosts[source.host] += 1
+        try:
+            yield
+        finally:
+            with self.condition:
+                self.free += need
+                self.hosts[source.host] -= 1
+                self.condition.notify_all()
+
+
+def count_rows(path: str, since: float) -> Optional[int]:
+    """Pocet riadkov vystupu (bez hlavicky), None ak ho beh nezapisal"""
+    try:
+        if os.path.getmtime(path) < since:
+            return None
+        with open(path, 'rb') as f:
+            return max(sum(1 for _ in f) - 1, 0)
+    except OSError:
+        return None
+
+
+class Orchestrator:
+    def __init__(self, sources: List[Source], max_connections: int = 64, per_host: int = 1):
+        self.sources = sources
+        self.budget = ConnectionBudget(max_connections, per_host)
+        self.print_lock = threading.Lock()
+        self.results = []
+
+    def log(self, message: str):
+        with self.print_lock:
+            print(f"{datetime.now():%H:%M:%S} {message}", flush=True)
+
+    def run_source(self, source: Source) -> Dict:
+        with self.budget.acquire(source):
+            self.log(f"START {source.name} ({source.connections} spojeni)")
+            started = time.time()
+            env = {**os.environ, 'PYTHONUNBUFFERED': '1'}
+            try:
+                proc = subprocess.run(source.command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                      timeout=source.timeout, env=env)
+                status = 'ok' if proc.returncode == 0 else 'failed'
+                returncode = proc.returncode
+                output = proc.stdout
+            except subprocess.TimeoutExpired as e:
+                status, returncode, output = 'timeout', None, e.stdout or b''
+            except OSError as e:
+                status, returncode, output = 'failed', None, str(e).encode()
+            seconds = round(time.time() - started, 1)
+
+        result = {
+            'name': source.name,
+            'status': status,
+            'returncode': returncode,
+            'seconds': seconds,
+            'rows': count_rows(source.output_file, started),
+            'output_file': source.output_file,
+            'host': source.host,
+        }
+
+        # Vystup procesu vypiseme naraz, aby sa zdroje v logu nemiesali
+        with self.print_lock:
+            print(f"\n=== {source.name} ({status}, {seconds}s) ===")
+            text = output.decode('utf-8', errors='replace').rstrip()
+            if text:
+                print(text)
+            if status != 'ok':
+                print(f"::error title=Scraper failed::{source.name}")
+            sys.stdout.flush()
+        return result
+
+    def run(self) -> List[Dict]:
+        # Najdlhsie zdroje z predosleho behu startuju prve
+        durations = load_previous_durations()
+        order = sorted(self.sources, key=lambda s: durations.get(s.name, float('inf')), reverse=True)
+
+        # Vysledky podla id zdroja - nazov nemusi byt unikatny (zdroje mimo build_sources)
+        results = {}
+        threads = []
+        for source in order:
+            thread = threading.Thread(target=lambda s=source: results.__setitem__(id(s), self.run_source(s)),
+                                      name=source.name)
+            thread.start()
+            threads.append(thread)
+        for thread in threads:
+            thread.join()
+
+        self.results = [results[id(s)] for s in self.sources]
+        return self.results
+
+
+def write_summary(results: List[Dict], started: float, summary_file: str = SUMMARY_FILE):
+    os.makedirs(os.path.dirname(summary_file), exist_ok=True)
+    summary = {
+        'started_at': datetime.fromtimestamp(started).isoformat(timespec='seconds'),
+        'seconds': round(time.time() - started, 1),
+        'sum_of_sources_seconds': round(sum(r['seconds'] for r in results), 1),
+        'failed': [r['name'] for r in results if r['status'] != 'ok'],
+        'sources': results,
+    }
+    with open(summary_file, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Spusti vsetky scrapery a feed konvertory paralelne')
+    parser.add_argument('--only', nargs='+', help='Len vybrane zdroje (podla nazvu)')
+    parser.add_argument('--max-connections', type=int, default=64,
+                        help='Globalny rozpocet HTTP spojeni vsetkych zdrojov')
+    parser.add_argument('--per-host', type=int, default=1, help='Max. beziacich zdrojov na jeden host')
+    parser.add_argument('--summary', default=SUMMARY_FILE, help='Kam zapisat suhrn behu')
+    parser.add_argument('--snapshot-dir', help='Parquet snapshoty vsetkych zdrojov (vyzaduje pyarrow)')
+    parser.add_argument('--resume', action='store_true',
+                        help='Scrapery pokracuju v prerusenom behu podla zurnalu (.scraper_state)')
+    parser.add_argument('--sku-index', action='store_true',
+                        help='Po behu preindexuje zmenene feedy v sku_index.sqlite')
+    parser.add_argument('--prometheus', action='store_true',
+                        help='Scrapery zapisu metriky aj v Prometheus textovom formate (reports/metrics/*.prom)')
+    parser.add_argument('--list', action='store_true', help='Len vypise zdroje, ktore by sa spustili')
+    args = parser.parse_args()
+
+    feeds = load_feeds()
+    sources = select_sources(build_sources(feeds), feeds, args.only)
+    if args.list:
+        for source in sources:
+            print(f"{source.name:25} {source.host:25} {source.connections:3}  {' '.join(source.command)}")
+        return
+
+    if args.snapshot_dir:
+        # Zdedia vsetky procesy - ScraperConfig aj feed konvertory citaju SNAPSHOT_DIR
+        os.environ[SNAPSHOT_DIR_ENV] = os.path.abspath(args.snapshot_dir)
+
+    if args.resume:
+        os.environ[RESUME_ENV] = '1'
+
+    if args.prometheus:
+        os.environ[PROMETHEUS_ENV] = '1'
+
+    started = time.time()
+    orchestrator = Orchestrator(sources, args.max_connections, args.per_host)
+    results = orchestrator.run()
+    summary = write_summary(results, started, args.summary)
+
+    print("=" * 60)
+    for r in results:
+        rows = r['rows'] if r['rows'] is not None else '-'
+        print(f"{r['name']:25} {r['status']:8} {r['seconds']:8.1f}s {rows:>8}")
+    print(f"Celkovo {summary['seconds']}s (sucet zdrojov {summary['sum_of_sources_seconds']}s) -> {args.summary}")
+
+    if args.sku_index:
+        # Preindexuju sa len feedy, ktorych CSV sa zmenilo (mtime/velkost)
+        with SkuIndex() as index:
+            updated = index.update_all()
+        print(f"SKU index: preindexovane {', '.join(updated) or 'nic'} -> {index.path}")
+
+    if summary['failed']:
+        print(f"FAILED SCRAPERS: {' '.join(summary['failed'])}")
+        sys.exit(1)
+    print("All scrapers succeeded.")
+
+
+if __name__ == "__main__":
+    main()
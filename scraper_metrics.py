@@ -0,0 +1,347 @@
+"""
+ScraperMetrics - meranie behu scrapera po fazach spracovania URL
+Pre kazdu URL sa meraju fazy (histogram s pevnymi hranicami ako v Prometheus):
+  throttle  cakanie na rate limiter / pevny delay
+  dns       preklad mena (len async engine; je zaroven sucastou connect)
+  connect   nove spojenie vratane DNS a TLS (keep-alive requesty ho nemaju)
+  ttfb      od odoslania requestu po hlavicky odpovede (vratane noveho spojenia;
+            thread engine aj vratane retry, ktore robi urllib3)
+  download  citanie tela odpovede
+  parse     vytvorenie dokumentu + parse_product
+  total     cela URL od zaciatku po hotovy riadok (vratane cakania a retry)
+Dalej pocitadla HTTP statusov, retry, prenesenych bajtov, predcasne ukoncenych
+citani stranok (stream_markers / max_page_bytes) a chyb podla dovodu
+(http_404, request:ReadTimeout, parse:AttributeError, no_product, no_sku).
+
+Vysledok: reports/metrics/<dodavatel>.json, volitelne aj <dodavatel>.prom
+(Prometheus textovy format, napr. pre node_exporter textfile collector) -
+ScraperConfig(metrics_prometheus=True) alebo METRICS_PROMETHEUS=1 (run_all.py --prometheus).
+
+Pouzitie:
+    metrics = ScraperMetrics('Scraper3DMX', '3dmx')
+    metrics.observe('parse', 0.012)
+    metrics.count_status(200)
+    metrics.count_failure('no_sku')
+    metrics.finish(urls=1200, products=1150)
+    metrics.write_json('reports/metrics/3dmx.json')
+    metrics.write_prometheus('reports/metrics/3dmx.prom')
+"""
+
+import os
+import json
+import time
+import threading
+from bisect import bisect_left
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+try:
+    import aiohttp
+except ImportError:  # volitelne - potrebne len pre engine='async'
+    aiohttp = None
+
+METRICS_DIR = os.path.join('reports', 'metrics')
+PROMETHEUS_ENV = 'METRICS_PROMETHEUS'
+
+STAGES = ('throttle', 'dns', 'connect', 'ttfb', 'download', 'parse', 'total')
+
+# Hranice histogramov v sekundach (posledny bucket +Inf)
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def default_prometheus() -> bool:
+    """Zapisovat aj .prom subor? (METRICS_PROMETHEUS=1, napr. z run_all.py --prometheus)"""
+    return os.environ.get(PROMETHEUS_ENV, '').lower() in ('1', 'true', 'yes')
+
+
+class Histogram:
+    """Histogram s pevnymi hranicami - pamat nezavisi od poctu vzoriek; volat pod zamkom"""
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Odhad kvantilu linearnou interpolaciou v buckete (ako histogram_quantile v Prometheus)"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                lower = self.buckets[i - 1] if i else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else self.max
+                value = lower + (upper - lower) * (rank - seen) / count
+                return min(value, self.max)
+            seen += count
+        return self.max
+
+    def summary(self) -> Dict[str, Any]:
+        cumulative = 0
+        buckets = {}
+        for bound, count in zip([*map(str, self.buckets), '+Inf'], self.counts):
+            cumulative += count
+            buckets[bound] = cumulative
+        return {
+            'count': self.count,
+            'sum': round(self.sum, 3),
+            'mean': round(self.sum / self.count, 4) if self.count else None,
+            'p50': _rounded(self.quantile(0.5)),
+            'p90': _rounded(self.quantile(0.9)),
+            'p99': _rounded(self.quantile(0.99)),
+            'max': round(self.max, 4),
+            'buckets': buckets,
+        }
+
+
+def _rounded(value: Optional[float]) -> Optional[float]:
+    return round(value, 4) if value is not None else None
+
+
+class ScraperMetrics:
+    """Thread-safe metriky jedneho behu scrapera"""
+
+    def __init__(self, scraper: str, supplier: str, engine: Optional[str] = None):
+        self.scraper = scraper
+        self.supplier = supplier
+        self.engine = engine
+        self.started = time.time()
+        self.finished: Optional[float] = None
+        self.stages = {stage: Histogram() for stage in STAGES}
+        self.statuses = Counter()
+        self.failures = Counter()
+        self.retries = 0
+        self.bytes = 0
+        self.partial_reads = 0
+        self.urls = 0
+        self.products = 0
+        self.extra: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        # Scraper sa posiela do parsovacich procesov (pipeline engine) - tie vracaju casy vysledkom
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def observe(self, stage: str, seconds: float):
+        with self._lock:
+            self.stages[stage].observe(max(seconds, 0.0))
+
+    def count_status(self, status: Optional[int]):
+        if status is None:
+            return
+        with self._lock:
+            self.statuses[status] += 1
+
+    def count_retry(self, count: int = 1):
+        with self._lock:
+            self.retries += count
+
+    def add_bytes(self, count: int):
+        with self._lock:
+            self.bytes += count
+
+    def count_partial(self):
+        """Telo stranky sa necitalo cele (najdene znacky / limit bajtov)"""
+        with self._lock:
+            self.partial_reads += 1
+
+    def count_failure(self, reason: str):
+        with self._lock:
+            self.failures[reason] += 1
+
+    def observe_response(self, response, seconds: float, nbytes: Optional[int] = None):
+        """
+        Odpoved requests: ttfb z response.elapsed, zvysok do download, statusy
+        a retry z historie urllib3 (Retry.history), bajty tela (nbytes pri
+        streamovanom citani, inak cele response.content).
+        """
+        ttfb = response.elapsed.total_seconds()
+        retries = getattr(response.raw, 'retries', None)
+        history = retries.history if retries is not None else ()
+        with self._lock:
+            self.stages['ttfb'].observe(ttfb)
+            self.stages['download'].observe(max(seconds - ttfb, 0.0))
+            for entry in history:
+                if entry.status is not None:
+                    self.statuses[entry.status] += 1
+            self.retries += len(history)
+            self.statuses[response.status_code] += 1
+            self.bytes += len(response.content) if nbytes is None else nbytes
+
+    def finish(self, urls: int, products: int, **extra):
+        """Koniec behu - pocty URL a produktov (+ lubovolne dalsie polia reportu)"""
+        self.finished = time.time()
+        self.urls = urls
+        self.products = products
+        self.extra.update(extra)
+
+    def report(self) -> Dict[str, Any]:
+        finished = self.finished or time.time()
+        with self._lock:
+            return {
+                'scraper': self.scraper,
+                'supplier': self.supplier,
+                'engine': self.engine,
+                'started_at': datetime.fromtimestamp(self.started).isoformat(timespec='seconds'),
+                'seconds': round(finished - self.started, 1),
+                'urls': self.urls,
+                'products': self.products,
+                'bytes': self.bytes,
+                'partial_reads': self.partial_reads,
+                'retries': self.retries,
+                'statuses': {str(status): count for status, count in sorted(self.statuses.items())},
+                'failures': dict(self.failures.most_common()),
+                'stages': {stage: hist.summary() for stage, hist in self.stages.items() if hist.count},
+                **self.extra,
+            }
+
+    def describe(self) -> str:
+        """Kratky suhrn do logu: p50/p90 hlavnych faz a najcastejsie chyby"""
+        with self._lock:
+            parts = []
+            for stage in ('ttfb', 'download', 'parse', 'total'):
+                hist = self.stages[stage]
+                if hist.count:
+                    parts.append(f"{stage} p50 {hist.quantile(0.5):.3f}s p90 {hist.quantile(0.9):.3f}s")
+            failures = ', '.join(f"{reason}={count}" for reason, count in self.failures.most_common(5))
+        text = ' | '.join(parts) or 'bez requestov'
+        return f"{text} | chyby: {failures}" if failures else text
+
+    def write_json(self, path: str) -> str:
+        _write_atomic(path, json.dumps(self.report(), ensure_ascii=False, indent=2))
+        return path
+
+    def prometheus_text(self) -> str:
+        """Metriky v Prometheus textovom formate (exposition format 0.0.4)"""
+        report = self.report()
+        labels = f'supplier="{_escape_label(self.supplier)}"'
+        lines: List[str] = []
+
+        def metric(name: str, kind: str, help_text: str, samples: List[str]):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.extend(samples)
+
+        samples = []
+        with self._lock:
+            for stage, hist in self.stages.items():
+                if not hist.count:
+                    continue
+                stage_labels = f'{labels},stage="{stage}"'
+                cumulative = 0
+                for bound, count in zip([*map(str, hist.buckets), '+Inf'], hist.counts):
+                    cumulative += count
+                    samples.append(f'scraper_stage_seconds_bucket{{{stage_labels},le="{bound}"}} {cumulative}')
+                samples.append(f'scraper_stage_seconds_sum{{{stage_labels}}} {hist.sum:.6f}')
+                samples.append(f'scraper_stage_seconds_count{{{stage_labels}}} {hist.count}')
+        metric('scraper_stage_seconds', 'histogram', 'Trvanie faz spracovania URL', samples)
+
+        metric('scraper_responses_total', 'counter', 'HTTP odpovede podla statusu',
+               [f'scraper_responses_total{{{labels},status="{status}"}} {count}'
+                for status, count in report['statuses'].items()])
+        metric('scraper_failures_total', 'counter', 'URL bez produktu podla dovodu',
+               [f'scraper_failures_total{{{labels},reason="{_escape_label(reason)}"}} {count}'
+                for reason, count in report['failures'].items()])
+        metric('scraper_retries_total', 'counter', 'Opakovane requesty',
+               [f'scraper_retries_total{{{labels}}} {report["retries"]}'])
+        metric('scraper_bytes_total', 'counter', 'Stiahnute bajty tiel odpovedi',
+               [f'scraper_bytes_total{{{labels}}} {report["bytes"]}'])
+        metric('scraper_partial_reads_total', 'counter', 'Stranky citane len po znacky / limit bajtov',
+               [f'scraper_partial_reads_total{{{labels}}} {report["partial_reads"]}'])
+        metric('scraper_urls_total', 'counter', 'Spracovane URL',
+               [f'scraper_urls_total{{{labels}}} {report["urls"]}'])
+        metric('scraper_products_total', 'counter', 'Zapisane produkty',
+               [f'scraper_products_total{{{labels}}} {report["products"]}'])
+        metric('scraper_run_seconds', 'gauge', 'Trvanie behu',
+               [f'scraper_run_seconds{{{labels}}} {report["seconds"]}'])
+        metric('scraper_last_run_timestamp_seconds', 'gauge', 'Koniec posledneho behu (unix cas)',
+               [f'scraper_last_run_timestamp_seconds{{{labels}}} {int(self.finished or time.time())}'])
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path: str) -> str:
+        _write_atomic(path, self.prometheus_text())
+        return path
+
+    def trace_config(self) -> 'aiohttp.TraceConfig':
+        """aiohttp TraceConfig pre async engine - meria DNS a nove spojenia"""
+        trace = aiohttp.TraceConfig()
+
+        async def dns_start(session, context, params):
+            context.dns_started = time.perf_counter()
+
+        async def dns_end(session, context, params):
+            self.observe('dns', time.perf_counter() - context.dns_started)
+
+        async def connect_start(session, context, params):
+            context.connect_started = time.perf_counter()
+
+        async def connect_end(session, context, params):
+            self.observe('connect', time.perf_counter() - context.connect_started)
+
+        trace.on_dns_resolvehost_start.append(dns_start)
+        trace.on_dns_resolvehost_end.append(dns_end)
+        trace.on_connection_create_start.append(connect_start)
+        trace.on_connection_create_end.append(connect_end)
+        return trace
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """
+    HTTPAdapter, ktory meria nadviazanie novych spojeni (DNS + TCP + TLS) do fazy connect.
+    urllib3 nema hook na connect, preto pooly dostanu podtriedu spojenia.
+    """
+
+    def __init__(self, metrics: ScraperMetrics, **kwargs):
+        self.metrics = metrics
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _timed_pool(HTTPConnectionPool, self.metrics),
+            'https': _timed_pool(HTTPSConnectionPool, self.metrics),
+        }
+
+
+def _timed_pool(pool_class, metrics: ScraperMetrics):
+    class TimedConnection(pool_class.ConnectionCls):
+        def connect(self):
+            started = time.perf_counter()
+            super().connect()
+            metrics.observe('connect', time.perf_counter() - started)
+
+    return type(pool_class.__name__, (pool_class,), {'ConnectionCls': TimedConnection})
+
+
+def _escape_label(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _write_atomic(path: str, text: str):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp, path)
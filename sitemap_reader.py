@@ -0,0 +1,209 @@
+"""
+SitemapReader - streamovane citanie sitemap
+Parsuje XML postupne (iterparse) priamo zo streamu odpovede, gzip rozbaluje
+za behu a deti <sitemapindex> stahuje paralelne. URL sa vracaju hned ako su
+precitane, pamat nerastie s velkostou sitemap.
+"""
+
+import io
+import os
+import gzip
+import queue
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterator, Optional, Tuple
+
+import requests
+from lxml import etree
+
+from http_cache import HttpCache
+
+
+SITEMAP_TAGS = ('{*}url', '{*}sitemap')
+META_TAGS = ('lastmod', 'changefreq', 'priority')
+
+_DONE = object()
+
+
+def _local_name(tag) -> Optional[str]:
+    # Komentare a processing instructions maju tag ako funkciu
+    return tag.rsplit('}', 1)[-1] if isinstance(tag, str) else None
+
+
+def open_maybe_gzip(stream) -> io.BufferedIOBase:
+    """Obali stream - ak zacina gzip hlavickou, rozbaluje ho postupne pri citani"""
+    buffered = stream if hasattr(stream, 'peek') else io.BufferedReader(stream)
+    if buffered.peek(2)[:2] == b'\x1f\x8b':
+        return gzip.GzipFile(fileobj=buffered)
+    return buffered
+
+
+def iter_sitemap_xml(stream) -> Iterator[Tuple[str, str, Dict[str, str]]]:
+    """
+    Streamovo parsuje sitemap (urlset aj sitemapindex).
+
+    Vracia (typ, loc, meta) kde typ je 'url' alebo 'sitemap'
+    a meta obsahuje lastmod/changefreq/priority ak su v sitemap.
+    """
+    events = etree.iterparse(open_maybe_gzip(stream), events=('end',), tag=SITEMAP_TAGS,
+                             resolve_entities=False, huge_tree=True)
+    for _, elem in events:
+        loc = None
+        meta = {}
+        for child in elem:
+            name = _local_name(child.tag)
+            text = (child.text or '').strip()
+            if name == 'loc':
+                loc = text
+            elif name in META_TAGS and text:
+                meta[name] = text
+
+        if loc:
+            yield _local_name(elem.tag), loc, meta
+
+        # Uvolni spracovane elementy, aby strom nerastol
+        elem.clear()
+        while elem.getprevious() is not None:
+            del elem.getparent()[0]
+
+
+class _TeeReader(io.RawIOBase):
+    """Raw stream, ktory vsetko precitane zaroven zapisuje do suboru (telo pre HttpCache)"""
+
+    def __init__(self, raw, sink):
+        self.raw = raw
+        self.sink = sink
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        data = self.raw.read(len(buffer))
+        if not data:
+            return 0
+        self.sink.write(data)
+        buffer[:len(data)] = data
+        return len(data)
+
+
+class SitemapReader:
+    """
+    Stiahne sitemap a vsetky vnorene sitemapy z <sitemapindex>.
+
+    Pouzitie:
+        reader = SitemapReader(session_factory, cache=cache, logger=logger)
+        for url, meta in reader.iter_entries('https://example.com/sitemap.xml'):
+            ...
+    """
+
+    def __init__(self, session_factory: Callable[[], requests.Session], timeout: int = 30,
+                 max_workers: int = 4, cache: Optional[HttpCache] = None,
+                 logger: Optional[logging.Logger] = None, queue_size: int = 10000):
+        self.session_factory = session_factory
+        self.timeout = timeout
+        self.max_workers = max_workers
+        self.cache = cache
+        self.logger = logger or logging.getLogger(self.__class__.__name__)
+        self.queue_size = queue_size
+        self._local = threading.local()
+        self._sessions = []
+        self._sessions_lock = threading.Lock()
+
+    def _session(self) -> requests.Session:
+        """Session pre aktualne vlakno"""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self.session_factory()
+            self._local.session = session
+            with self._sessions_lock:
+                self._sessions.append(session)
+        return session
+
+    def _iter_document(self, url: str) -> Iterator[Tuple[str, str, Dict[str, str]]]:
+        """Stiahne jednu sitemap (s podmienenym GET) a streamovo ju parsuje"""
+        headers = self.cache.conditional_headers(url, need_body=True) if self.cache else {}
+
+        response = self._session().get(url, timeout=self.timeout, headers=headers, stream=True)
+        try:
+            if response.status_code == 304:
+                self.logger.info(f"Sitemap sa nezmenila (304), pouzivam cache: {url}")
+                with open(self.cache.get_body_path(url), 'rb') as f:
+                    yield from iter_sitemap_xml(f)
+                return
+
+            response.raise_for_status()
+            response.raw.decode_content = True
+            # urllib3 inak zavrie raw po precitani celeho tela a buffer nad nim
+            # (peek pri malych sitemap) potom hlasi "read of closed file"
+            response.raw.auto_close = False
+
+            if not self.cache:
+                yield from iter_sitemap_xml(response.raw)
+                return
+
+            tmp_path = self.cache.temp_body_path(url)
+            try:
+                with open(tmp_path, 'wb') as sink:
+                    yield from iter_sitemap_xml(_TeeReader(response.raw, sink))
+            except BaseException:
+                os.remove(tmp_path)
+                raise
+            self.cache.store(url, response.headers, body_file=tmp_path)
+        finally:
+            response.close()
+
+    def iter_entries(self, sitemap_url: str) -> Iterator[Tuple[str, Dict[str, str]]]:
+        """Vracia (url, meta) pre kazdy produkt; deti sitemapindex sa stahuju paralelne"""
+        out = queue.Queue(maxsize=self.queue_size)
+        closed = threading.Event()
+        pending = 0
+        lock = threading.Lock()
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+
+        def put(item):
+            # Blokuje pri plnej fronte (backpressure), kym konzument nezavrie generator
+            while not closed.is_set():
+                try:
+                    out.put(item, timeout=0.5)
+                    return
+                except queue.Full:
+                    continue
+
+        def submit(url):
+            nonlocal pending
+            with lock:
+                pending += 1
+            executor.submit(process, url)
+
+        def process(url):
+            nonlocal pending
+            try:
+                for kind, loc, meta in self._iter_document(url):
+                    if closed.is_set():
+                        break
+                    if kind == 'sitemap':
+                        submit(loc)
+                    else:
+                        put((loc, meta))
+            except (requests.RequestException, etree.XMLSyntaxError, OSError) as e:
+                self.logger.error(f"Chyba pri stahovani sitemap {url}: {e}")
+            finally:
+                with lock:
+                    pending -= 1
+                    done = pending == 0
+                if done:
+                    put(_DONE)
+
+        submit(sitemap_url)
+        try:
+            while True:
+                item = out.get()
+                if item is _DONE:
+                    break
+                yield item
+        finally:
+            closed.set()
+            executor.shutdown(wait=True, cancel_futures=True)
+            for session in self._sessions:
+                session.close()
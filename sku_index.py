@@ -0,0 +1,293 @@
+"""
+SkuIndex - perzistentny index SKU/EAN napriec vsetkymi feedmi
+Z kazdeho feedu vo feeds/*.json (lokalny CSV, na ktory ukazuje csv_url) postavi
+SQLite index: normalizovane SKU aj EAN -> (dodavatel, offset riadku, pocet, cena).
+Tabulka je WITHOUT ROWID s klucom na prvom mieste, takze lookup je jeden
+prechod B-stromom (mikrosekundy aj pri 100k+ riadkoch). Pri zmene jedneho
+feedu sa preindexuje len ten (podla mtime/velkosti suboru).
+
+Pouzitie:
+    python sku_index.py build                 # preindexuje zmenene feedy
+    python sku_index.py lookup PT32-BBK       # SKU alebo EAN
+
+    index = SkuIndex()
+    index.update_all()
+    for match in index.lookup('pt32 bbk'):
+        print(match.supplier, match.qty, index.read_row(match))
+"""
+
+import os
+import re
+import io
+import csv
+import sys
+import json
+import glob
+import sqlite3
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import unquote, urlparse
+
+from snapshot_store import to_price, to_qty
+
+FEEDS_DIR = 'feeds'
+INDEX_FILE = 'sku_index.sqlite'
+
+_NON_ALNUM_RE = re.compile(r'[^0-9A-Z]')
+_NON_DIGIT_RE = re.compile(r'\D')
+_POSITIONAL_RE = re.compile(r'^_\d+$')
+_EAN_RE = re.compile(r'^[\d\s-]+$')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS feeds (
+    supplier   TEXT PRIMARY KEY,
+    file       TEXT NOT NULL,
+    mtime      REAL NOT NULL,
+    size       INTEGER NOT NULL,
+    rows       INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS items (
+    key        TEXT NOT NULL,      -- normalizovane SKU alebo EAN
+    kind       TEXT NOT NULL,      -- 'sku' / 'ean'
+    supplier   TEXT NOT NULL,
+    row_offset INTEGER NOT NULL,   -- bajtovy offset riadku v CSV (read_row)
+    qty        INTEGER,
+    price      REAL,
+    PRIMARY KEY (key, supplier, row_offset, kind)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS items_supplier ON items (supplier);
+"""
+
+
+def normalize_sku(value: Any) -> str:
+    """'pt32-bbk ' / 'PT32 BBK' / 'PT32.BBK' -> 'PT32BBK' (rozne feedy, rozne formatovanie)"""
+    return _NON_ALNUM_RE.sub('', str(value or '').upper())
+
+
+def normalize_ean(value: Any) -> str:
+    """Len cislice bez uvodnych nul (EAN-13 aj GTIN-14 s nulou na zaciatku su to iste)"""
+    text = str(value or '').strip()
+    # Excel/pandas obcas zapise EAN ako float ('8402480069.0')
+    if text.endswith('.0'):
+        text = text[:-2]
+    # 'PT32-BBK' nie je EAN (inak by z neho ostalo '32')
+    if not _EAN_RE.match(text):
+        return ''
+    return _NON_DIGIT_RE.sub('', text).lstrip('0')
+
+
+@dataclass(frozen=True)
+class Match:
+    """Vysledok lookupu - jeden riadok niektoreho feedu"""
+    supplier: str
+    kind: str
+    row_offset: int
+    qty: Optional[int]
+    price: Optional[float]
+
+
+@dataclass
+class Feed:
+    """Feed z feeds/*.json premapovany na lokalny subor a stlpce"""
+    supplier: str
+    file: str
+    delimiter: str
+    sku_column: str
+    qty_column: Optional[str]
+    price_column: Optional[str]
+    ean_column: Optional[str]
+
+
+def load_feeds(feeds_dir: str = FEEDS_DIR, base_dir: str = '.') -> List[Feed]:
+    """Feedy z feeds/*.json, ktore maju lokalny CSV subor"""
+    feeds = []
+    for path in sorted(glob.glob(os.path.join(feeds_dir, '*.json'))):
+        with open(path, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+        if not config.get('csv_url') or not config.get('columns', {}).get('sku'):
+            continue
+        filename = unquote(os.path.basename(urlparse(config['csv_url']).path))
+        columns = config['columns']
+        feeds.append(Feed(
+            supplier=config.get('name') or os.path.splitext(os.path.basename(path))[0],
+            file=os.path.join(base_dir, filename),
+            delimiter=config.get('delimiter', ';'),
+            sku_column=columns['sku'],
+            qty_column=columns.get('quantity'),
+            price_column=columns.get('price'),
+            ean_column=columns.get('ean'),
+        ))
+    return feeds
+
+
+def iter_csv_rows(path: str, delimiter: str) -> Iterator[Tuple[int, List[str]]]:
+    """
+    (bajtovy offset zaciatku zaznamu, bunky) pre kazdy zaznam CSV vratane hlavicky.
+    Offset sedi aj pre zaznamy cez viac riadkov (text v uvodzovkach).
+    """
+    line_starts = []
+
+    def lines(f):
+        offset = 0
+        for raw in f:
+            line_starts.append(offset)
+            text = raw.decode('utf-8', errors='replace')
+            if offset == 0 and text.startswith('\ufeff'):
+                text = text[1:]
+            offset += len(raw)
+            yield text
+
+    with open(path, 'rb') as f:
+        for cells in csv.reader(lines(f), delimiter=delimiter):
+            # Zaznam zacina prvym riadkom, ktory reader precital od predosleho zaznamu
+            yield line_starts[0], cells
+            line_starts.clear()
+
+
+class SkuIndex:
+    """SQLite index SKU/EAN -> riadky feedov, aktualizovany po feedoch"""
+
+    def __init__(self, path: str = INDEX_FILE, feeds_dir: str = FEEDS_DIR, base_dir: str = '.'):
+        self.path = path
+        self.feeds = {feed.supplier: feed for feed in load_feeds(feeds_dir, base_dir)}
+        self.db = sqlite3.connect(path)
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def _is_current(self, feed: Feed, stat: os.stat_result) -> bool:
+        row = self.db.execute('SELECT file, mtime, size FROM feeds WHERE supplier = ?',
+                              (feed.supplier,)).fetchone()
+        return row is not None and row == (feed.file, stat.st_mtime, stat.st_size)
+
+    def update(self, feed: Feed, force: bool = False) -> Optional[int]:
+        """Preindexuje jeden feed ak sa jeho subor zmenil; vrati pocet riadkov (None = bez zmeny)"""
+        try:
+            stat = os.stat(feed.file)
+        except OSError:
+            return None
+        if not force and self._is_current(feed, stat):
+            return None
+
+        rows = iter_csv_rows(feed.file, feed.delimiter)
+        header = next(rows, (0, []))[1]
+        position = {name.strip(): i for i, name in enumerate(header)}
+        ean_column = feed.ean_column or next((name for name in position if name.upper() == 'EAN'), None)
+
+        def column(name):
+            if not name:
+                return None
+            if name in position:
+                return position[name]
+            # '_3' = stlpec podla poradia (feedy bez pouzitelnej hlavicky, napr. Sonor)
+            return int(name[1:]) if _POSITIONAL_RE.match(name) else None
+
+        sku_i, qty_i, price_i, ean_i = (column(feed.sku_column), column(feed.qty_column),
+                                        column(feed.price_column), column(ean_column))
+        if sku_i is None:
+            rows.close()
+            print(f"VAROVANIE: {feed.supplier}: stlpec '{feed.sku_column}' nie je v {feed.file}, preskakujem")
+            return None
+
+        def cell(cells, i):
+            return cells[i] if i is not None and i < len(cells) else None
+
+        def items():
+            for offset, cells in rows:
+                qty = to_qty(cell(cells, qty_i))
+                price = to_price(cell(cells, price_i))
+                sku = normalize_sku(cell(cells, sku_i))
+                if sku:
+                    yield sku, 'sku', feed.supplier, offset, qty, price
+                ean = normalize_ean(cell(cells, ean_i))
+                if ean:
+                    yield ean, 'ean', feed.supplier, offset, qty, price
+
+        with self.db:
+            self.db.execute('DELETE FROM items WHERE supplier = ?', (feed.supplier,))
+            self.db.executemany('INSERT OR IGNORE INTO items VALUES (?, ?, ?, ?, ?, ?)', items())
+            count = self.db.execute('SELECT COUNT(*) FROM items WHERE supplier = ?',
+                                    (feed.supplier,)).fetchone()[0]
+            self.db.execute('INSERT OR REPLACE INTO feeds VALUES (?, ?, ?, ?, ?)',
+                            (feed.supplier, feed.file, stat.st_mtime, stat.st_size, count))
+        return count
+
+    def update_all(self, force: bool = False) -> Dict[str, int]:
+        """Preindexuje zmenene feedy a odstrani tie, ktore uz vo feeds/*.json nie su"""
+        updated = {}
+        for supplier, feed in self.feeds.items():
+            count = self.update(feed, force)
+            if count is not None:
+                updated[supplier] = count
+
+        known = [row[0] for row in self.db.execute('SELECT supplier FROM feeds')]
+        with self.db:
+            for supplier in known:
+                if supplier not in self.feeds:
+                    self.db.execute('DELETE FROM items WHERE supplier = ?', (supplier,))
+                    self.db.execute('DELETE FROM feeds WHERE supplier = ?', (supplier,))
+        return updated
+
+    def update_file(self, path: str) -> Optional[int]:
+        """Preindexuje feed podla cesty k CSV (napr. hned po dobehnuti scrapera)"""
+        for feed in self.feeds.values():
+            if os.path.abspath(feed.file) == os.path.abspath(path):
+                return self.update(feed)
+        return None
+
+    def lookup(self, code: str, supplier: Optional[str] = None) -> List[Match]:
+        """Vsetky riadky, kde SKU alebo EAN zodpoveda kodu (po normalizacii)"""
+        keys = {normalize_sku(code), normalize_ean(code)} - {''}
+        if not keys:
+            return []
+        query = (f"SELECT supplier, kind, row_offset, qty, price FROM items "
+                 f"WHERE key IN ({', '.join('?' * len(keys))})")
+        params = list(keys)
+        if supplier:
+            query += ' AND supplier = ?'
+            params.append(supplier)
+        # Ciselne SKU moze byt zaroven EAN - jeden riadok feedu vratime len raz
+        matches = {}
+        for row in self.db.execute(query + ' ORDER BY kind DESC', params):
+            match = Match(*row)
+            matches.setdefault((match.supplier, match.row_offset), match)
+        return list(matches.values())
+
+    def read_row(self, match: Match) -> Dict[str, str]:
+        """Cely riadok feedu pre vysledok lookupu (seek na ulozeny offset)"""
+        feed = self.feeds[match.supplier]
+        rows = iter_csv_rows(feed.file, feed.delimiter)
+        header = next(rows)[1]
+        rows.close()
+        with open(feed.file, 'rb') as f:
+            f.seek(match.row_offset)
+            text = io.TextIOWrapper(f, encoding='utf-8', errors='replace', newline='')
+            cells = next(csv.reader(text, delimiter=feed.delimiter))
+        return dict(zip(header, cells))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] not in ('build', 'lookup'):
+        print("Pouzitie: python sku_index.py build [--force] | lookup <SKU/EAN> [...]")
+        sys.exit(1)
+
+    with SkuIndex() as index:
+        if sys.argv[1] == 'build':
+            updated = index.update_all(force='--force' in sys.argv)
+            for supplier, count in updated.items():
+                print(f"{supplier:20} {count:8} klucov")
+            print(f"Preindexovanych feedov: {len(updated)} -> {index.path}")
+        else:
+            for code in sys.argv[2:]:
+                matches = index.lookup(code)
+                print(f"{code}: {len(matches)} zhod")
+                for match in matches:
+                    print(f"  {match.supplier:20} {match.kind:4} qty={match.qty} price={match.price}")
@@ -0,0 +1,163 @@
+"""
+SnapshotDelta - rozdiel noveho vystupu oproti predoslemu snapshotu
+Pred prepisanim *_sklad.csv sa z neho postavi hash index SKU -> (pocet, cena),
+nove riadky sa porovnavaju pri zapise (O(1) na riadok, O(n) celkovo) a vysledok
+sa zapise do kompaktneho <vystup>_delta.csv:
+
+    SKU;Change;OldQty;NewQty;OldPrice;NewPrice
+    A-1;added;;5;;19.9
+    B-2;qty;3;0;;
+    C-3;price;;;10.5;11
+    D-4;removed;2;;7;
+
+Change je added / removed / qty / price / qty+price. Import obchodu tak moze
+aplikovat par stoviek zmien namiesto celeho feedu.
+
+Pouzitie:
+    delta = SnapshotDelta('kytary_sklad.csv', key='ProductCode', qty='AvailableVolume',
+                          price='RetailPriceWithVAT')   # pred prepisanim suboru
+    for row in rows:
+        delta.add(row)
+    ... zapis kytary_sklad.csv ...
+    delta.write()
+"""
+
+import os
+import csv
+import math
+from typing import Any, Dict, Iterable, Optional, Sequence, Tuple, Union
+
+DELTA_COLUMNS = ['SKU', 'Change', 'OldQty', 'NewQty', 'OldPrice', 'NewPrice']
+
+
+def delta_path(output_file: str) -> str:
+    """kytary_sklad.csv -> kytary_sklad_delta.csv"""
+    base, ext = os.path.splitext(output_file)
+    return f"{base}_delta{ext or '.csv'}"
+
+
+def normalize_value(value: Any) -> str:
+    """
+    Hodnota na porovnanie nezavisle od toho, kto subor zapisal
+    (csv modul vs pandas: 5 / '5' / '5.0' / NaN / None).
+    """
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return ''
+    text = str(value).strip()
+    try:
+        number = float(text)
+    except ValueError:
+        return text
+    if math.isnan(number):
+        return ''
+    return str(int(number)) if number.is_integer() else repr(number)
+
+
+class SnapshotDelta:
+    """Hash index predosleho snapshotu a zber zmien pocas zapisu noveho"""
+
+    def __init__(self, snapshot_file: str, key: Union[str, Sequence[str]], qty: str,
+                 price: Optional[str] = None, delimiter: str = ';',
+                 delta_file: Optional[str] = None):
+        # Viac klucovych stlpcov = prvy neprazdny (napr. Code, potom EAN)
+        self.keys = (key,) if isinstance(key, str) else tuple(key)
+        self.qty = qty
+        self.price = price
+        self.delimiter = delimiter
+        self.delta_file = delta_file or delta_path(snapshot_file)
+
+        self.previous = self._load_index(snapshot_file)
+        self.seen = set()
+        self.changes = []
+
+    def _row_key(self, row: Dict[str, Any]) -> str:
+        for column in self.keys:
+            value = normalize_value(row.get(column))
+            if value:
+                return value
+        return ''
+
+    def _row_values(self, row: Dict[str, Any]) -> Tuple[str, str]:
+        price = normalize_value(row.get(self.price)) if self.price else ''
+        return normalize_value(row.get(self.qty)), price
+
+    def _load_index(self, snapshot_file: str) -> Dict[str, Tuple[str, str]]:
+        """SKU -> (pocet, cena) z existujuceho vystupu (prazdny ak este neexistuje)"""
+        index = {}
+        try:
+            # utf-8-sig zvladne vystupy s BOM (pandas) aj bez neho (csv modul)
+            with open(snapshot_file, 'r', encoding='utf-8-sig', newline='') as f:
+                for row in csv.DictReader(f, delimiter=self.delimiter):
+                    key = self._row_key(row)
+                    if key:
+                        index[key] = self._row_values(row)
+        except OSError:
+            pass
+        return index
+
+    def add(self, row: Dict[str, Any]):
+        """Porovna jeden novy riadok s predoslym snapshotom"""
+        key = self._row_key(row)
+        if not key or key in self.seen:
+            return
+        self._compare(key, *self._row_values(row))
+
+    def add_frame(self, frame):
+        """
+        Porovna celu davku (pandas DataFrame) - cita len stlpce kluca, poctu a ceny,
+        celociselne stlpce sa normalizuju naraz namiesto po bunkach.
+        """
+        def column(name):
+            if not name or name not in frame:
+                return [''] * len(frame)
+            series = frame[name]
+            if series.dtype.kind in 'iu':
+                return series.astype(str).tolist()
+            return [normalize_value(value) for value in series.tolist()]
+
+        # Viac klucovych stlpcov = prvy neprazdny
+        keys = column(self.keys[0])
+        for name in self.keys[1:]:
+            keys = [key or other for key, other in zip(keys, column(name))]
+        for key, qty, price in zip(keys, column(self.qty), column(self.price)):
+            if key and key not in self.seen:
+                self._compare(key, qty, price)
+
+    def _compare(self, key: str, qty: str, price: str):
+        self.seen.add(key)
+        old = self.previous.get(key)
+        if old is None:
+            self.changes.append((key, 'added', '', qty, '', price))
+            return
+
+        old_qty, old_price = old
+        changed = [name for name, a, b in (('qty', old_qty, qty), ('price', old_price, price)) if a != b]
+        if changed:
+            self.changes.append((key, '+'.join(changed), old_qty, qty, old_price, price))
+
+    def add_all(self, rows: Iterable[Dict[str, Any]]):
+        for row in rows:
+            self.add(row)
+
+    def write(self) -> Dict[str, int]:
+        """Zapise delta subor (vratane odstranenych SKU) a vrati pocty zmien podla typu"""
+        removed = [(key, 'removed', qty, '', price, '')
+                   for key, (qty, price) in self.previous.items() if key not in self.seen]
+
+        tmp_file = self.delta_file + '.tmp'
+        with open(tmp_file, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f, delimiter=self.delimiter)
+            writer.writerow(DELTA_COLUMNS)
+            writer.writerows(self.changes)
+            writer.writerows(removed)
+        os.replace(tmp_file, self.delta_file)
+
+        counts = {'added': 0, 'removed': len(removed), 'qty': 0, 'price': 0}
+        for change in self.changes:
+            for kind in change[1].split('+'):
+                counts[kind] += 1
+        return counts
+
+    @staticmethod
+    def describe(counts: Dict[str, int]) -> str:
+        return f"+{counts['added']} -{counts['removed']} qty:{counts['qty']} price:{counts['price']}"
@@ -0,0 +1,208 @@
+"""
+SnapshotStore - stlpcove (Parquet) snapshoty vystupov vedla CSV
+Kazdy beh scrapera / feed konvertora moze zapisat snapshot s typovanymi
+stlpcami (sku, name, qty, price), particionovany podla dodavatela a datumu:
+
+    snapshots/supplier=kytary/date=2026-10-18/snapshot.parquet
+
+Historia skladu a cien napriec vsetkymi dodavatelmi je potom rychly scan
+(pyarrow.dataset / pandas / duckdb) namiesto git historie CSV suborov.
+
+Volitelne - vyzaduje pyarrow (pip install pyarrow). Zapina sa cez
+ScraperConfig(snapshot_dir=...) alebo premennu prostredia SNAPSHOT_DIR,
+ktoru pouzivaju aj feed konvertory (a run_all.py --snapshot-dir).
+
+Pouzitie:
+    table = read_snapshots('snapshots', suppliers=['kytary'], since='2026-10-01')
+    history = sku_history('snapshots', 'K123').to_pandas()
+"""
+
+import os
+import re
+import math
+from datetime import date as date_type
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # volitelna zavislost
+    pa = None
+
+SNAPSHOT_DIR_ENV = 'SNAPSHOT_DIR'
+
+_NUMBER_RE = re.compile(r'-?\d[\d.,]*')
+
+
+def default_snapshot_dir() -> Optional[str]:
+    """Adresar snapshotov z prostredia (None = snapshoty vypnute)"""
+    return os.environ.get(SNAPSHOT_DIR_ENV) or None
+
+
+def supplier_name(output_file: str) -> str:
+    """kytary_sklad.csv -> kytary (rovnaky nazov pre scrapery aj feed konvertory)"""
+    name = os.path.splitext(os.path.basename(output_file))[0]
+    return name[:-len('_sklad')] if name.endswith('_sklad') else name
+
+
+def _schema():
+    return pa.schema([
+        ('sku', pa.string()),
+        ('name', pa.string()),
+        ('qty', pa.int64()),
+        ('price', pa.float64()),
+    ])
+
+
+def to_qty(value: Any) -> Optional[int]:
+    """Pocet kusov ako int (None ak chyba / nie je cislo)"""
+    if value is None or value == '':
+        return None
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if math.isnan(number) else int(number)
+
+
+def to_price(value: Any) -> Optional[float]:
+    """
+    Cena ako float - zvladne '9 599,10 Kč', '1.299,00' aj '1,299.00' (None ak sa neda
+    precitat). Desatinny je posledny oddelovac; jediny oddelovac s presne tromi
+    ciframi za nim ('1.299', '1,299') je oddelovac tisicov.
+    """
+    if value is None or value == '':
+        return None
+    if isinstance(value, (int, float)):
+        return None if isinstance(value, float) and math.isnan(value) else float(value)
+    match = _NUMBER_RE.search(str(value).replace('\xa0', '').replace(' ', ''))
+    if not match:
+        return None
+    number = match.group().rstrip('.,')
+    separators = [char for char in number if char in '.,']
+    if separators:
+        last = separators[-1]
+        integer, _, fraction = number.rpartition(last)
+        thousands = len(separators) > 1 and set(separators) == {last}
+        grouped = len(separators) == 1 and len(fraction) == 3 and integer.lstrip('-') not in ('', '0')
+        if thousands or grouped:
+            number = number.replace(last, '')
+        else:
+            number = integer.replace('.', '').replace(',', '') + '.' + fraction
+    try:
+        return float(number)
+    except ValueError:
+        return None
+
+
+class SnapshotWriter:
+    """
+    Zapisuje riadky jedneho behu do Parquet snapshotu po davkach.
+    Subor vznikne az po close() (docasny subor + os.replace), neuspesny
+    beh (abort / vynimka v with bloku) snapshot nezapise.
+    """
+
+    def __init__(self, root: str, supplier: str, key: Union[str, Sequence[str]], qty: str,
+                 price: Optional[str] = None, name: Optional[str] = None,
+                 snapshot_date: Optional[str] = None, batch_size: int = 50000):
+        if pa is None:
+            raise RuntimeError("Parquet snapshoty vyzaduju balik pyarrow (pip install pyarrow)")
+
+        # Viac klucovych stlpcov = prvy neprazdny (napr. Code, potom EAN)
+        self.keys = (key,) if isinstance(key, str) else tuple(key)
+        self.columns = {'sku': self.keys, 'name': name, 'qty': qty, 'price': price}
+        self.batch_size = batch_size
+        snapshot_date = snapshot_date or date_type.today().isoformat()
+        directory = os.path.join(root, f"supplier={supplier}", f"date={snapshot_date}")
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, 'snapshot.parquet')
+        self.tmp_path = f"{self.path}.{os.getpid()}.tmp"
+
+        self.rows = 0
+        self._batch: Dict[str, List[Any]] = {column: [] for column in self.columns}
+        self._writer = pq.ParquetWriter(self.tmp_path, _schema(), compression='zstd')
+
+    def add(self, row: Dict[str, Any]):
+        sku = next((row[column] for column in self.keys if row.get(column) not in (None, '')), None)
+        if sku is None:
+            return
+        name_column = self.columns['name']
+        price_column = self.columns['price']
+        self._batch['sku'].append(str(sku))
+        self._batch['name'].append(str(row[name_column]) if name_column and row.get(name_column) is not None else None)
+        self._batch['qty'].append(to_qty(row.get(self.columns['qty'])))
+        self._batch['price'].append(to_price(row.get(price_column)) if price_column else None)
+        if len(self._batch['sku']) >= self.batch_size:
+            self._flush()
+
+    def add_all(self, rows):
+        for row in rows:
+            self.add(row)
+
+    def _flush(self):
+        if not self._batch['sku']:
+            return
+        self._writer.write_table(pa.table(self._batch, schema=_schema()))
+        self.rows += len(self._batch['sku'])
+        self._batch = {column: [] for column in self.columns}
+
+    def close(self) -> str:
+        self._flush()
+        self._writer.close()
+        os.replace(self.tmp_path, self.path)
+        return self.path
+
+    def abort(self):
+        self._writer.close()
+        if os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
+
+
+def _dataset(root: str):
+    if pa is None:
+        raise RuntimeError("Parquet snapshoty vyzaduju balik pyarrow (pip install pyarrow)")
+    # pyarrow.dataset nacita aj pandas - len pri citani, nie pri zapise zo scraperov
+    import pyarrow.dataset as ds
+    partitioning = ds.partitioning(pa.schema([('supplier', pa.string()), ('date', pa.string())]),
+                                   flavor='hive')
+    return ds.dataset(root, format='parquet', partitioning=partitioning)
+
+
+def read_snapshots(root: str, suppliers: Optional[List[str]] = None, since: Optional[str] = None,
+                   until: Optional[str] = None, columns: Optional[List[str]] = None):
+    """
+    Nacita snapshoty ako pyarrow.Table (stlpce supplier a date su z particii).
+    Filtre na dodavatela/datum sa aplikuju na urovni particii - necitaju sa ine subory.
+    """
+    dataset = _dataset(root)
+    import pyarrow.dataset as ds
+    condition = None
+    for part in (
+        ds.field('supplier').isin(suppliers) if suppliers else None,
+        ds.field('date') >= since if since else None,
+        ds.field('date') <= until if until else None,
+    ):
+        if part is not None:
+            condition = part if condition is None else condition & part
+    return dataset.to_table(columns=columns, filter=condition)
+
+
+def sku_history(root: str, sku: str, suppliers: Optional[List[str]] = None):
+    """Vyvoj poctu kusov a ceny jedneho SKU v case (napriec dodavatelmi)"""
+    dataset = _dataset(root)
+    import pyarrow.dataset as ds
+    condition = ds.field('sku') == sku
+    if suppliers:
+        condition = condition & ds.field('supplier').isin(suppliers)
+    table = dataset.to_table(columns=['supplier', 'date', 'qty', 'price'], filter=condition)
+    return table.sort_by([('date', 'ascending'), ('supplier', 'ascending')])
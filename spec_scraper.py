@@ -0,0 +1,174 @@
+"""
+SpecScraper - scraper definovany JSON specifikaciou (scrapers/*.json)
+Novy dodavatel = novy JSON subor, bez kodu.
+
+Pouzitie:
+    python spec_scraper.py scrapers/rockster.json
+    python spec_scraper.py --all            # vsetky enabled specifikacie
+    python spec_scraper.py --resume --all   # pokracuj v prerusenych behoch (zurnal v state_dir)
+
+Specifikacia (priklad: scrapers/rockster.json):
+    name, enabled          nazov dodavatela, ci sa ma spustat pri --all
+    sitemap_url            sitemap (aj .xml.gz / sitemapindex)
+    sitemap_file           volitelne: lokalny sitemap ma prednost pred sitemap_url
+    url_pattern            volitelne: regex, ktory musi URL produktu splnat
+    output_file, config    vystupny CSV a dalsie polia ScraperConfig (napr. "stream_markers":
+                           ["class=\"skladem\""] - stranka sa cita len po tieto znacky; musia
+                           pochadzat zo selectorov vo fields)
+    fields                 nazov -> selector {"css", "text", "attr", "strip", "own_text"}
+                           alebo zoznam selectorov (prvy najdeny vyhrava)
+    columns                vystupne stlpce v poradi: {"field", "required", "default",
+                           "regex" (skupina 1), "remove" (podretazce), "stock" (viz parse_stock)}
+"""
+
+import os
+import re
+import sys
+import glob
+import json
+import hashlib
+from typing import Any, Dict, Iterator, List, Optional
+
+from base_scraper import BaseScraper, ScraperConfig, Selector
+from sitemap_reader import iter_sitemap_xml
+
+
+SPECS_DIR = 'scrapers'
+
+
+def _compile_selectors(spec) -> tuple:
+    specs = spec if isinstance(spec, list) else [spec]
+    return tuple(Selector(**s) for s in specs)
+
+
+def parse_stock(value: Optional[str], rules: Dict[str, Any]) -> int:
+    """
+    Prevedie text dostupnosti na pocet kusov podla pravidiel:
+        present:        1 ak element existuje (napr. ikona skladom)
+        require_words:  ak text neobsahuje ani jedno slovo -> 0, inak aspon 1
+        number:         regex s jednou skupinou pre pocet kusov
+        min:            s require_words: najmensi pocet pre text so slovom (napr. 'skladom 0' -> 1)
+        in_stock_words: ak cislo chyba (alebo je 0) a text obsahuje slovo -> 1
+    """
+    if value is None:
+        return 0
+    if rules.get('present'):
+        return 1
+
+    text = value.lower()
+    require_words = rules.get('require_words')
+    in_stock_words = rules.get('in_stock_words')
+
+    if require_words and not any(word in text for word in require_words):
+        return 0
+
+    pattern = rules.get('number')
+    match = re.search(pattern, text) if pattern else None
+    if match and (int(match.group(1)) or not in_stock_words):
+        count = int(match.group(1))
+        return max(count, rules.get('min', 0)) if require_words else count
+
+    if require_words:
+        return 1
+    return 1 if in_stock_words and any(word in text for word in in_stock_words) else 0
+
+
+class SpecScraper(BaseScraper):
+    """Scraper, ktoreho selectory a pravidla su v JSON specifikacii"""
+
+    def __init__(self, spec: Dict[str, Any], **config_overrides):
+        self.spec = spec
+        self.FIELDS = {name: _compile_selectors(sel) for name, sel in spec['fields'].items()}
+        self.columns = spec['columns']
+        self.COLUMNS = list(self.columns)  # pevna schema vystupu (URL sa doplni)
+        self.url_pattern = re.compile(spec['url_pattern']) if spec.get('url_pattern') else None
+
+        options = {'sitemap_url': spec['sitemap_url'], 'output_file': spec['output_file']}
+        options.update(spec.get('config', {}))
+        options.update(config_overrides)
+        super().__init__(ScraperConfig(**options))
+
+    @classmethod
+    def from_file(cls, path: str, **config_overrides) -> 'SpecScraper':
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f), **config_overrides)
+
+    @property
+    def name(self) -> str:
+        return f"SpecScraper[{self.spec['name']}]"
+
+    def parser_version(self) -> str:
+        """Aj pravidla stlpcov zo specifikacie (selectory su vo FIELDS)"""
+        rules = json.dumps(self.columns, sort_keys=True)
+        return hashlib.sha1(f"{super().parser_version()}|{rules}".encode('utf-8')).hexdigest()[:16]
+
+    def iter_sitemap_entries(self):
+        """Lokalny sitemap_file (ak existuje) ma prednost pred sitemap_url"""
+        local_file = self.spec.get('sitemap_file')
+        if not local_file or not os.path.exists(local_file):
+            yield from super().iter_sitemap_entries()
+            return
+
+        self.logger.info(f"Citam lokalny sitemap: {local_file}")
+        with open(local_file, 'rb') as f:
+            for kind, loc, meta in iter_sitemap_xml(f):
+                if kind == 'url':
+                    yield loc, meta
+
+    def iter_sitemap_urls(self) -> Iterator[str]:
+        for url in super().iter_sitemap_urls():
+            if self.url_pattern is None or self.url_pattern.search(url):
+                yield url
+
+    def build_product(self, values, url):
+        row = {}
+        for column, rule in self.columns.items():
+            value = values.get(rule.get('field', column))
+
+            if 'stock' in rule:
+                row[column] = parse_stock(value, rule['stock'])
+                continue
+
+            if value is not None and rule.get('regex'):
+                match = re.search(rule['regex'], value)
+                value = match.group(1) if match else None
+            if value is not None:
+                for part in rule.get('remove', []):
+                    value = value.replace(part, '')
+                value = value.strip()
+
+            if rule.get('required') and not value:
+                return None
+            row[column] = value if value is not None else rule.get('default')
+
+        return row
+
+
+def load_specs(specs_dir: str = SPECS_DIR, enabled_only: bool = True) -> List[Dict[str, Any]]:
+    """Nacita vsetky specifikacie zo specs_dir"""
+    specs = []
+    for path in sorted(glob.glob(os.path.join(specs_dir, '*.json'))):
+        with open(path, 'r', encoding='utf-8') as f:
+            spec = json.load(f)
+        if enabled_only and not spec.get('enabled', True):
+            continue
+        specs.append(spec)
+    return specs
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    resume = '--resume' in args
+    args = [arg for arg in args if arg != '--resume']
+    if not args:
+        print("Pouzitie: python spec_scraper.py [--resume] <spec.json> [...] | --all")
+        sys.exit(1)
+
+    if args[0] == '--all':
+        scrapers = [SpecScraper(spec) for spec in load_specs()]
+    else:
+        scrapers = [SpecScraper.from_file(path) for path in args]
+
+    for scraper in scrapers:
+        # Bez --resume rozhoduje SCRAPER_RESUME (run_all.py --resume)
+        scraper.run(resume=True if resume else None)
@@ -0,0 +1,87 @@
+"""Testy importuju moduly z korena repozitara (ako benchmarks/bench.py)"""
+
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class LocalServer:
+    """
+    Lokalny HTTP server pre testy: cesta -> (telo, hlavicky). S hlavickou ETag
+    odpovie na zhodny If-None-Match 304 a na Range s If-Range 206. fail(cesta, 503, ...)
+    vrati najprv tieto statusy (prechodne chyby). Poziadavky sa zaznamenavaju.
+    """
+
+    def __init__(self):
+        self.routes = {}
+        self.failures = {}
+        self.requests = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.requests.append((self.path, dict(self.headers)))
+                if self.path not in server.routes:
+                    self.send_error(404)
+                    return
+                failures = server.failures.get(self.path)
+                if failures:
+                    self.send_response(failures.pop(0))
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+                body, headers = server.routes[self.path]
+                etag = headers.get('ETag')
+                if etag and self.headers.get('If-None-Match') == etag:
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.end_headers()
+                    return
+                requested = self.headers.get('Range', '')
+                if etag and requested.startswith('bytes=') and self.headers.get('If-Range') == etag:
+                    start = int(requested[6:].rstrip('-'))
+                    self.send_response(206)
+                    self.send_header('Content-Range', f'bytes {start}-{len(body) - 1}/{len(body)}')
+                    body = body[start:]
+                else:
+                    self.send_response(200)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    def add(self, path: str, body: bytes, **headers):
+        self.routes[path] = (body, {name.replace('_', '-'): value for name, value in headers.items()})
+        return self.url + path
+
+    def fail(self, path: str, *statuses: int):
+        self.failures[path] = list(statuses)
+
+
+@pytest.fixture(autouse=True)
+def workdir(tmp_path, monkeypatch):
+    """Predvolene adresare scraperov (.http_cache, reports/metrics, ...) su relativne - nie v repozitari"""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def http_server():
+    server = LocalServer()
+    thread = threading.Thread(target=server.httpd.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.httpd.shutdown()
+    server.httpd.server_close()
@@ -0,0 +1,82 @@
+import csv
+
+import pytest
+
+from base_scraper import BaseScraper, ScraperConfig, Selector
+from checkpoint import CheckpointJournal
+
+SITEMAP = 'https://shop.example/sitemap.xml'
+
+
+def test_journal_round_trip(tmp_path):
+    path = str(tmp_path / 'state' / 'out.csv.journal')
+    journal = CheckpointJournal(path, SITEMAP)
+    journal.open()
+    journal.record('https://shop.example/p/1', {'SKU': 'A1'})
+    journal.record('https://shop.example/p/2', None)
+    journal.close()
+
+    assert CheckpointJournal(path, SITEMAP).load() == {'https://shop.example/p/1': {'SKU': 'A1'},
+                                                       'https://shop.example/p/2': None}
+    assert CheckpointJournal(path, 'https://other.example/sitemap.xml').load() == {}
+
+
+def test_resume_skips_torn_last_line_and_continues_on_new_line(tmp_path):
+    path = tmp_path / 'out.csv.journal'
+    journal = CheckpointJournal(str(path), SITEMAP)
+    journal.open()
+    journal.record('https://shop.example/p/1', {'SKU': 'A1'})
+    journal.close()
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('{"url": "https://shop.example/p/2", "ro')  # proces zabity pocas zapisu
+
+    journal = CheckpointJournal(str(path), SITEMAP)
+    assert list(journal.load()) == ['https://shop.example/p/1']
+    journal.open(resume=True)
+    journal.record('https://shop.example/p/3', {'SKU': 'C3'})
+    journal.close()
+    assert list(CheckpointJournal(str(path), SITEMAP).load()) == ['https://shop.example/p/1', 'https://shop.example/p/3']
+
+
+class Interrupted(BaseException):
+    """Ako KeyboardInterrupt / zabitie jobu - scraper ju nezachyti ako chybu URL"""
+
+
+class ProductScraper(BaseScraper):
+    FIELDS = {'sku': Selector('span.sku')}
+    interrupt_on = None
+
+    def build_product(self, values, url):
+        if values['sku'] == self.interrupt_on:
+            raise Interrupted()
+        return {'SKU': values['sku']}
+
+
+def test_interrupted_run_resumes_from_journal(http_server, tmp_path):
+    paths = [f'/p/{i}' for i in range(1, 7)]
+    for i, path in enumerate(paths, 1):
+        http_server.add(path, f'<span class="sku">S{i}</span>'.encode('utf-8'))
+    urls = ''.join(f'<url><loc>{http_server.url}{path}</loc></url>' for path in paths)
+    sitemap_url = http_server.add('/sitemap.xml', f'<urlset>{urls}</urlset>'.encode('utf-8'))
+    output = tmp_path / 'shop_sklad.csv'
+
+    def scraper(interrupt_on=None):
+        instance = ProductScraper(ScraperConfig(sitemap_url=sitemap_url, output_file=str(output), max_workers=1,
+                                                state_dir=str(tmp_path / 'state'), snapshot_dir=None,
+                                                write_delta=False, metrics_dir=None))
+        instance.interrupt_on = interrupt_on
+        return instance
+
+    with pytest.raises(Interrupted):
+        scraper(interrupt_on='S4').run(resume=False)
+    assert not output.exists()
+    journal = tmp_path / 'state' / 'shop_sklad.csv.journal'
+    assert len(journal.read_text(encoding='utf-8').splitlines()) == 4  # hlavicka + 3 hotove URL
+
+    fetched = len(http_server.requests)
+    assert scraper().run(resume=True) == 6
+    product_requests = [path for path, _ in http_server.requests[fetched:] if path.startswith('/p/')]
+    assert sorted(product_requests) == ['/p/4', '/p/5', '/p/6']
+    with open(output, encoding='utf-8-sig') as f:
+        assert sorted(row['SKU'] for row in csv.DictReader(f, delimiter=';')) == [f'S{i}' for i in range(1, 7)]
+    assert not journal.exists()
@@ -0,0 +1,58 @@
+import os
+
+import pytest
+
+from csv_sink import CsvSink
+
+
+def read(path, encoding='utf-8'):
+    with open(path, encoding=encoding, newline='') as f:
+        return f.read()
+
+
+def test_fixed_schema_drops_extra_columns_and_fills_missing(tmp_path):
+    output = tmp_path / 'out.csv'
+    with CsvSink(str(output), ['SKU', 'Pocet_ks']) as sink:
+        sink.write({'SKU': 'A1', 'Pocet_ks': 3, 'Cena': 10})
+        sink.write({'SKU': 'B2'})
+    assert read(output) == 'SKU;Pocet_ks\r\nA1;3\r\nB2;\r\n'
+    assert sink.extra_columns == {'Cena'}
+
+
+def test_without_fieldnames_header_is_union_of_all_rows(tmp_path):
+    output = tmp_path / 'out.csv'
+    with CsvSink(str(output), encoding='utf-8-sig', lineterminator='\n') as sink:
+        sink.write({'SKU': 'A1', 'Pocet_ks': 3})
+        sink.write({'SKU': 'B2', 'Cena': 12.5, 'Pocet_ks': None})
+        sink.write({'SKU': 'C3', 'Nazov': 'Kábel; 3 m'})
+    assert read(output, 'utf-8-sig') == ('SKU;Pocet_ks;Cena;Nazov\n'
+                                         'A1;3;;\n'
+                                         'B2;;12.5;\n'
+                                         'C3;;;"Kábel; 3 m"\n')
+    assert sink.written == 3
+    assert not sink.extra_columns
+
+
+def test_without_rows_output_is_empty(tmp_path):
+    output = tmp_path / 'out.csv'
+    with CsvSink(str(output)):
+        pass
+    assert read(output) == ''
+
+
+def test_abort_keeps_previous_output(tmp_path):
+    output = tmp_path / 'out.csv'
+    output.write_text('stary obsah', encoding='utf-8')
+    with pytest.raises(RuntimeError):
+        with CsvSink(str(output)) as sink:
+            sink.write({'SKU': 'A1'})
+            raise RuntimeError('beh spadol')
+    assert read(output) == 'stary obsah'
+    assert os.listdir(tmp_path) == ['out.csv']
+
+
+def test_write_frame_needs_fieldnames(tmp_path):
+    pd = pytest.importorskip('pandas')
+    with CsvSink(str(tmp_path / 'out.csv')) as sink:
+        with pytest.raises(ValueError):
+            sink.write_frame(pd.DataFrame([{'SKU': 'A1'}]))
@@ -0,0 +1,142 @@
+import csv
+import threading
+import time
+
+import pytest
+
+from base_scraper import BaseScraper, ScraperConfig, Selector
+
+PRODUCTS = 12
+
+
+class ShopScraper(BaseScraper):
+    FIELDS = {'sku': Selector('span.sku'), 'name': Selector('h1'), 'stock': Selector('span.stock')}
+    RETRY_BACKOFF = 0.01
+
+    def build_product(self, values, url):
+        if not values['sku']:
+            return None
+        return {'SKU': values['sku'], 'Nazov': values['name'] or 'N/A', 'Pocet_ks': int(values['stock'] or 0)}
+
+
+@pytest.fixture
+def shop(http_server):
+    """Sitemap s produktmi, strankou bez produktu a neexistujucou strankou"""
+    paths = []
+    for i in range(1, PRODUCTS + 1):
+        paths.append(f'/p/{i}')
+        http_server.add(f'/p/{i}', f'<h1>Produkt {i}</h1><span class="sku">S{i}</span>'
+                                   f'<span class="stock">{i % 4}</span>'.encode('utf-8'))
+    http_server.add('/p/bez-produktu', b'<h1>Kategoria</h1>')
+    paths += ['/p/bez-produktu', '/p/neexistuje']
+    urls = ''.join(f'<url><loc>{http_server.url}{path}</loc></url>' for path in paths)
+    http_server.add('/sitemap.xml', f'<urlset>{urls}</urlset>'.encode('utf-8'))
+    return http_server
+
+
+def run_scraper(shop, workdir, engine, **options):
+    output = workdir / f'{engine}_sklad.csv'
+    options = {'max_workers': 3, 'cache_dir': None, 'checkpoint': False, 'snapshot_dir': None, **options}
+    scraper = ShopScraper(ScraperConfig(sitemap_url=shop.url + '/sitemap.xml', output_file=str(output),
+                                        engine=engine, **options))
+    count = scraper.run()
+    with open(output, encoding='utf-8-sig', newline='') as f:
+        rows = sorted(csv.DictReader(f, delimiter=';'), key=lambda row: row['URL'])
+    assert count == len(rows)
+    return scraper, rows
+
+
+def test_async_engine_writes_same_rows_as_thread_engine(shop, workdir):
+    thread_scraper, thread_rows = run_scraper(shop, workdir, 'thread')
+    async_scraper, async_rows = run_scraper(shop, workdir, 'async')
+
+    assert len(thread_rows) == PRODUCTS
+    assert async_rows == thread_rows
+    assert async_scraper.metrics.failures == thread_scraper.metrics.failures == {'no_product': 1, 'http_404': 1}
+
+
+def test_pipeline_engine_writes_same_rows_as_thread_engine(shop, workdir):
+    _, thread_rows = run_scraper(shop, workdir, 'thread')
+    # Do parsovacich procesov (spawn) sa posiela scraper aj s RateLimiter, ScraperMetrics a otvorenym zurnalom
+    scraper, pipeline_rows = run_scraper(shop, workdir, 'pipeline', parse_workers=2, delay=0.001,
+                                         checkpoint=True, state_dir=str(workdir / 'state'))
+
+    assert scraper.rate_limiter is not None
+    assert pipeline_rows == thread_rows
+    assert scraper.metrics.failures == {'no_product': 1, 'http_404': 1}
+    assert scraper.metrics.stages['parse'].count == PRODUCTS + 1
+
+
+@pytest.mark.parametrize('engine', ['thread', 'async'])
+def test_transient_errors_are_retried(shop, workdir, engine):
+    shop.fail('/p/1', 503, 500)
+    shop.fail('/p/2', 502, 503, 504, 500)  # viac chyb nez RETRY_TOTAL
+
+    scraper, rows = run_scraper(shop, workdir, engine)
+    assert 'S1' in [row['SKU'] for row in rows]
+    assert 'S2' not in [row['SKU'] for row in rows]
+    assert [path for path, _ in shop.requests].count('/p/1') == 3
+    assert [path for path, _ in shop.requests].count('/p/2') == ShopScraper.RETRY_TOTAL + 1
+    # /p/2 (thread: request:RetryError z urllib3, async: http_500), stranka bez produktu a 404
+    assert sum(scraper.metrics.failures.values()) == 3
+
+
+def fetcher(**options):
+    options = {'max_workers': 3, **options}
+    return ShopScraper(ScraperConfig(sitemap_url='', output_file='out.csv', cache_dir=None, checkpoint=False,
+                                     snapshot_dir=None, **options))
+
+
+@pytest.mark.parametrize('batch_size', [1, 4])
+def test_error_of_one_url_does_not_stop_the_queue(batch_size):
+    scraper = fetcher(batch_size=batch_size)
+    urls = [f'u{i}' for i in range(50)]
+    processed = []
+    lock = threading.Lock()
+
+    def process(url, session):
+        if url == 'u7':
+            raise RuntimeError('rozbita stranka')
+        with lock:
+            processed.append(url)
+
+    scraper._run_fetchers(iter(urls), process)
+    assert sorted(processed) == sorted(url for url in urls if url != 'u7')
+    assert scraper.metrics.failures == {'error:RuntimeError': 1}
+
+
+class Interrupted(BaseException):
+    """Ako KeyboardInterrupt - zastavi cely beh"""
+
+
+def test_interrupted_worker_stops_workers_and_producer():
+    scraper = fetcher(max_workers=2)
+    processed = []
+    raised = []
+
+    def process(url, session):
+        if url == 'u5':
+            raise Interrupted()
+        processed.append(url)
+        time.sleep(0.001)
+
+    def run():
+        try:
+            scraper._run_fetchers(iter(f'u{i}' for i in range(10000)), process)
+        except Interrupted:
+            raised.append(True)
+
+    # Producent na plnej fronte nesmie zablokovat koniec behu
+    thread = threading.Thread(target=run)
+    thread.start()
+    thread.join(timeout=10)
+    assert not thread.is_alive()
+    assert raised == [True]
+    assert len(processed) < 100
+
+
+def test_rows_of_finished_run_are_read_from_output(shop, workdir):
+    scraper, rows = run_scraper(shop, workdir, 'thread')
+    assert sorted(scraper.read_results(), key=lambda row: row['URL']) == rows
+    with pytest.deprecated_call():
+        assert len(scraper.results) == PRODUCTS
@@ -0,0 +1,165 @@
+import base64
+import csv
+import hashlib
+import json
+
+import pytest
+
+pd = pytest.importorskip('pandas')
+
+from feed_converter import (STREAM_ERRORS, DownloadError, FileSource, ResumableHttpSource,  # noqa: E402
+                            int_column, iter_xml_elements, price_column)
+from kytary import KytaryConverter  # noqa: E402
+from muziker import MuzikerConverter  # noqa: E402
+
+KYTARY_XML = (
+    '<?xml version="1.0" encoding="utf-8"?>'
+    '<VOPriceList xmlns="urn:kytary"><Items>'
+    '<VOPriceListItem><ProductCode>K-1</ProductCode><ProductName>Stand; black</ProductName>'
+    '<InStock>true</InStock><AvailableVolume>3.0</AvailableVolume><RetailPriceWithVAT>19.9</RetailPriceWithVAT>'
+    '</VOPriceListItem>'
+    '<VOPriceListItem><ProductCode> </ProductCode><ProductName>No code</ProductName></VOPriceListItem>'
+    '<VOPriceListItem><ProductCode>K-2</ProductCode><ProductName>Cable</ProductName>'
+    '<InStock>false</InStock><AvailableVolume>0</AvailableVolume><RetailPriceWithVAT>x</RetailPriceWithVAT>'
+    '</VOPriceListItem>'
+    '<VOPriceListItem><ProductCode>K-3</ProductCode><ProductName>Strings</ProductName>'
+    '<InStock>true</InStock><AvailableVolume>12</AvailableVolume><RetailPriceWithVAT>5</RetailPriceWithVAT>'
+    '</VOPriceListItem>'
+    '</Items></VOPriceList>'
+).encode('utf-8')
+
+
+def test_iter_xml_elements_across_chunk_boundaries():
+    # 7-byte chunks split tags, text and the namespace declaration
+    chunks = [KYTARY_XML[i:i + 7] for i in range(0, len(KYTARY_XML), 7)]
+    items = list(iter_xml_elements(chunks, 'VOPriceListItem'))
+    assert [item.findtext('{urn:kytary}ProductCode') for item in items] == ['K-1', ' ', 'K-2', 'K-3']
+
+
+def parse_int(value):
+    """Row-by-row quantity parsing the converters used before int_column()"""
+    try:
+        return int(float((value or "0").strip()))
+    except ValueError:
+        return 0
+
+
+def parse_price(value):
+    """Row-by-row price parsing the converters used before price_column()"""
+    value = (value or "").strip()
+    try:
+        return round(float(value), 2) if value else ""
+    except ValueError:
+        return ""
+
+
+def test_int_column_matches_parse_int():
+    values = ['3', '2.0', ' 7 ', '-1.9', '', None, 'abc', 'nan']
+    assert int_column(pd.Series(values)).tolist() == [parse_int(value) for value in values]
+
+
+def test_price_column_matches_parse_price():
+    values = ['19.9', ' 5 ', '2.675', '1.005', '0.125', '', None, 'x']
+    expected = [parse_price(value) for value in values]
+    result = price_column(pd.Series(values)).tolist()
+    # Missing prices are NaN in the frame and '' in the CSV
+    assert [price if price == price else '' for price in result] == expected
+
+
+@pytest.fixture
+def no_snapshots(monkeypatch):
+    monkeypatch.delenv('SNAPSHOT_DIR', raising=False)
+
+
+def read_csv(path):
+    with open(path, encoding='utf-8-sig', newline='') as f:
+        return list(csv.reader(f, delimiter=';'))
+
+
+def test_converter_streams_batches_to_csv_and_delta(tmp_path, no_snapshots):
+    feed = tmp_path / 'feed.xml'
+    feed.write_bytes(KYTARY_XML)
+    output = tmp_path / 'kytary_sklad.csv'
+    output.write_text('ProductCode;ProductName;AvailableVolume;RetailPriceWithVAT\nK-1;Stand, black;1;19.9\n'
+                      'K-9;Old;1;1\n', encoding='utf-8')
+
+    converter = KytaryConverter(FileSource(str(feed)), output_file=str(output))
+    converter.batch_size = 2
+    stats = converter.convert()
+
+    assert (stats['total'], stats['written'], stats['in_stock'], stats['with_qty']) == (4, 3, 2, 2)
+    assert stats['bytes'] == len(KYTARY_XML)
+    assert stats['delta'] == {'added': 2, 'removed': 1, 'qty': 1, 'price': 0}
+    assert read_csv(output) == [
+        ['ProductCode', 'ProductName', 'AvailableVolume', 'RetailPriceWithVAT'],
+        ['K-1', 'Stand, black', '3', '19.9'],
+        ['K-2', 'Cable', '0', ''],
+        ['K-3', 'Strings', '12', '5.0'],
+    ]
+    assert (tmp_path / 'kytary_sklad_delta.csv').exists()
+
+
+def test_resumable_source_continues_partial_download(http_server, tmp_path):
+    body = KYTARY_XML * 20
+    url = http_server.add('/feed.xml', body, ETag='"v1"')
+    source = ResumableHttpSource(url, download_dir=str(tmp_path))
+    # Previous run stopped after 1000 bytes
+    with open(source.part_path, 'wb') as f:
+        f.write(body[:1000])
+    with open(source.meta_path, 'w', encoding='utf-8') as f:
+        json.dump({'etag': '"v1"', 'size': len(body), 'encoding': 'identity'}, f)
+
+    with source.open() as stream:
+        assert stream.read() == body
+
+    _, headers = http_server.requests[-1]
+    assert (headers['Range'], headers['If-Range']) == ('bytes=1000-', '"v1"')
+    assert list(tmp_path.iterdir()) == []  # parsed feed is discarded
+
+
+def test_resumable_source_restarts_when_file_changed(http_server, tmp_path):
+    body = KYTARY_XML
+    url = http_server.add('/feed.xml', body, ETag='"v2"')
+    source = ResumableHttpSource(url, download_dir=str(tmp_path))
+    with open(source.part_path, 'wb') as f:
+        f.write(b'stale bytes of v1')
+    with open(source.meta_path, 'w', encoding='utf-8') as f:
+        json.dump({'etag': '"v1"', 'size': 5000, 'encoding': 'identity'}, f)
+
+    with open(source.download(), 'rb') as f:
+        assert f.read() == body
+
+
+def test_resumable_source_rejects_checksum_mismatch(http_server, tmp_path):
+    digest = base64.b64encode(hashlib.sha256(b'other').digest()).decode()
+    url = http_server.add('/feed.xml', KYTARY_XML, ETag='"v1"', Digest=f'sha-256={digest}')
+    source = ResumableHttpSource(url, download_dir=str(tmp_path))
+
+    with pytest.raises(DownloadError, match='SHA-256'):
+        source.download()
+    assert list(tmp_path.iterdir()) == []
+
+
+def convert_muziker(tmp_path, feed_text):
+    feed = tmp_path / 'feed.csv'
+    feed.write_text(feed_text, encoding='utf-8')
+    output = tmp_path / 'muziker_sklad.csv'
+    converter = MuzikerConverter(FileSource(str(feed)), output_file=str(output))
+    converter.write_delta = False
+    return converter.convert(), output
+
+
+def test_muziker_tolerates_rows_with_extra_or_missing_fields(tmp_path, no_snapshots):
+    # Like csv.DictReader: extra fields are dropped, missing ones are empty
+    stats, output = convert_muziker(tmp_path, 'Code,Name,EAN,SKU,StockQTY\n'
+                                              'M-1,Stand,123,S1,2\n'
+                                              'M-2,Cable,456,S2,1,extra,fields\n'
+                                              'M-3,Strings\n')
+    assert stats['written'] == 3
+    assert read_csv(output) == [['Code', 'EAN', 'SKU', 'StockQTY'], ['M-1', '123', 'S1', '2'],
+                                ['M-2', '456', 'S2', '1'], ['M-3', '', '', '0']]
+
+
+def test_muziker_truncated_feed_is_retried(tmp_path, no_snapshots):
+    with pytest.raises(STREAM_ERRORS):
+        convert_muziker(tmp_path, 'Code,Name,EAN,SKU,StockQTY\nM-1,"Stand\n')
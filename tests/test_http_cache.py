@@ -0,0 +1,85 @@
+import requests
+
+import http_cache
+from base_scraper import BaseScraper, ScraperConfig, Selector
+from http_cache import HttpCache
+
+URL = 'https://shop.example/p/1'
+ROW = {'SKU': 'A1', 'Pocet_ks': 3}
+
+
+def test_conditional_headers_from_stored_validators(tmp_path):
+    cache = HttpCache(str(tmp_path))
+    assert cache.conditional_headers(URL) == {}
+
+    cache.store(URL, {'ETag': '"v1"', 'Last-Modified': 'Wed, 01 May 2024 10:00:00 GMT'}, row=ROW)
+    assert cache.conditional_headers(URL) == {'If-None-Match': '"v1"',
+                                              'If-Modified-Since': 'Wed, 01 May 2024 10:00:00 GMT'}
+    assert cache.get_row(URL) == ROW
+    assert cache.conditional_headers(URL, need_body=True) == {}  # riadok bez tela (sitemap potrebuje telo)
+
+
+def test_response_without_validators_is_not_stored(tmp_path):
+    cache = HttpCache(str(tmp_path))
+    cache.store(URL, {}, row=ROW)
+    assert cache.get(URL) is None
+
+
+def test_other_parser_version_or_expired_entry_is_ignored(tmp_path, monkeypatch):
+    HttpCache(str(tmp_path), version='a').store(URL, {'ETag': '"v1"'}, row=ROW)
+    assert HttpCache(str(tmp_path), version='a').get_row(URL) == ROW
+    assert HttpCache(str(tmp_path), version='b').get_row(URL) is None
+    assert HttpCache(str(tmp_path), version='b').conditional_headers(URL) == {}
+
+    later = http_cache.time.time() + 8 * 86400
+    monkeypatch.setattr(http_cache.time, 'time', lambda: later)
+    assert HttpCache(str(tmp_path), version='a').get_row(URL) is None
+
+
+class ProductScraper(BaseScraper):
+    FIELDS = {'sku': Selector('span.sku')}
+
+    def build_product(self, values, url):
+        return {'SKU': values['sku']}
+
+
+def scraper(tmp_path, cls=ProductScraper):
+    return cls(ScraperConfig(sitemap_url='https://shop.example/sitemap.xml', output_file=str(tmp_path / 'out.csv'),
+                             cache_dir=str(tmp_path / 'cache'), checkpoint=False, snapshot_dir=None))
+
+
+def test_not_modified_page_returns_cached_row(http_server, tmp_path):
+    url = http_server.add('/p/1', b'<span class="sku">A1</span>', ETag='"v1"')
+    with requests.Session() as session:
+        assert scraper(tmp_path).scrape_product(url, session) == {'SKU': 'A1', 'URL': url}
+
+        # Server uz vracia ine telo, ale ETag je rovnaky - 304 a riadok z cache
+        http_server.routes['/p/1'] = (b'<span class="sku">ZMENA</span>', {'ETag': '"v1"'})
+        second = scraper(tmp_path)
+        assert second.scrape_product(url, session) == {'SKU': 'A1', 'URL': url}
+        assert second.metrics.statuses[304] == 1
+
+
+def test_changed_parser_ignores_cached_rows(http_server, tmp_path):
+    url = http_server.add('/p/1', b'<span class="sku">A1</span>', ETag='"v1"')
+
+    class FixedScraper(ProductScraper):
+        def build_product(self, values, url):
+            return {'SKU': values['sku'].lower()}
+
+    with requests.Session() as session:
+        scraper(tmp_path).scrape_product(url, session)
+        assert scraper(tmp_path, FixedScraper).scrape_product(url, session) == {'SKU': 'a1', 'URL': url}
+    assert 'If-None-Match' not in http_server.requests[-1][1]
+
+
+def test_cache_is_on_by_default(http_server, workdir):
+    url = http_server.add('/p/1', b'<span class="sku">A1</span>', ETag='"v1"')
+    config = ScraperConfig(sitemap_url='https://shop.example/sitemap.xml', output_file='out.csv', checkpoint=False,
+                           snapshot_dir=None)
+    with requests.Session() as session:
+        ProductScraper(config).scrape_product(url, session)
+        second = ProductScraper(config)
+        assert second.scrape_product(url, session) == {'SKU': 'A1', 'URL': url}
+    assert second.metrics.statuses[304] == 1
+    assert (workdir / '.http_cache' / second.name).is_dir()
@@ -0,0 +1,67 @@
+import csv
+
+from base_scraper import BaseScraper, ScraperConfig, Selector
+
+
+class ProductScraper(BaseScraper):
+    FIELDS = {'sku': Selector('span.sku'), 'stock': Selector('span.stock')}
+
+    def build_product(self, values, url):
+        return {'SKU': values['sku'], 'Pocet_ks': values['stock']}
+
+
+def publish(http_server, lastmods):
+    """Sitemap s <lastmod> pre kazdy produkt"""
+    urls = ''.join(f'<url><loc>{http_server.url}{path}</loc><lastmod>{lastmod}</lastmod></url>'
+                   for path, lastmod in lastmods.items())
+    return http_server.add('/sitemap.xml', f'<urlset>{urls}</urlset>'.encode('utf-8'))
+
+
+def page(sku, stock):
+    return f'<span class="sku">{sku}</span><span class="stock">{stock}</span>'.encode('utf-8')
+
+
+def run(sitemap_url, workdir):
+    output = workdir / 'shop_sklad.csv'
+    scraper = ProductScraper(ScraperConfig(sitemap_url=sitemap_url, output_file=str(output), max_workers=2,
+                                           incremental=True, cache_dir=None, checkpoint=False, snapshot_dir=None))
+    count = scraper.run()
+    with open(output, encoding='utf-8-sig', newline='') as f:
+        rows = {row['SKU']: row['Pocet_ks'] for row in csv.DictReader(f, delimiter=';')}
+    assert count == len(rows)
+    return rows
+
+
+def fetched_products(http_server, since):
+    return sorted(path for path, _ in http_server.requests[since:] if path.startswith('/p/'))
+
+
+def test_unchanged_urls_are_carried_over_from_previous_output(http_server, workdir):
+    for i in (1, 2, 3):
+        http_server.add(f'/p/{i}', page(f'S{i}', i))
+    lastmods = {'/p/1': '2024-05-01', '/p/2': '2024-05-01', '/p/3': '2024-05-01'}
+    sitemap_url = publish(http_server, lastmods)
+    assert run(sitemap_url, workdir) == {'S1': '1', 'S2': '2', 'S3': '3'}
+    assert (workdir / '.scraper_state' / 'shop_sklad.csv.json').exists()
+
+    # Zmeni sa len /p/2 (novy lastmod); /p/3 sa zmeni potichu - ostava riadok z predosleho behu
+    http_server.add('/p/2', page('S2', 0))
+    http_server.add('/p/3', page('S3', 99))
+    http_server.add('/p/4', page('S4', 4))
+    publish(http_server, {**lastmods, '/p/2': '2024-05-02', '/p/4': '2024-05-02'})
+
+    since = len(http_server.requests)
+    assert run(sitemap_url, workdir) == {'S1': '1', 'S2': '0', 'S3': '3', 'S4': '4'}
+    assert fetched_products(http_server, since) == ['/p/2', '/p/4']
+
+
+def test_url_missing_from_previous_output_is_fetched_again(http_server, workdir):
+    http_server.add('/p/1', page('S1', 1))
+    http_server.fail('/p/2', 404)
+    http_server.add('/p/2', page('S2', 2))
+    sitemap_url = publish(http_server, {'/p/1': '2024-05-01', '/p/2': '2024-05-01'})
+    assert run(sitemap_url, workdir) == {'S1': '1'}
+
+    since = len(http_server.requests)
+    assert run(sitemap_url, workdir) == {'S1': '1', 'S2': '2'}
+    assert fetched_products(http_server, since) == ['/p/2']
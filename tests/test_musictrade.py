@@ -0,0 +1,85 @@
+import json
+
+import pytest
+from bs4 import BeautifulSoup
+
+from base_scraper import ScraperConfig
+from musictrade import MAX_SCRIPT_BYTES, ScraperMusicTrade
+
+URL = 'https://www.musictrade.cz/mt12345/'
+
+
+def product(quantity='> 5', **fields):
+    """Objekt produktu ako ho Shoptet posiela v dataLayer (priceWithVat je posledny kluc)"""
+    data = {'id': 7, 'codes': [{'code': 'MT12345', 'quantity': quantity, 'stocks': [{'id': 1, 'quantity': quantity}]}],
+            'code': 'MT12345', 'name': 'Gitara čierna 4/4', 'url': URL, 'currency': 'CZK'}
+    data.update(fields)
+    data['priceWithVat'] = 12990
+    return data
+
+
+def page(product_data, encoding='utf-8'):
+    layer = {'shoptet': {'pageType': 'productDetail', 'product': product_data,
+                         'cartInfo': {'id': None, 'freeShipping': False}}}
+    # Shoptet escapuje lomitka v JSON ('\/')
+    script = json.dumps(layer, ensure_ascii=False).replace('/', '\\/')
+    html = (f'<html><head><meta charset="{encoding}"><script>dataLayer = [];</script>'
+            f'<script>dataLayer.push({script});</script></head>'
+            f'<body><h1>{product_data.get("name", "")}</h1></body></html>')
+    return html.encode(encoding)
+
+
+@pytest.fixture
+def scraper():
+    return ScraperMusicTrade(ScraperConfig(sitemap_url='https://www.musictrade.cz/sitemap.xml',
+                                           output_file='musictrade_sklad.csv', cache_dir=None, checkpoint=False,
+                                           snapshot_dir=None))
+
+
+def soup_row(scraper, content):
+    return scraper.parse_product(BeautifulSoup(content, 'html.parser'), URL)
+
+
+@pytest.mark.parametrize('product_data', [
+    product('> 5'),
+    product('3'),
+    product('0'),
+    product('na dotaz'),
+    product(None),
+    product(codes=[]),
+    {k: v for k, v in product().items() if k != 'name'},
+])
+def test_raw_and_soup_parsing_give_identical_rows(scraper, product_data):
+    content = page(product_data)
+    row = scraper.parse_raw(content, URL)
+    assert row is not None
+    assert row == soup_row(scraper, content)
+
+
+def test_row_values(scraper):
+    assert scraper.parse_raw(page(product('> 5')), URL) == {'SKU': 'MT12345', 'Nazov': 'Gitara čierna 4/4',
+                                                           'Pocet_ks': 5}
+    assert scraper.parse_raw(page(product('na dotaz')), URL)['Pocet_ks'] == 1
+
+
+def test_non_utf8_page_falls_back_to_soup(scraper):
+    content = page(product('2'), encoding='windows-1250')
+    assert scraper.parse_raw(content, URL) is None
+    row, failure, _ = scraper._parse_content(content, URL)
+    assert failure is None
+    assert row == {**soup_row(scraper, content), 'URL': URL}
+    assert row['Nazov'] == 'Gitara čierna 4/4'
+
+
+def test_product_over_byte_cap_falls_back_to_soup(scraper):
+    content = page(product('2', description='x' * MAX_SCRIPT_BYTES))
+    assert scraper.parse_raw(content, URL) is None
+    row, failure, _ = scraper._parse_content(content, URL)
+    assert failure is None
+    assert (row['SKU'], row['Pocet_ks']) == ('MT12345', 2)
+
+
+def test_page_without_product(scraper):
+    content = b'<script>dataLayer = [];</script><script>dataLayer.push({"shoptet": {"pageType": "category"}});</script>'
+    assert scraper.parse_raw(content, URL) is None
+    assert scraper._parse_content(content, URL)[:2] == (None, 'no_product')
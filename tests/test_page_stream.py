@@ -0,0 +1,181 @@
+from datetime import timedelta
+
+import pytest
+
+from base_scraper import INCOMPLETE_PAGE, BaseScraper, ScraperConfig, Selector
+from page_stream import CHUNK_SIZE, DRAIN_LIMIT, MARKER_TAIL, PageReader
+
+
+class FakeRaw:
+    """urllib3 HTTPResponse: pozicia v tele a stav spojenia"""
+
+    def __init__(self, total):
+        self.total = total
+        self.position = 0
+        self.closed = False
+        self.released = False
+        self.retries = None
+
+    @property
+    def length_remaining(self):
+        return self.total - self.position
+
+    def isclosed(self):
+        return self.closed
+
+    def tell(self):
+        return self.position
+
+    def drain_conn(self):
+        self.position = self.total
+
+    def release_conn(self):
+        self.released = True
+
+
+class FakeResponse:
+    """requests.Response so stream=True - telo po blokoch"""
+
+    def __init__(self, body: bytes, status_code=200):
+        self.body = body
+        self.status_code = status_code
+        self.headers = {'Content-Length': str(len(body))}
+        self.raw = FakeRaw(len(body))
+        self.elapsed = timedelta(milliseconds=5)
+        self.chunks = 0
+
+    def iter_content(self, size):
+        for start in range(0, len(self.body), size):
+            chunk = self.body[start:start + size]
+            self.raw.position += len(chunk)
+            self.chunks += 1
+            yield chunk
+
+    @property
+    def content(self):
+        return self.body
+
+    def close(self):
+        self.raw.closed = True
+
+
+def page(*parts):
+    """Telo z (pozicia, retazec) - zvysok vyplna medzera"""
+    body = bytearray(b' ' * 10 * CHUNK_SIZE)
+    for position, text in parts:
+        body[position:position + len(text)] = text
+    return bytes(body)
+
+
+def test_marker_in_first_chunk_stops_reading_and_closes_connection():
+    response = FakeResponse(page((100, b'class="sku"')))
+    body, nbytes, partial = PageReader(['class="sku"']).read(response)
+    assert response.chunks == 1
+    assert body == response.body[:CHUNK_SIZE]
+    assert (nbytes, partial) == (CHUNK_SIZE, True)
+    assert response.raw.closed and not response.raw.released
+
+
+def test_marker_at_end_of_chunk_reads_tail_from_next_chunk():
+    response = FakeResponse(page((CHUNK_SIZE - 20, b'class="sku"')))
+    body, _, partial = PageReader(['class="sku"']).read(response)
+    assert MARKER_TAIL < CHUNK_SIZE
+    assert response.chunks == 2
+    assert len(body) == 2 * CHUNK_SIZE and partial
+
+
+def test_marker_split_between_chunks_is_found():
+    response = FakeResponse(page((CHUNK_SIZE - 4, b'class="sku"')))
+    PageReader(['class="sku"']).read(response)
+    assert response.chunks == 2
+
+
+def test_reading_waits_for_all_markers():
+    response = FakeResponse(page((10, b'<h1'), (3 * CHUNK_SIZE + 10, b'class="sku"')))
+    PageReader(['<h1', 'class="sku"']).read(response)
+    assert response.chunks == 4
+
+
+def test_missing_marker_reads_whole_body():
+    response = FakeResponse(page((10, b'<h1')))
+    body, nbytes, partial = PageReader(['<h1', 'class="sku"']).read(response)
+    assert body == response.body
+    assert (nbytes, partial) == (len(response.body), False)
+
+
+def test_small_remainder_is_drained_and_connection_reused():
+    body = page((10, b'<h1'))[:CHUNK_SIZE + DRAIN_LIMIT]
+    response = FakeResponse(body)
+    _, nbytes, partial = PageReader(['<h1']).read(response)
+    assert partial and nbytes == len(body)
+    assert response.raw.released and not response.raw.closed
+
+
+def test_max_bytes_cuts_body():
+    response = FakeResponse(page())
+    body, _, partial = PageReader(max_bytes=CHUNK_SIZE + 100).read(response)
+    assert len(body) == CHUNK_SIZE + 100 and partial
+
+
+# === BaseScraper: znacky z FIELDS a cele citanie pri chybajucom poli ===
+
+class ProductScraper(BaseScraper):
+    FIELDS = {
+        'name': Selector('h1'),
+        'sku': Selector('span.sku'),
+    }
+
+    def build_product(self, values, url):
+        return {'SKU': values['sku'], 'Nazov': values['name']}
+
+
+class RawScraper(BaseScraper):
+    def parse_product(self, soup, url):
+        return None
+
+
+class FakeSession:
+    def __init__(self, body: bytes):
+        self.body = body
+        self.streams = []
+
+    def get(self, url, timeout=None, headers=None, stream=False):
+        self.streams.append(stream)
+        return FakeResponse(self.body)
+
+
+def config(tmp_path, **options):
+    return ScraperConfig(sitemap_url='https://shop.example/sitemap.xml', output_file=str(tmp_path / 'out.csv'),
+                         checkpoint=False, snapshot_dir=None, write_delta=False, **options)
+
+
+def test_markers_must_come_from_fields(tmp_path):
+    ProductScraper(config(tmp_path, stream_markers=['<h1', 'class="sku"']))
+    with pytest.raises(ValueError, match='description'):
+        ProductScraper(config(tmp_path, stream_markers=['class="description"']))
+    with pytest.raises(ValueError, match='FIELDS'):
+        RawScraper(config(tmp_path, stream_markers=['<h1']))
+
+
+def test_partial_page_missing_field_is_read_again_in_full(tmp_path):
+    # Znacka '<h1' je v prvom bloku, SKU az v piatom - ciastocne citanie ho nevidi
+    body = page((0, b'<h1>Gitara</h1>'), (5 * CHUNK_SIZE, b'<span class="sku">A1</span>'))
+    scraper = ProductScraper(config(tmp_path, stream_markers=['<h1']))
+    session = FakeSession(body)
+
+    row = scraper.scrape_product('https://shop.example/p/1', session)
+
+    assert row == {'SKU': 'A1', 'Nazov': 'Gitara', 'URL': 'https://shop.example/p/1'}
+    assert session.streams == [True, False]
+    assert scraper.metrics.failures == {INCOMPLETE_PAGE: 1}
+    assert scraper.metrics.partial_reads == 1
+
+
+def test_partial_page_with_all_fields_is_not_read_again(tmp_path):
+    body = page((0, b'<h1>Gitara</h1><span class="sku">A1</span>'))
+    scraper = ProductScraper(config(tmp_path, stream_markers=['class="sku"']))
+    session = FakeSession(body)
+
+    assert scraper.scrape_product('https://shop.example/p/1', session)['SKU'] == 'A1'
+    assert session.streams == [True]
+    assert not scraper.metrics.failures
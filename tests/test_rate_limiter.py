@@ -0,0 +1,161 @@
+import pytest
+
+import rate_limiter
+from base_scraper import ScraperConfig
+from rate_limiter import LATENCY_WARMUP, RateLimiter, parse_retry_after
+
+URL = 'https://shop.example/p/1'
+
+
+class FakeTime:
+    """Hodiny limitera pod kontrolou testu"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeTime()
+    monkeypatch.setattr(rate_limiter, 'time', fake)
+    return fake
+
+
+def warm_up(limiter, clock, latency=0.05):
+    """Zdrave odpovede, kym limiter nepozna zakladnu latenciu"""
+    for _ in range(LATENCY_WARMUP):
+        clock.now += 0.01
+        limiter.record(URL, 200, latency)
+
+
+def host_rate(limiter):
+    return limiter.rates()['shop.example']
+
+
+def test_throttle_without_retry_after_halves_rate_once_per_cooldown(clock):
+    limiter = RateLimiter(rate=10)
+    limiter.record(URL, 429)
+    assert host_rate(limiter) == pytest.approx(5)
+
+    clock.now += 0.5  # odpovede requestov, ktore uz boli na ceste
+    limiter.record(URL, 503)
+    assert host_rate(limiter) == pytest.approx(5)
+
+    clock.now += 1
+    limiter.record(URL, 429)
+    assert host_rate(limiter) == pytest.approx(2.5)
+
+
+def test_rate_never_drops_below_min_rate(clock):
+    limiter = RateLimiter(rate=1, min_rate=0.5)
+    for _ in range(5):
+        clock.now += 2
+        limiter.record(URL, 429)
+    assert host_rate(limiter) == pytest.approx(0.5)
+
+
+def test_retry_after_blocks_host_without_cutting_rate(clock):
+    limiter = RateLimiter(rate=10)
+    limiter.record(URL, 429, retry_after='3')
+    assert host_rate(limiter) == pytest.approx(10)
+    assert limiter.reserve(URL) == pytest.approx(3.1)  # 3 s blok + token pri 10 req/s
+
+
+def test_latency_right_after_retry_after_block_is_ignored(clock):
+    limiter = RateLimiter(rate=10)
+    warm_up(limiter, clock, latency=0.05)
+    limiter.record(URL, 429, retry_after='2')
+    clock.now += 2.5  # fronta workerov dobieha po bloku
+    for _ in range(10):
+        limiter.record(URL, 200, 1.0)
+    assert host_rate(limiter) == pytest.approx(10)
+
+
+def test_recovery_returns_multiplicatively_to_pre_burst_rate(clock):
+    limiter = RateLimiter(rate=10)
+    warm_up(limiter, clock)
+    limiter.record(URL, 429)
+    assert host_rate(limiter) == pytest.approx(5)
+
+    clock.now += 0.5
+    limiter.record(URL, 200, 0.05)
+    assert host_rate(limiter) == pytest.approx(5 * 2 ** 0.5)
+
+    clock.now += 1
+    limiter.record(URL, 200, 0.05)
+    assert host_rate(limiter) == pytest.approx(10)  # strop = rychlost pred burstom
+
+    clock.now += 1
+    limiter.record(URL, 200, 0.05)
+    assert host_rate(limiter) == pytest.approx(10)  # nad strop len ked limiter brzdi
+
+
+def test_throttle_during_recovery_lowers_ceiling(clock):
+    limiter = RateLimiter(rate=10)
+    warm_up(limiter, clock)
+    limiter.record(URL, 429)
+    clock.now += 1.5
+    limiter.record(URL, 429)
+    assert host_rate(limiter) == pytest.approx(2.5)
+
+    clock.now += 10
+    limiter.record(URL, 200, 0.05)
+    assert host_rate(limiter) == pytest.approx(9)
+
+
+def test_saturated_healthy_host_speeds_up(clock):
+    limiter = RateLimiter(rate=10, max_rate=10.15)
+    warm_up(limiter, clock)
+    limiter.reserve(URL)
+    limiter.reserve(URL)  # tokeny su minute - limiter brzdi
+    limiter.record(URL, 200, 0.05)
+    assert host_rate(limiter) == pytest.approx(10.1)
+    limiter.record(URL, 200, 0.05)
+    assert host_rate(limiter) == pytest.approx(10.15)
+
+
+def test_rising_latency_slows_down(clock):
+    limiter = RateLimiter(rate=10)
+    warm_up(limiter, clock, latency=0.05)
+    for _ in range(10):
+        limiter.record(URL, 200, 1.0)
+    assert host_rate(limiter) == pytest.approx(8)
+
+
+def test_unlimited_host_starts_limiting_after_throttle(clock):
+    limiter = RateLimiter()
+    for _ in range(20):
+        clock.now += 0.05
+        limiter.reserve(URL)
+    assert host_rate(limiter) is None
+    limiter.record(URL, 429)
+    assert host_rate(limiter) == pytest.approx(20 / 0.95 / 2)
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('120', 120.0),
+    ('100000', 300.0),
+    ('Wed, 21 Oct 2015 07:28:00 GMT', 0.0),
+    ('soon', None),
+    (None, None),
+])
+def test_parse_retry_after(value, expected):
+    assert parse_retry_after(value) == expected
+
+
+@pytest.mark.parametrize('delay, adaptive_rate, expected', [
+    (0.2, None, True),    # pevny delay -> limiter namiesto sleep
+    (0.0, None, False),
+    (0.2, False, False),  # explicitne vypnuty
+    (0.0, True, True),
+])
+def test_adaptive_rate_defaults_to_delay(delay, adaptive_rate, expected):
+    config = ScraperConfig(sitemap_url='https://shop.example/sitemap.xml', output_file='out.csv',
+                           delay=delay, adaptive_rate=adaptive_rate)
+    assert config.adaptive_rate is expected
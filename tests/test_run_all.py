@@ -0,0 +1,93 @@
+import sys
+import threading
+
+import pytest
+
+pytest.importorskip('pandas')  # run_all importuje feed konvertory
+
+from run_all import ConnectionBudget, Orchestrator, Source, find_python_sources, unique_sources  # noqa: E402
+
+
+def test_find_python_sources_reads_source_without_importing(tmp_path):
+    (tmp_path / 'shop.py').write_text(
+        'from base_scraper import ScraperConfig\n'
+        'CONFIG = ScraperConfig(sitemap_url="https://shop.example/sitemap.xml", output_file="shop_sklad.csv")\n',
+        encoding='utf-8')
+    (tmp_path / 'feed.py').write_text(
+        'from feed_converter import FeedConverter\n'
+        'class ShopFeed(FeedConverter):\n    pass\n', encoding='utf-8')
+    # Skript, ktory pri importe rovno bezi, sa nesmie spustit
+    (tmp_path / 'tool.py').write_text('raise SystemExit("spustene pri importe")\n', encoding='utf-8')
+    (tmp_path / 'local_config.py').write_text('def make():\n    CONFIG = ScraperConfig()\n', encoding='utf-8')
+    (tmp_path / 'broken.py').write_text('def (:\n', encoding='utf-8')
+
+    assert find_python_sources(str(tmp_path)) == [('feed', 'feed'), ('shop', 'scraper')]
+
+
+def source(name, host='shop.example', connections=1, command=None):
+    return Source(name, command or [sys.executable, '-c', 'pass'], f'{name}.csv', host, connections)
+
+
+def test_duplicate_source_names_are_dropped(capsys):
+    module, spec, other = source('shop'), source('shop', command=['spec_scraper.py']), source('other')
+    assert unique_sources([module, spec, other]) == [module, other]
+    assert 'Duplicitny zdroj' in capsys.readouterr().out
+
+
+def test_orchestrator_keeps_results_of_sources_with_same_name(capsys):
+    sources = [source('shop'), source('shop', host='other.example')]
+    results = Orchestrator(sources).run()
+    assert [(r['name'], r['host'], r['status']) for r in results] == [('shop', 'shop.example', 'ok'),
+                                                                      ('shop', 'other.example', 'ok')]
+
+
+def hold(budget, item, entered, release):
+    with budget.acquire(item):
+        entered.set()
+        release.wait(5)
+
+
+def start(budget, item):
+    entered, release = threading.Event(), threading.Event()
+    thread = threading.Thread(target=hold, args=(budget, item, entered, release), daemon=True)
+    thread.start()
+    return thread, entered, release
+
+
+def test_budget_limits_connections_and_processes_per_host():
+    budget = ConnectionBudget(max_connections=10, per_host=1)
+    first, first_in, first_release = start(budget, source('a', host='a.example', connections=6))
+    assert first_in.wait(5)
+
+    # Rovnaky host caka na koniec prveho zdroja
+    same_host, same_host_in, same_host_release = start(budget, source('a2', host='a.example', connections=1))
+    # Iny host caka, kym sa neuvolni dost spojeni
+    large, large_in, large_release = start(budget, source('b', host='b.example', connections=5))
+    # Maly zdroj sa zmesti hned
+    small, small_in, small_release = start(budget, source('c', host='c.example', connections=4))
+    assert small_in.wait(5)
+    assert not same_host_in.wait(0.2)
+    assert not large_in.is_set()
+    assert budget.free == 0
+
+    first_release.set()  # 6 volnych spojeni: 1 pre a2 a 5 pre b
+    assert same_host_in.wait(5)
+    assert large_in.wait(5)
+    assert budget.free == 0
+
+    for release in (same_host_release, large_release, small_release):
+        release.set()
+    for thread in (first, same_host, large, small):
+        thread.join(5)
+    assert budget.free == 10
+    assert sum(budget.hosts.values()) == 0
+
+
+def test_source_larger_than_budget_gets_whole_budget():
+    budget = ConnectionBudget(max_connections=4, per_host=2)
+    thread, entered, release = start(budget, source('big', connections=40))
+    assert entered.wait(5)
+    assert budget.free == 0
+    release.set()
+    thread.join(5)
+    assert budget.free == 4
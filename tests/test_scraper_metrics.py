@@ -0,0 +1,83 @@
+import json
+import pickle
+
+import pytest
+
+from scraper_metrics import Histogram, ScraperMetrics
+
+
+def test_histogram_quantiles_interpolate_within_bucket():
+    hist = Histogram(buckets=(0.1, 1.0))
+    for value in (0.05, 0.05, 0.5, 0.5, 3.0):
+        hist.observe(value)
+
+    assert hist.quantile(0.2) == pytest.approx(0.05)  # 1. z 2 vzoriek v buckete (0, 0.1]
+    assert hist.quantile(0.6) == pytest.approx(0.55)  # 1. z 2 vzoriek v buckete (0.1, 1.0]
+    assert hist.quantile(1.0) == 3.0  # posledny bucket konci na max
+    summary = hist.summary()
+    assert summary['buckets'] == {'0.1': 2, '1.0': 4, '+Inf': 5}
+    assert (summary['count'], summary['max']) == (5, 3.0)
+    assert Histogram().quantile(0.5) is None
+
+
+def make_metrics():
+    metrics = ScraperMetrics('ScraperShop', 'shop', engine='thread')
+    metrics.observe('ttfb', 0.2)
+    metrics.observe('parse', -0.001)  # nepresne hodiny -> 0
+    metrics.count_status(200)
+    metrics.count_status(200)
+    metrics.count_status(None)
+    metrics.count_status(404)
+    metrics.count_retry(2)
+    metrics.add_bytes(1500)
+    metrics.count_partial()
+    metrics.count_failure('http_404')
+    metrics.count_failure('no_sku')
+    metrics.count_failure('no_sku')
+    metrics.finish(urls=3, products=1, resumed=0)
+    return metrics
+
+
+def test_report_counts_and_stages():
+    report = make_metrics().report()
+    assert report['statuses'] == {'200': 2, '404': 1}
+    assert report['failures'] == {'no_sku': 2, 'http_404': 1}  # najcastejsie prve
+    assert (report['retries'], report['bytes'], report['partial_reads']) == (2, 1500, 1)
+    assert (report['urls'], report['products'], report['resumed']) == (3, 1, 0)
+    assert set(report['stages']) == {'ttfb', 'parse'}
+    assert report['stages']['parse']['max'] == 0.0
+
+
+def test_describe():
+    assert ScraperMetrics('S', 's').describe() == 'bez requestov'
+    text = make_metrics().describe()
+    assert text.startswith('ttfb p50 ')
+    assert text.endswith('chyby: no_sku=2, http_404=1')
+
+
+def test_prometheus_text():
+    metrics = make_metrics()
+    metrics.count_failure('parse:"quoted"')
+    lines = metrics.prometheus_text().splitlines()
+
+    assert '# TYPE scraper_stage_seconds histogram' in lines
+    assert 'scraper_stage_seconds_bucket{supplier="shop",stage="ttfb",le="0.25"} 1' in lines
+    assert 'scraper_stage_seconds_bucket{supplier="shop",stage="ttfb",le="+Inf"} 1' in lines
+    assert 'scraper_stage_seconds_count{supplier="shop",stage="ttfb"} 1' in lines
+    assert 'scraper_responses_total{supplier="shop",status="404"} 1' in lines
+    assert 'scraper_failures_total{supplier="shop",reason="parse:\\"quoted\\""} 1' in lines
+    assert 'scraper_partial_reads_total{supplier="shop"} 1' in lines
+    assert 'scraper_products_total{supplier="shop"} 1' in lines
+
+
+def test_write_json_and_pickle(tmp_path):
+    metrics = make_metrics()
+    path = metrics.write_json(str(tmp_path / 'metrics' / 'shop.json'))
+    with open(path, encoding='utf-8') as f:
+        assert json.load(f)['failures'] == {'no_sku': 2, 'http_404': 1}
+    assert [p.name for p in (tmp_path / 'metrics').iterdir()] == ['shop.json']
+
+    # Parsovacie procesy dostanu kopiu scrapera aj s metrikami
+    copy = pickle.loads(pickle.dumps(metrics))
+    copy.count_failure('no_sku')
+    assert copy.failures['no_sku'] == 3
@@ -0,0 +1,68 @@
+import gzip
+import io
+
+import requests
+
+from http_cache import HttpCache
+from sitemap_reader import SitemapReader, iter_sitemap_xml
+
+NS = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+
+
+def urlset(*locs, lastmod=None):
+    meta = f'<lastmod>{lastmod}</lastmod>' if lastmod else ''
+    urls = ''.join(f'<url><loc>{loc}</loc>{meta}</url>' for loc in locs)
+    return f'<?xml version="1.0" encoding="UTF-8"?><urlset xmlns="{NS}">{urls}</urlset>'.encode('utf-8')
+
+
+def sitemapindex(*locs):
+    sitemaps = ''.join(f'<sitemap><loc>{loc}</loc></sitemap>' for loc in locs)
+    return f'<?xml version="1.0" encoding="UTF-8"?><sitemapindex xmlns="{NS}">{sitemaps}</sitemapindex>'.encode('utf-8')
+
+
+def read_all(url, **options):
+    return sorted(SitemapReader(requests.Session, **options).iter_entries(url))
+
+
+def test_iter_sitemap_xml_reads_urls_with_meta():
+    data = urlset('https://shop.example/p/1', lastmod='2024-05-01')
+    assert list(iter_sitemap_xml(io.BytesIO(data))) == [
+        ('url', 'https://shop.example/p/1', {'lastmod': '2024-05-01'})]
+
+
+def test_iter_sitemap_xml_unpacks_gzip():
+    data = gzip.compress(urlset('https://shop.example/p/1', 'https://shop.example/p/2'))
+    assert [loc for _, loc, _ in iter_sitemap_xml(io.BytesIO(data))] == [
+        'https://shop.example/p/1', 'https://shop.example/p/2']
+
+
+def test_small_sitemap_over_http(http_server):
+    # Male telo precita urllib3 naraz - stream musi ostat otvoreny az do konca iterparse
+    url = http_server.add('/sitemap.xml', urlset('https://shop.example/p/1', lastmod='2024-05-01'),
+                          Content_Type='application/xml')
+    assert read_all(url) == [('https://shop.example/p/1', {'lastmod': '2024-05-01'})]
+
+
+def test_gzip_sitemap_over_http(http_server):
+    locs = [f'https://shop.example/p/{i}' for i in range(2000)]
+    url = http_server.add('/sitemap.xml.gz', gzip.compress(urlset(*locs)), Content_Type='application/x-gzip')
+    assert sorted(loc for loc, _ in read_all(url)) == sorted(locs)
+
+
+def test_sitemap_index_follows_children_and_skips_broken_ones(http_server):
+    first = http_server.add('/a.xml', urlset('https://shop.example/p/1', 'https://shop.example/p/2'))
+    second = http_server.add('/b.xml.gz', gzip.compress(urlset('https://shop.example/p/3')))
+    nested = http_server.add('/nested.xml', sitemapindex(second))
+    index = http_server.add('/index.xml', sitemapindex(first, nested, http_server.url + '/missing.xml'))
+
+    assert [loc for loc, _ in read_all(index, max_workers=2)] == [
+        'https://shop.example/p/1', 'https://shop.example/p/2', 'https://shop.example/p/3']
+
+
+def test_unchanged_sitemap_is_read_from_cache(http_server, tmp_path):
+    cache = HttpCache(str(tmp_path / 'cache'))
+    url = http_server.add('/sitemap.xml', urlset('https://shop.example/p/1'), ETag='"v1"')
+    assert read_all(url, cache=cache) == [('https://shop.example/p/1', {})]
+
+    assert read_all(url, cache=cache) == [('https://shop.example/p/1', {})]
+    assert http_server.requests[-1][1].get('If-None-Match') == '"v1"'
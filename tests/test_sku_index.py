@@ -0,0 +1,91 @@
+import json
+import os
+
+import pytest
+
+from sku_index import SkuIndex, iter_csv_rows, normalize_ean, normalize_sku
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('pt32-bbk ', 'PT32BBK'),
+    ('PT32 BBK', 'PT32BBK'),
+    ('PT32.BBK', 'PT32BBK'),
+    (None, ''),
+])
+def test_normalize_sku(value, expected):
+    assert normalize_sku(value) == expected
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('8402480069', '8402480069'),
+    ('08402480069', '8402480069'),
+    ('8402480069.0', '8402480069'),
+    ('840-248 0069', '8402480069'),
+    ('PT32-BBK', ''),
+    ('', ''),
+])
+def test_normalize_ean(value, expected):
+    assert normalize_ean(value) == expected
+
+
+def write_feed(feeds_dir, name, filename, columns, delimiter=';'):
+    config = {'name': name, 'csv_url': f'https://raw.example/{filename}', 'delimiter': delimiter, 'columns': columns}
+    (feeds_dir / f'{name.lower()}.json').write_text(json.dumps(config), encoding='utf-8')
+
+
+@pytest.fixture
+def feeds(tmp_path):
+    feeds_dir = tmp_path / 'feeds'
+    feeds_dir.mkdir()
+    write_feed(feeds_dir, 'Alfa', 'alfa_sklad.csv', {'sku': 'SKU', 'quantity': 'Pocet_ks', 'price': 'Cena'})
+    write_feed(feeds_dir, 'Beta', 'beta.csv', {'sku': '_0', 'quantity': '_2'}, delimiter=',')
+    (tmp_path / 'alfa_sklad.csv').write_text(
+        '\ufeffSKU;Nazov;Pocet_ks;Cena;EAN\n'
+        'PT32-BBK;"Stojan\nna gitaru";3;"1.299,00";8402480069.0\n'
+        'X-1;Kabel;>5;99;\n', encoding='utf-8')
+    (tmp_path / 'beta.csv').write_text('kod,nazov,sklad\npt32 bbk,Stojan,0\n', encoding='utf-8')
+    return tmp_path
+
+
+def open_index(root):
+    return SkuIndex(str(root / 'index.sqlite'), str(root / 'feeds'), str(root))
+
+
+def test_iter_csv_rows_offsets_point_to_records(feeds):
+    path = str(feeds / 'alfa_sklad.csv')
+    rows = list(iter_csv_rows(path, ';'))
+    assert [cells[0] for _, cells in rows] == ['SKU', 'PT32-BBK', 'X-1']
+    with open(path, 'rb') as f:
+        data = f.read()
+    assert data[rows[2][0]:].startswith(b'X-1;')
+
+
+def test_lookup_by_sku_or_ean_across_feeds(feeds):
+    with open_index(feeds) as index:
+        assert index.update_all() == {'Alfa': 3, 'Beta': 1}
+
+        matches = sorted(index.lookup('pt32.bbk'), key=lambda match: match.supplier)
+        assert [(m.supplier, m.qty, m.price) for m in matches] == [('Alfa', 3, 1299.0), ('Beta', 0, None)]
+        assert index.read_row(matches[0]) == {'SKU': 'PT32-BBK', 'Nazov': 'Stojan\nna gitaru', 'Pocet_ks': '3',
+                                              'Cena': '1.299,00', 'EAN': '8402480069.0'}
+
+        by_ean = index.lookup('08402480069')
+        assert [(m.supplier, m.kind) for m in by_ean] == [('Alfa', 'ean')]
+        assert index.lookup('X1', supplier='Beta') == []
+
+
+def test_only_changed_feeds_are_reindexed(feeds):
+    with open_index(feeds) as index:
+        index.update_all()
+        assert index.update_all() == {}
+
+        path = feeds / 'beta.csv'
+        path.write_text('kod,nazov,sklad\nnew-1,Novy,2\n', encoding='utf-8')
+        os.utime(path, (1, 1))
+        assert index.update_all() == {'Beta': 1}
+        assert [m.supplier for m in index.lookup('pt32bbk')] == ['Alfa']
+
+    os.remove(feeds / 'feeds' / 'beta.json')
+    with open_index(feeds) as index:
+        index.update_all()
+        assert index.lookup('NEW1') == []
@@ -0,0 +1,82 @@
+import csv
+
+import pytest
+
+from snapshot_delta import SnapshotDelta, delta_path, normalize_value
+
+
+@pytest.mark.parametrize('value, expected', [
+    (5, '5'),
+    ('5', '5'),
+    ('5.0', '5'),
+    (19.9, '19.9'),
+    (float('nan'), ''),
+    (None, ''),
+    (' N/A ', 'N/A'),
+])
+def test_normalize_value(value, expected):
+    assert normalize_value(value) == expected
+
+
+def test_delta_path():
+    assert delta_path('kytary_sklad.csv') == 'kytary_sklad_delta.csv'
+    assert delta_path('feed') == 'feed_delta.csv'
+
+
+def read_delta(path):
+    with open(path, encoding='utf-8', newline='') as f:
+        return list(csv.reader(f, delimiter=';'))
+
+
+@pytest.fixture
+def snapshot(tmp_path):
+    path = tmp_path / 'shop_sklad.csv'
+    # Predosly vystup zapisal pandas: BOM a cisla ako float
+    path.write_text('\ufeffSKU;Pocet_ks;Cena\nA-1;3.0;10.5\nB-2;2;7\nC-3;1;5\n', encoding='utf-8')
+    return path
+
+
+def test_changes_against_previous_snapshot(snapshot):
+    delta = SnapshotDelta(str(snapshot), 'SKU', 'Pocet_ks', 'Cena')
+    delta.add_all([
+        {'SKU': 'A-1', 'Pocet_ks': 3, 'Cena': 10.5},   # bez zmeny
+        {'SKU': 'B-2', 'Pocet_ks': 0, 'Cena': 8},      # pocet aj cena
+        {'SKU': 'D-4', 'Pocet_ks': 5, 'Cena': 19.9},   # novy
+        {'SKU': 'D-4', 'Pocet_ks': 9, 'Cena': 1},      # duplicitny riadok sa ignoruje
+    ])
+    counts = delta.write()
+
+    assert counts == {'added': 1, 'removed': 1, 'qty': 1, 'price': 1}
+    assert SnapshotDelta.describe(counts) == '+1 -1 qty:1 price:1'
+    assert read_delta(delta.delta_file) == [
+        ['SKU', 'Change', 'OldQty', 'NewQty', 'OldPrice', 'NewPrice'],
+        ['B-2', 'qty+price', '2', '0', '7', '8'],
+        ['D-4', 'added', '', '5', '', '19.9'],
+        ['C-3', 'removed', '1', '', '5', ''],
+    ]
+
+
+def test_first_run_has_only_added_rows(tmp_path):
+    delta = SnapshotDelta(str(tmp_path / 'missing.csv'), 'SKU', 'Pocet_ks')
+    delta.add({'SKU': 'A-1', 'Pocet_ks': 1})
+    assert delta.write() == {'added': 1, 'removed': 0, 'qty': 0, 'price': 0}
+
+
+def test_fallback_key_columns(tmp_path):
+    path = tmp_path / 'feed.csv'
+    path.write_text('Code;EAN;Qty\n;8590000000001;1\nK-1;;2\n', encoding='utf-8')
+    delta = SnapshotDelta(str(path), ['Code', 'EAN'], 'Qty')
+    delta.add_all([{'Code': '', 'EAN': '8590000000001', 'Qty': 1}, {'Code': 'K-1', 'EAN': '', 'Qty': 4}])
+    assert delta.write() == {'added': 0, 'removed': 0, 'qty': 1, 'price': 0}
+
+
+def test_add_frame_matches_add(snapshot):
+    pd = pytest.importorskip('pandas')
+    rows = [{'SKU': 'A-1', 'Pocet_ks': 3, 'Cena': 10.5}, {'SKU': 'B-2', 'Pocet_ks': 0, 'Cena': 8},
+            {'SKU': 'D-4', 'Pocet_ks': 5, 'Cena': 19.9}]
+
+    by_row = SnapshotDelta(str(snapshot), 'SKU', 'Pocet_ks', 'Cena')
+    by_row.add_all(rows)
+    by_frame = SnapshotDelta(str(snapshot), 'SKU', 'Pocet_ks', 'Cena')
+    by_frame.add_frame(pd.DataFrame(rows))
+    assert by_frame.changes == by_row.changes
@@ -0,0 +1,40 @@
+import math
+
+import pytest
+
+from snapshot_store import to_price, to_qty
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('1.299,00', 1299.0),
+    ('1,299.00', 1299.0),
+    ('1.234.567', 1234567.0),
+    ('1,234,567.89', 1234567.89),
+    ('1.299', 1299.0),
+    ('1,299', 1299.0),
+    ('9 599,10 Kč', 9599.1),
+    ('9\xa0599,1 €', 9599.1),
+    ('10,5', 10.5),
+    ('10.5', 10.5),
+    ('0.125', 0.125),
+    ('-3,50', -3.5),
+    ('1 299,- Kč', 1299.0),
+    ('1299', 1299.0),
+    (1299, 1299.0),
+    (12.5, 12.5),
+])
+def test_to_price(value, expected):
+    assert to_price(value) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize('value', [None, '', 'cena na dotaz', math.nan])
+def test_to_price_unreadable(value):
+    assert to_price(value) is None
+
+
+def test_to_qty():
+    assert to_qty('5') == 5
+    assert to_qty('5.0') == 5
+    assert to_qty(3) == 3
+    assert to_qty('skladom') is None
+    assert to_qty('') is None
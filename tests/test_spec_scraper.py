@@ -0,0 +1,111 @@
+import json
+import os
+
+import pytest
+
+from spec_scraper import SpecScraper, load_specs, parse_stock
+
+SPECS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scrapers')
+
+ROCKSTER = {'require_words': ['skladem'], 'number': r'\(>?(\d+)\s*ks\)'}
+THREEDMX = {'number': r'(\d+)', 'in_stock_words': ['skladem', 'in stock']}
+MUSICPARK = {'require_words': ['skladom'], 'number': r'(\d+)', 'min': 1}
+
+
+@pytest.mark.parametrize('value, rules, expected', [
+    (None, ROCKSTER, 0),
+    ('Skladem (>5 ks)', ROCKSTER, 5),
+    ('Skladem', ROCKSTER, 1),
+    ('Na objednavku (3 ks)', ROCKSTER, 0),   # text bez require_words -> 0 aj s cislom
+    ('Skladem 12 ks', THREEDMX, 12),
+    ('Skladem 0 ks', THREEDMX, 1),            # 0 s in_stock_words -> aspon 1
+    ('Vyprodano 0 ks', THREEDMX, 0),
+    ('In stock', THREEDMX, 1),
+    ('', {'present': True}, 1),
+    ('Skladom: 3 ks', MUSICPARK, 3),
+    ('Skladom: 0 ks', MUSICPARK, 1),         # ako musicpark.py: extract_number(text) or 1
+    ('Skladom', MUSICPARK, 1),
+    ('Na objednavku', MUSICPARK, 0),
+])
+def test_parse_stock(value, rules, expected):
+    assert parse_stock(value, rules) == expected
+
+
+def make_spec(**columns):
+    return {
+        'name': 'shop', 'sitemap_url': 'https://shop.example/sitemap.xml', 'output_file': 'shop_sklad.csv',
+        'fields': {'sku': {'css': 'span.sku'}, 'name': [{'css': 'h1.title'}, {'css': 'h1'}],
+                   'price': {'css': 'span.price'}, 'stock': {'css': 'span.stock'}},
+        'columns': columns or {
+            'SKU': {'field': 'sku', 'required': True, 'regex': r'Kod:\s*(\S+)'},
+            'Nazov': {'field': 'name', 'default': 'N/A'},
+            'Cena': {'field': 'price', 'default': '0', 'remove': ['€', ' ']},
+            'Pocet_ks': {'field': 'stock', 'stock': ROCKSTER},
+        },
+    }
+
+
+def scraper(spec, **overrides):
+    return SpecScraper(spec, checkpoint=False, snapshot_dir=None, **overrides)
+
+
+def test_build_product_applies_column_rules():
+    product = scraper(make_spec())
+    values = {'sku': 'Kod: PT-32 ', 'name': None, 'price': '1 299 €', 'stock': 'Skladem (2 ks)'}
+    assert product.build_product(values, 'u') == {'SKU': 'PT-32', 'Nazov': 'N/A', 'Cena': '1299', 'Pocet_ks': 2}
+
+    assert product.build_product({**values, 'sku': 'bez kodu'}, 'u') is None  # regex nesedi -> required
+    assert product.build_product({**values, 'price': None}, 'u')['Cena'] == '0'
+
+
+def test_page_is_parsed_with_fallback_selectors():
+    html = ('<h1>Stojan</h1><span class="sku">Kod: PT-32</span><span class="price">99 €</span>'
+            '<span class="stock">Skladem (>5 ks)</span>').encode('utf-8')
+    row, failure, _ = scraper(make_spec())._parse_content(html, 'https://shop.example/p/1')
+    assert failure is None
+    assert row == {'SKU': 'PT-32', 'Nazov': 'Stojan', 'Cena': '99', 'Pocet_ks': 5, 'URL': 'https://shop.example/p/1'}
+
+
+def test_from_file_with_config_overrides():
+    product = SpecScraper.from_file(os.path.join(SPECS_DIR, '3dmx.json'), max_workers=2,
+                                    checkpoint=False, snapshot_dir=None)
+    assert product.name == 'SpecScraper[3dmx]'
+    assert (product.config.max_workers, product.config.parser) == (2, 'lxml')
+    assert product.COLUMNS == ['SKU', 'Nazov', 'Pocet_ks']
+
+    html = '<h1>Kabel</h1><table><tr><td class="td_katalog_detail_polozka">K-1</td></tr></table>'
+    row, failure, _ = product._parse_content(html.encode('utf-8'), 'https://www.3dmx.cz/p/1')
+    assert failure is None
+    assert (row['SKU'], row['Nazov'], row['Pocet_ks']) == ('K-1', 'Kabel', 0)
+
+
+def test_parser_version_covers_column_rules():
+    base = scraper(make_spec()).parser_version()
+    assert scraper(make_spec()).parser_version() == base
+
+    spec = make_spec()
+    spec['columns']['Cena']['remove'] = ['€']
+    assert scraper(spec).parser_version() != base
+
+
+def test_local_sitemap_file_and_url_pattern(tmp_path):
+    sitemap = tmp_path / 'sitemap.xml'
+    sitemap.write_text('<urlset><url><loc>https://shop.example/p/1</loc></url>'
+                       '<url><loc>https://shop.example/c/gitary</loc></url></urlset>', encoding='utf-8')
+    spec = {**make_spec(), 'sitemap_file': str(sitemap), 'url_pattern': r'/p/\d+$'}
+    assert scraper(spec).get_sitemap_urls() == ['https://shop.example/p/1']
+
+
+def test_load_specs_skips_disabled(tmp_path):
+    for name, enabled in (('a', True), ('b', False)):
+        (tmp_path / f'{name}.json').write_text(json.dumps({'name': name, 'enabled': enabled}), encoding='utf-8')
+    assert [spec['name'] for spec in load_specs(str(tmp_path))] == ['a']
+    assert [spec['name'] for spec in load_specs(str(tmp_path), enabled_only=False)] == ['a', 'b']
+
+
+def test_musicpark_spec_keeps_stock_of_python_scraper():
+    product = SpecScraper.from_file(os.path.join(SPECS_DIR, 'musicpark.json'), checkpoint=False, snapshot_dir=None)
+    html = '<h1>Gitara</h1><div>Obj. kód: MP\xa0123</div><span class="dostupnost">\n  Skladom 0 ks</span>'
+    row, failure, _ = product._parse_content(html.encode('utf-8'), 'https://www.music-park.sk/produkt/gitara')
+    assert failure is None
+    assert (row['SKU'], row['Nazov'], row['Pocet_ks']) == ('MP123', 'Gitara', 1)